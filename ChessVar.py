@@ -9,6 +9,322 @@
 # interact with the game. The game can be won by either king being able to move all the way across the board and reach
 # the last row. Though the game can tie if the other king also reaches the last row on its last turn.
 
+import random
+from collections import OrderedDict, namedtuple
+
+
+SIDES = ('WHITE', 'BLACK')  # Side indexes used by Board's bitboards.
+PIECE_TYPES = ('K', 'Bi', 'R', 'Kn')  # Piece type indexes used by Board's bitboards.
+KING, BISHOP, ROOK, KNIGHT = 0, 1, 2, 3
+SYMBOLS = [[side + ' ' + piece_type for piece_type in PIECE_TYPES] for side in SIDES]  # [side][piece type]
+SYMBOL_CODES = {SYMBOLS[side][piece_type]: (side, piece_type)  # 'WHITE Kn' -> (0, KNIGHT)
+                for side in range(2) for piece_type in range(len(PIECE_TYPES))}
+COLUMNS = 'abcdefgh'
+_COLUMN_INDEX = {letter: index for index, letter in enumerate(COLUMNS)}
+FULL_BOARD = (1 << 64) - 1
+_KNIGHT_STEPS = ((2, 1), (2, -1), (-2, 1), (-2, -1), (1, 2), (1, -2), (-1, 2), (-1, -2))  # (row, column)
+_KING_STEPS = ((1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (1, -1), (-1, 1), (-1, -1))
+
+# Zobrist keys, one random 64-bit number per side, piece type & square, plus one for Black to move and
+# one per finished game state. A fixed seed keeps hashes the same from one run to the next.
+_zobrist_random = random.Random(0x5EED)
+ZOBRIST_PIECES = [[[_zobrist_random.getrandbits(64) for _ in range(64)] for _ in PIECE_TYPES] for _ in SIDES]
+ZOBRIST_BLACK_TO_MOVE = _zobrist_random.getrandbits(64)
+ZOBRIST_GAME_STATES = {'UNFINISHED': 0, 'WHITE_WON': _zobrist_random.getrandbits(64),
+                       'BLACK_WON': _zobrist_random.getrandbits(64), 'TIE': _zobrist_random.getrandbits(64)}
+
+# Position formats read by Board.from_position() and written by Board.to_position(). The text form is
+# FEN-like: rows 8 to 1 split by '/', White pieces in capitals (K King, B Bishop, R Rook, N Knight), a digit
+# for a run of empty squares, then 'w' or 'b' for the side to move and the game state ('-' while the game
+# is UNFINISHED, 'W' for WHITE_WON, which leaves Black its last turn, 'B' for BLACK_WON, 'T' for TIE).
+# The binary form is POSITION_BYTES long: one byte per piece giving its square (0xFF once captured), in
+# roster order (King, Bishop, Bishop, Rook, Knight, Knight; White then Black; two pieces of a type in
+# square order), then a byte holding Black to move in bit 0 and the index into GAME_STATES above it.
+START_POSITION = '8/8/8/8/8/8/RBN2nbr/KBN2nbk w -'
+GAME_STATES = ('UNFINISHED', 'WHITE_WON', 'BLACK_WON', 'TIE')
+POSITION_BYTES = 13
+_POSITION_LETTERS = ('KBRN', 'kbrn')  # [side][piece type]
+_LETTER_CODES = {letter: (side, piece_type) for side in range(2) for piece_type, letter in
+                 enumerate(_POSITION_LETTERS[side])}
+_GAME_STATE_LETTERS = {'UNFINISHED': '-', 'WHITE_WON': 'W', 'BLACK_WON': 'B', 'TIE': 'T'}
+_LETTER_GAME_STATES = {letter: game_state for game_state, letter in _GAME_STATE_LETTERS.items()}
+_ROSTER_TYPES = (KING, BISHOP, BISHOP, ROOK, KNIGHT, KNIGHT)  # Piece type of each roster slot, per side.
+_CAPTURED_BYTE = 0xFF
+
+DEFAULT_LEGALITY_CACHE_SIZE = 4096  # Verdicts a LegalityCache keeps unless told otherwise.
+
+# Verdicts handed back by Board._check_rules()
+_LEGAL = 0
+_RULES_BROKEN = 1  # The piece can't move that way, the game state is left alone.
+_KING_IN_DANGER = 2  # The move would leave a King open to capture, the game state drops back to UNFINISHED.
+
+# Events handed to the listeners added with ChessVariant.add_listener(). Sides are 'WHITE' or 'BLACK',
+# squares are 'letter + num' (None for a square off the board) and pieces are symbols such as 'WHITE Kn'.
+MoveApplied = namedtuple('MoveApplied', 'side origin destination piece')
+PieceCaptured = namedtuple('PieceCaptured', 'side square piece')  # side made the capture, piece was taken.
+TurnChanged = namedtuple('TurnChanged', 'turn')
+GameStateChanged = namedtuple('GameStateChanged', 'game_state game_over')
+MoveRejected = namedtuple('MoveRejected', 'side origin destination reason')
+
+# Reasons given by MoveRejected.
+SAME_SQUARE = 'SAME_SQUARE'  # The piece was put back down where it started.
+NOT_YOUR_TURN = 'NOT_YOUR_TURN'
+GAME_OVER = 'GAME_OVER'  # The side has no moves left in this game.
+NO_PIECE = 'NO_PIECE'  # None of the side's pieces stand on the origin.
+OFF_BOARD = 'OFF_BOARD'
+OWN_PIECE = 'OWN_PIECE'  # The destination holds one of the side's own pieces.
+ILLEGAL_MOVE = 'ILLEGAL_MOVE'  # The piece can't move that way.
+KING_IN_DANGER = 'KING_IN_DANGER'  # The move would leave a King open to capture.
+
+OFF_BOARD_NAME = '??'  # How Move names a square that is off the board.
+
+
+def square_index(square):
+    """
+    Translate a square into its bitboard index.
+    :param square: 'letter + num' or ('letter', num), ie 'a1' or ('a', 1).
+    :return: 0 for a1, 1 for b1, ... 63 for h8. None if the square is off the board.
+    """
+    if square is None or len(square) < 2 or square[0] not in _COLUMN_INDEX:
+        return None
+    row = int(square[1])
+    if row < 1 or row > 8:
+        return None
+    return (row - 1) * 8 + _COLUMN_INDEX[square[0]]
+
+
+def square_tuple(index):
+    """
+    Translate a bitboard index back into the ('letter', num) tuple used by Piece objects.
+    """
+    return COLUMNS[index & 7], (index >> 3) + 1
+
+
+SQUARE_TUPLES = [square_tuple(index) for index in range(64)]
+_START_SQUARES = {  # (side, piece type, one_or_two) -> square index of each piece at the start.
+    ('WHITE', KING, 1): 0, ('WHITE', BISHOP, 1): 1, ('WHITE', BISHOP, 2): 9, ('WHITE', ROOK, 1): 8,
+    ('WHITE', KNIGHT, 1): 2, ('WHITE', KNIGHT, 2): 10,
+    ('BLACK', KING, 1): 7, ('BLACK', BISHOP, 1): 6, ('BLACK', BISHOP, 2): 14, ('BLACK', ROOK, 1): 15,
+    ('BLACK', KNIGHT, 1): 5, ('BLACK', KNIGHT, 2): 13,
+}
+
+_EMPTY_SQUARES = (None,) * 64
+_BOARD_LAYOUT = [  # Board.get_board(): the squares as ('letter', num), row 8 first.
+    [('a', 8),('b', 8),('c', 8),('d', 8),('e', 8),('f', 8),('g', 8),('h', 8),],
+    [('a', 7),('b', 7),('c', 7),('d', 7),('e', 7),('f', 7),('g', 7),('h', 7),],
+    [('a', 6),('b', 6),('c', 6),('d', 6),('e', 6),('f', 6),('g', 6),('h', 6),],
+    [('a', 5),('b', 5),('c', 5),('d', 5),('e', 5),('f', 5),('g', 5),('h', 5) ],
+    [('a', 4),('b', 4),('c', 4),('d', 4),('e', 4),('f', 4),('g', 4),('h', 4),],
+    [('a', 3),('b', 3),('c', 3),('d', 3),('e', 3),('f', 3),('g', 3),('h', 3) ],
+    [('a', 2),('b', 2),('c', 2),('d', 2),('e', 2),('f', 2),('g', 2),('h', 2),],
+    [('a', 1),('b', 1),('c', 1),('d', 1),('e', 1),('f', 1),('g', 1),('h', 1),]
+]
+_NUMBERED_BOARD = [  # Board.get_board_and_pieces() before any piece is written in.
+    [18, 28, 38, 48, 58, 68, 78, 88],  # 8
+    [17, 27, 37, 47, 57, 67, 77, 87],  # 7
+    [16, 26, 36, 46, 56, 66, 76, 86],  # 6
+    [15, 25, 35, 45, 55, 65, 75, 85],  # 5
+    [14, 24, 34, 44, 54, 64, 74, 84],  # 4
+    [13, 23, 33, 43, 53, 63, 73, 83],  # 3
+    [12, 22, 32, 42, 52, 62, 72, 82],  # 2
+    [11, 21, 31, 41, 51, 61, 71, 81],  # 1
+    #  a,  b,  c,  d,  e,  f,  g,  h
+]
+
+
+def square_name(index):
+    """
+    Translate a bitboard index back into the 'letter + num' string taken by make_move().
+    """
+    return COLUMNS[index & 7] + str((index >> 3) + 1)
+
+
+def between_mask(origin, destination):
+    """
+    Build the mask of squares strictly between two squares that share a row, column or
+    diagonal. Only used to fill BETWEEN at import, look squares up there instead.
+    :param origin: Square index.
+    :param destination: Square index.
+    :return: A 64-bit int, 0 if the squares aren't lined up or are neighbours.
+    """
+    row_step = ((destination >> 3) > (origin >> 3)) - ((destination >> 3) < (origin >> 3))
+    col_step = ((destination & 7) > (origin & 7)) - ((destination & 7) < (origin & 7))
+    row_dist = abs((destination >> 3) - (origin >> 3))
+    col_dist = abs((destination & 7) - (origin & 7))
+    if origin == destination or (row_dist and col_dist and row_dist != col_dist):
+        return 0
+    step = row_step * 8 + col_step
+    mask = 0
+    index = origin + step
+    while index != destination:
+        mask |= 1 << index
+        index += step
+    return mask
+
+
+def _step_mask(origin, steps):
+    """
+    Build the mask of squares one (row, column) step away from origin, for each step that
+    stays on the board.
+    """
+    mask = 0
+    for row_step, col_step in steps:
+        row = (origin >> 3) + row_step
+        col = (origin & 7) + col_step
+        if 0 <= row < 8 and 0 <= col < 8:
+            mask |= 1 << (row * 8 + col)
+    return mask
+
+
+def _ray_mask(origin, direction):
+    """
+    Build the mask of every square from origin (not included) to the edge of the board in
+    one of the DIRECTIONS.
+    """
+    row_step, col_step = DIRECTIONS[direction]
+    mask = 0
+    row = (origin >> 3) + row_step
+    col = (origin & 7) + col_step
+    while 0 <= row < 8 and 0 <= col < 8:
+        mask |= 1 << (row * 8 + col)
+        row += row_step
+        col += col_step
+    return mask
+
+
+# Lookup tables, built once at import and indexed by square (and direction for RAYS).
+DIRECTIONS = ((1, 0), (0, 1), (1, 1), (1, -1), (-1, 0), (0, -1), (-1, 1), (-1, -1))  # (row, column) steps
+NORTH, EAST, NORTH_EAST, NORTH_WEST, SOUTH, WEST, SOUTH_EAST, SOUTH_WEST = range(8)
+ROOK_DIRECTIONS = (NORTH, EAST, SOUTH, WEST)
+BISHOP_DIRECTIONS = (NORTH_EAST, NORTH_WEST, SOUTH_EAST, SOUTH_WEST)
+KNIGHT_ATTACKS = [_step_mask(index, _KNIGHT_STEPS) for index in range(64)]
+KING_ATTACKS = [_step_mask(index, _KING_STEPS) for index in range(64)]
+RAYS = [[_ray_mask(index, direction) for index in range(64)] for direction in range(8)]
+# A piece's rays never overlap, so summing them is the same as or-ing them.
+ROOK_LINES = [sum(RAYS[direction][i] for direction in ROOK_DIRECTIONS) for i in range(64)]
+BISHOP_LINES = [sum(RAYS[direction][i] for direction in BISHOP_DIRECTIONS) for i in range(64)]
+BETWEEN = [[between_mask(origin, destination) for destination in range(64)] for origin in range(64)]
+
+
+def ray_attacks(direction, origin, blockers):
+    """
+    Look up the squares a sliding piece reaches from origin in one direction, stopping on
+    (and including) the first blocker.
+    :param direction: One of NORTH, EAST, ... SOUTH_WEST.
+    :param origin: Square index.
+    :param blockers: Mask of the pieces that stop the slide.
+    :return: A 64-bit int.
+    """
+    ray = RAYS[direction][origin]
+    hit = ray & blockers
+    if hit:
+        if direction < SOUTH:  # Rays heading up the board meet the lowest square first.
+            ray ^= RAYS[direction][(hit & -hit).bit_length() - 1]
+        else:
+            ray ^= RAYS[direction][hit.bit_length() - 1]
+    return ray
+
+
+class Move(namedtuple('Move', 'origin destination')):
+    """
+    A move as a pair of square indexes (a1 = 0 ... h8 = 63), parsed once so that the
+    Board never has to read 'letter + num' strings. A Move is a tuple, so it can be
+    used anywhere an (origin, destination) pair is.
+    """
+    __slots__ = ()
+
+    @classmethod
+    def from_names(cls, origin, destination):
+        """
+        Parse a move given as two 'letter + num' strings, ie 'a2', 'a3'.
+        :return: A Move. A square that is off the board is kept as None.
+        """
+        return cls(square_index(origin), square_index(destination))
+
+    def get_names(self):
+        """
+        Retrieve the move as a pair of 'letter + num' strings, as taken by make_move(). A
+        square that is off the board, kept as None by from_names(), comes back as '??'.
+        """
+        return (OFF_BOARD_NAME if self.origin is None else square_name(self.origin),
+                OFF_BOARD_NAME if self.destination is None else square_name(self.destination))
+
+    def __str__(self):
+        return ''.join(self.get_names())
+
+
+class LegalityCache:
+    """
+    Bounded least-recently-used store of move validation verdicts, keyed by the Board's
+    Zobrist hash, the moving piece's type and the move. The hash changes with every change
+    of position, turn or game state, so a verdict can never be used for a position other
+    than the one it was worked out for and nothing has to be cleared when the Board changes.
+    Since the key is the position itself, one cache may be shared by several Boards.
+    Boards have no cache unless given one with Board.set_legality_cache(): it only pays
+    where the same move is tried in the same position again and again, as in a benchmark
+    repeating one move, and in a game nearly every lookup would miss.
+    """
+
+    def __init__(self, size=DEFAULT_LEGALITY_CACHE_SIZE):
+        """
+        :param size: Most verdicts to keep, the least recently used are dropped past that.
+        """
+        self._size = size
+        self._verdicts = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key):
+        """
+        Look up a verdict, counting the hit or miss.
+        :return: The verdict, or None if it isn't stored.
+        """
+        verdict = self._verdicts.get(key)
+        if verdict is None:
+            self._misses += 1
+            return None
+        self._hits += 1
+        self._verdicts.move_to_end(key)
+        return verdict
+
+    def put(self, key, verdict):
+        """
+        Store a verdict, dropping the least recently used one if the cache is full.
+        """
+        self._verdicts[key] = verdict
+        if len(self._verdicts) > self._size:
+            self._verdicts.popitem(last=False)
+            self._evictions += 1
+
+    def clear(self):
+        """
+        Drop every verdict and zero the counters.
+        """
+        self._verdicts.clear()
+        self._hits = self._misses = self._evictions = 0
+
+    def get_size(self):
+        """
+        Retrieve the most verdicts the cache keeps.
+        """
+        return self._size
+
+    def get_stats(self):
+        """
+        Retrieve the cache's counters.
+        :return: Dictionary of 'hits', 'misses', 'evictions', 'entries' and 'size'.
+        """
+        return {'hits': self._hits, 'misses': self._misses, 'evictions': self._evictions,
+                'entries': len(self._verdicts), 'size': self._size}
+
+    def __repr__(self):
+        """
+        Allows the debugger to show an object's attributes rather than its
+        address in memory.
+        """
+        return "{}({!r})".format(self.__class__.__name__, self.get_stats())
+
 
 class ChessVariant:
     """
@@ -18,8 +334,8 @@ class ChessVariant:
     positions. Creates the board. Collaboration with Board piece movement and board
     visualization.
     """
-    def __init__(self):
-        self._board = Board()
+    def __init__(self, position=None):
+        self._board = Board(position)  # position: optional saved position, see Board.from_position().
 
     def make_move(self, origin, destination):
         """
@@ -27,14 +343,15 @@ class ChessVariant:
         square from which the piece is moving. 'destination' describes the square to which
         the piece is going. Returns False if the move is illegal, returns True otherwise.
         """
-        if self._board.get_turn_state() == 'WHITE':
-            if origin == destination:
-                return False
-            return self._board.set_white_piece_location(origin, destination)
-        if self._board.get_turn_state() == 'BLACK':
-            if origin == destination:
-                return False
-            return self._board.set_black_piece_location(origin, destination)
+        return self._board.make_move_fast(Move.from_names(origin, destination))
+
+    def make_move_fast(self, move):
+        """
+        Make a move given as square indexes, skipping the string parsing of make_move().
+        :param move: A Move, or any (origin, destination) pair of square indexes.
+        :return: True if the move was made, False if it is illegal.
+        """
+        return self._board.make_move_fast(move)
 
     def get_game_state(self):
         """
@@ -54,6 +371,13 @@ class ChessVariant:
         #print(self._board.get_board_and_pieces())
         return self._board.get_board()
 
+    def get_board_object(self):
+        """
+        Retrieve the Board object the game is played on, for tools such as the engine in
+        ChessVarEngine that work with square indexes and push()/pop().
+        """
+        return self._board
+
     def get_roster(self, white_or_black):
         """
         Retrieve the team roster for either White or Black.
@@ -72,6 +396,115 @@ class ChessVariant:
         """
         return self._board.get_turn_state()
 
+    def add_listener(self, listener):
+        """
+        Subscribe to the events make_move() gives off: MoveApplied, PieceCaptured,
+        GameStateChanged and TurnChanged for a move that is made, or MoveRejected for one
+        that isn't. With no listeners no events are built at all.
+        :param listener: Called with each event, in the order things happen.
+        """
+        self._board.add_listener(listener)
+
+    def remove_listener(self, listener):
+        """
+        Unsubscribe a listener added with add_listener().
+        """
+        self._board.remove_listener(listener)
+
+    def clear_listeners(self):
+        """
+        Unsubscribe every listener, ie before handing the game to someone else.
+        """
+        self._board.clear_listeners()
+
+    def reset(self, position=None):
+        """
+        Start a new game on this object, in place, see Board.reset().
+        :param position: Optionally a saved position to start from instead.
+        """
+        self._board.reset(position)
+
+    def undo_move(self):
+        """
+        Take back the last move made, including any capture and change of game state.
+        :return: True if a move was taken back, False if there was nothing to undo.
+        """
+        return self._board.pop() is not None
+
+    def generate_legal_moves(self):
+        """
+        Yield every move the player whose turn it is could legally make.
+        :return: A generator of (origin, destination) pairs as 'letter + num' strings, each
+        of which make_move() would accept.
+        """
+        for origin, destination in self._board.generate_legal_moves():
+            yield square_name(origin), square_name(destination)
+
+    def __repr__(self):
+        """
+        Allows the debugger to show an object's attributes rather than its
+        address in memory.
+        """
+        return "{}({!r})".format(self.__class__.__name__, self.__dict__)
+
+
+class GamePool:
+    """
+    Hand out ChessVariant games and take finished ones back to be reused, so that a
+    server or simulator starting game after game isn't building new Boards and Pieces
+    each time. A game given back is reset to the starting position and loses its
+    listeners.
+    """
+
+    def __init__(self, max_free=1024):
+        """
+        :param max_free: Most finished games kept for reuse, any more are dropped.
+        """
+        self._free = []
+        self._free_ids = set()  # id() of every game in _free, to catch a game given back twice.
+        self._max_free = max_free
+        self._created = 0
+        self._reused = 0
+
+    def acquire(self, position=None):
+        """
+        Retrieve a game ready to play, reused if one is free.
+        :param position: Optionally a saved position to start from, see Board.from_position().
+        :return: A ChessVariant.
+        :raises ValueError: If the position can't be read.
+        """
+        if not self._free:
+            self._created += 1
+            return ChessVariant(position)
+        game = self._free[-1]
+        if position is not None:
+            game.reset(position)  # Raises before the game leaves the pool.
+        self._reused += 1
+        self._free_ids.discard(id(game))
+        return self._free.pop()
+
+    def release(self, game):
+        """
+        Give a game back to the pool once it is no longer used.
+        :raises ValueError: If the game is already waiting in the pool, since two later
+        acquire() calls would then both hand it out.
+        """
+        if id(game) in self._free_ids:
+            raise ValueError('Game released twice')
+        if len(self._free) < self._max_free:
+            game.clear_listeners()
+            game.reset()
+            self._free.append(game)
+            self._free_ids.add(id(game))
+
+    def get_stats(self):
+        """
+        Retrieve the pool's counters.
+        :return: Dictionary of 'created' (new games built), 'reused' (games handed out
+        again) and 'free' (games waiting to be reused).
+        """
+        return {'created': self._created, 'reused': self._reused, 'free': len(self._free)}
+
     def __repr__(self):
         """
         Allows the debugger to show an object's attributes rather than its
@@ -86,8 +519,19 @@ class Board:
     of the game state per turn, removes a piece from active duty when captured,
     updates piece locations as ChessVar makes moves. Collaboration with Piece & ChesVar
     for things like game state, piece movement, and board representation.
+
+    Piece placement is stored as bitboards: one 64-bit int per side and piece type, where
+    bit n is set when that piece stands on square n (a1 = 0, b1 = 1, ... h8 = 63). The
+    rosters of Piece objects are kept in sync with the bitboards so that get_roster()
+    still hands out the same objects.
     """
-    def __init__(self):
+    _start = None  # The starting position for reset() to copy, built the first time it is needed.
+
+    def __init__(self, position=None):
+        """
+        :param position: Optionally a saved position to set up instead of the starting
+        one, see from_position().
+        """
         self._turn_state = "WHITE"  # White is default for first turn
         self._game_state = "UNFINISHED"  # May also be: "WHITE_WON", "BLACK_WON", "TIE"
         self._white_dict = [
@@ -106,27 +550,201 @@ class Board:
                 Knight('BLACK', 1),
                 Knight('BLACK', 2)
             ]
-        self._board = [  # Made non-private to be used easily by ChessVarGUI
-            [('a', 8),('b', 8),('c', 8),('d', 8),('e', 8),('f', 8),('g', 8),('h', 8),],
-            [('a', 7),('b', 7),('c', 7),('d', 7),('e', 7),('f', 7),('g', 7),('h', 7),],
-            [('a', 6),('b', 6),('c', 6),('d', 6),('e', 6),('f', 6),('g', 6),('h', 6),],
-            [('a', 5),('b', 5),('c', 5),('d', 5),('e', 5),('f', 5),('g', 5),('h', 5) ],
-            [('a', 4),('b', 4),('c', 4),('d', 4),('e', 4),('f', 4),('g', 4),('h', 4),],
-            [('a', 3),('b', 3),('c', 3),('d', 3),('e', 3),('f', 3),('g', 3),('h', 3) ],
-            [('a', 2),('b', 2),('c', 2),('d', 2),('e', 2),('f', 2),('g', 2),('h', 2),],
-            [('a', 1),('b', 1),('c', 1),('d', 1),('e', 1),('f', 1),('g', 1),('h', 1),]
-        ]
-        self._board_w_pieces = [
-            [18, 28, 38, 48, 58, 68, 78, 88],  # 8
-            [17, 27, 37, 47, 57, 67, 77, 87],  # 7
-            [16, 26, 36, 46, 56, 66, 76, 86],  # 6
-            [15, 25, 35, 45, 55, 65, 75, 85],  # 5
-            [14, 24, 34, 44, 54, 64, 74, 84],  # 4
-            [13, 23, 33, 43, 53, 63, 73, 83],  # 3
-            [12, 22, 32, 42, 52, 62, 72, 82],  # 2
-            [11, 21, 31, 41, 51, 61, 71, 81],  # 1
-            #  a,  b,  c,  d,  e,  f,  g,  h
-        ]
+        self._board = _BOARD_LAYOUT  # Made non-private to be used easily by ChessVarGUI. Shared, never changed.
+        self._board_w_pieces = _NUMBERED_BOARD  # Rebuilt by get_board_and_pieces() before it is written to.
+        self._bitboards = [[0, 0, 0, 0], [0, 0, 0, 0]]  # [side][piece type], see SIDES & PIECE_TYPES
+        self._occupancy = [0, 0]  # Every White piece, every Black piece.
+        self._pieces = [None] * 64  # The Piece object standing on each square.
+        self._piece_attacks = [0] * 64  # Squares attacked by the piece standing on each square.
+        self._attacked = [0, 0]  # Every square White attacks, every square Black attacks.
+        self._undo_stack = []  # One record per move made, see push() & pop().
+        self._listeners = []  # Called with the events of each move, see ChessVariant.add_listener().
+        self._hash = 0  # Zobrist hash, kept up to date move by move.
+        self._legality_cache = None  # Verdicts of _check_rules(), off unless set_legality_cache() turns it on.
+        if position is not None:
+            self._load_position(position)
+        self._place_pieces()
+
+    def _place_pieces(self):
+        """
+        Build the bitboards, attack maps and hash from scratch out of where the Piece
+        objects say they are.
+        """
+        self._bitboards = [[0, 0, 0, 0], [0, 0, 0, 0]]
+        self._occupancy = [0, 0]
+        self._pieces = [None] * 64
+        self._piece_attacks = [0] * 64
+        for side, roster in enumerate((self._white_dict, self._black_dict)):
+            for piece in roster:
+                index = piece.get_square()
+                if index is None:  # Captured.
+                    continue
+                bit = 1 << index
+                self._bitboards[side][piece.get_piece_type()] |= bit
+                self._occupancy[side] |= bit
+                self._pieces[index] = piece
+        self._update_attacks(self._occupancy[0] | self._occupancy[1])
+        self._hash = self._compute_hash()
+
+    def reset(self, position=None):
+        """
+        Set the board up for a new game in place, reusing its Piece objects and lists, so
+        that starting a game allocates nothing. Listeners and the legality cache are kept:
+        cached verdicts are keyed by position hash, so they stay true.
+        :param position: Optionally a saved position to set up instead of the starting
+        one, see from_position().
+        :raises ValueError: If the position can't be read. The board is left as it was.
+        """
+        if position is not None:
+            self._load_position(position)
+            self._undo_stack.clear()
+            self._place_pieces()
+            return
+        bitboards, occupancy, piece_attacks, attacked, zobrist_hash, start_squares = Board._start_setup()
+        self._turn_state = "WHITE"
+        self._game_state = "UNFINISHED"
+        self._undo_stack.clear()
+        self._bitboards[0][:] = bitboards[0]
+        self._bitboards[1][:] = bitboards[1]
+        self._occupancy[:] = occupancy
+        self._piece_attacks[:] = piece_attacks
+        self._attacked[:] = attacked
+        self._hash = zobrist_hash
+        pieces = self._pieces
+        pieces[:] = _EMPTY_SQUARES
+        for roster, squares in ((self._white_dict, start_squares[0]), (self._black_dict, start_squares[1])):
+            for slot in range(6):
+                piece = roster[slot]
+                piece.set_square(squares[slot])
+                piece.set_duty('ACTIVE')
+                pieces[squares[slot]] = piece
+
+    @staticmethod
+    def _start_setup():
+        """
+        Retrieve the bitboards, occupancy, attack maps, hash and roster squares of the
+        starting position, for reset() to copy.
+        """
+        if Board._start is None:
+            board = Board()
+            Board._start = (tuple(tuple(masks) for masks in board._bitboards), tuple(board._occupancy),
+                            tuple(board._piece_attacks), tuple(board._attacked), board._hash,
+                            tuple(tuple(piece.get_square() for piece in roster)
+                                  for roster in (board._white_dict, board._black_dict)))
+        return Board._start
+
+    @classmethod
+    def from_position(cls, position):
+        """
+        Build a Board set up as a saved position.
+        :param position: Text such as START_POSITION, or the bytes written by
+        to_position(binary=True).
+        :return: A new Board with nothing to undo.
+        :raises ValueError: If the position can't be read, or needs more pieces than a side
+        has (one King, which must be there, two Bishops, one Rook and two Knights).
+        """
+        return cls(position)
+
+    def _load_position(self, position):
+        """
+        Move the Piece objects to where a saved position has them and take its turn and
+        game state, for __init__ to build the bitboards from.
+        """
+        if isinstance(position, (bytes, bytearray)):
+            slots, turn_state, game_state = self._read_binary_position(position)
+        else:
+            slots, turn_state, game_state = self._read_text_position(position)
+        if slots[0] is None or slots[6] is None:
+            raise ValueError(f'Both Kings must be on the board: {position!r}')
+        self._turn_state = turn_state
+        self._game_state = game_state
+        for piece, index in zip(self._white_dict + self._black_dict, slots):
+            piece.set_square(index)
+            piece.set_duty('ACTIVE' if index is not None else 'CAPTURED')
+
+    @staticmethod
+    def _read_text_position(position):
+        """
+        Parse a text position, see START_POSITION.
+        :return: (slots, turn state, game state) where slots holds the square index, or None,
+        of each roster piece, White then Black.
+        """
+        fields = position.split()
+        if len(fields) != 3 or fields[1] not in ('w', 'b') or fields[2] not in _LETTER_GAME_STATES:
+            raise ValueError(f'Not a position: {position!r}')
+        rows = fields[0].split('/')
+        if len(rows) != 8:
+            raise ValueError(f'A position needs 8 rows: {position!r}')
+        slots = [None] * 12
+        for row_number, row in enumerate(rows):
+            index = (7 - row_number) * 8
+            end = index + 8
+            for letter in row:
+                if letter in '12345678':
+                    index += int(letter)
+                    continue
+                if letter not in _LETTER_CODES or index >= end:
+                    raise ValueError(f'Bad row {row!r} in position: {position!r}')
+                side, piece_type = _LETTER_CODES[letter]
+                for slot in range(side * 6, side * 6 + 6):
+                    if _ROSTER_TYPES[slot - side * 6] == piece_type and slots[slot] is None:
+                        slots[slot] = index
+                        break
+                else:
+                    raise ValueError(f'Too many {letter!r} pieces in position: {position!r}')
+                index += 1
+            if index != end:
+                raise ValueError(f'Bad row {row!r} in position: {position!r}')
+        return slots, 'WHITE' if fields[1] == 'w' else 'BLACK', _LETTER_GAME_STATES[fields[2]]
+
+    @staticmethod
+    def _read_binary_position(position):
+        """
+        Unpack a binary position, see POSITION_BYTES.
+        :return: (slots, turn state, game state), as for _read_text_position().
+        """
+        if len(position) != POSITION_BYTES or position[12] >> 1 >= len(GAME_STATES):
+            raise ValueError(f'Not a position: {bytes(position)!r}')
+        slots = [None if index == _CAPTURED_BYTE else index for index in position[:12]]
+        placed = [index for index in slots if index is not None]
+        if max(placed, default=0) > 63 or len(set(placed)) != len(placed):
+            raise ValueError(f'Not a position: {bytes(position)!r}')
+        return slots, SIDES[position[12] & 1], GAME_STATES[position[12] >> 1]
+
+    def to_position(self, binary=False):
+        """
+        Save the position: where every piece stands, whose turn it is and the game state.
+        Board.from_position() reads it back.
+        :param binary: Write the POSITION_BYTES long binary form rather than text.
+        :return: Text such as START_POSITION, or bytes.
+        """
+        side_to_move = SIDES.index(self._turn_state)
+        if binary:
+            data = bytearray()
+            for side in (0, 1):
+                for piece_type, count in ((KING, 1), (BISHOP, 2), (ROOK, 1), (KNIGHT, 2)):  # _ROSTER_TYPES
+                    mask = self._bitboards[side][piece_type]
+                    for _ in range(count):
+                        low = mask & -mask
+                        mask ^= low
+                        data.append(low.bit_length() - 1 if low else _CAPTURED_BYTE)
+            data.append(side_to_move | GAME_STATES.index(self._game_state) << 1)
+            return bytes(data)
+        rows = []
+        for row in range(7, -1, -1):
+            text = ''
+            empty = 0
+            for index in range(row * 8, row * 8 + 8):
+                piece = self._pieces[index]
+                if piece is None:
+                    empty += 1
+                    continue
+                if empty:
+                    text += str(empty)
+                    empty = 0
+                text += _POSITION_LETTERS[piece.get_side()][piece.get_piece_type()]
+            rows.append(text + str(empty) if empty else text)
+        return f'{"/".join(rows)} {"wb"[side_to_move]} {_GAME_STATE_LETTERS[self._game_state]}'
 
     def get_game_state(self):
         """
@@ -142,6 +760,8 @@ class Board:
         its data member. Valid input to the new_game_state parameter may be: "WHITE_WON",
         "BLACK_WON", "TIE", or "UNFINISHED". Returns nothing.
         """
+        if new_game_state in ZOBRIST_GAME_STATES:
+            self._hash ^= ZOBRIST_GAME_STATES[self._game_state] ^ ZOBRIST_GAME_STATES[new_game_state]
         if new_game_state == "WHITE_WON":
             self._game_state = "WHITE_WON"
         if new_game_state == "BLACK_WON":
@@ -170,6 +790,26 @@ class Board:
         if white_or_black == "WHITE":
             return self._white_dict
 
+    def get_bitboard(self, white_or_black, symbol=None):
+        """
+        Retrieve the bitboard of one side, or of one of its piece types.
+        :param white_or_black: 'WHITE' or 'BLACK'
+        :param symbol: Optionally one of 'K', 'Bi', 'R' or 'Kn'.
+        :return: A 64-bit int with bit n set for every matching piece on square n (a1 = 0, h8 = 63).
+        """
+        side = SIDES.index(white_or_black)
+        if symbol is None:
+            return self._occupancy[side]
+        return self._bitboards[side][PIECE_TYPES.index(symbol)]
+
+    def get_attacked_squares(self, white_or_black):
+        """
+        Retrieve every square one side's pieces could move to, whatever stands there.
+        :param white_or_black: 'WHITE' or 'BLACK'
+        :return: A 64-bit int with bit n set for every attacked square n (a1 = 0, h8 = 63).
+        """
+        return self._attacked[SIDES.index(white_or_black)]
+
     def get_blank_board_layout(self):
         """
         Retrieve the board in its current layout. Takes no parameters and returns
@@ -189,25 +829,11 @@ class Board:
         Retrieve the game's current board layout, including all the pieces
         and their positions.
         """
-        column_key = [('a', 0), ('b', 1), ('c', 2), ('d', 3), ('e', 4), ('f', 5), ('g', 6), ('h', 7)]
-
-        for piece in self._white_dict:  # Write locations of all white pieces.
-            if piece.get_location() is not None:
-                loc_tuple = piece.get_location()
-                piece_row = abs(loc_tuple[1] - 8)  # Establish nesting index.
-                for location in column_key:
-                    if loc_tuple[0] in location:  # Establish inner index.
-                        piece_column: int = location[1]
-                self._board_w_pieces[piece_row][piece_column] = piece.get_symbol()
-
-        for piece in self._black_dict:  # Write locations of all black pieces.
-            if piece.get_location() is not None:
-                loc_tuple = piece.get_location()
-                piece_row = abs(loc_tuple[1] - 8)  # Establish nesting index.
-                for location in column_key:
-                    if loc_tuple[0] in location:  # Establish inner index.
-                        piece_column = location[1]
-                self._board_w_pieces[piece_row][piece_column] = piece.get_symbol()
+        self._board_w_pieces = [[column * 10 + row for column in range(1, 9)] for row in range(8, 0, -1)]
+        for piece in self._white_dict + self._black_dict:  # Write locations of all pieces.
+            index = piece.get_square()
+            if index is not None:
+                self._board_w_pieces[7 - (index >> 3)][index & 7] = piece.get_symbol()
 
         for row in self._board_w_pieces:
             print(f'{row}\n')
@@ -218,8 +844,35 @@ class Board:
         :param new_state: Either 'WHITE' or 'BLACK'
         :return: None.
         """
+        if new_state != self._turn_state:
+            self._hash ^= ZOBRIST_BLACK_TO_MOVE
         self._turn_state = new_state
 
+    def get_zobrist_hash(self):
+        """
+        Retrieve the Zobrist hash of the current position. It covers where every piece
+        stands, whose turn it is and the game state, so White's win with Black still to
+        make its last move hashes differently from the same position mid-game.
+        :return: A 64-bit int.
+        """
+        return self._hash
+
+    def _compute_hash(self):
+        """
+        Work out the Zobrist hash from scratch. push() and pop() keep _hash up to date
+        without calling this.
+        """
+        zobrist_hash = ZOBRIST_GAME_STATES[self._game_state]
+        if self._turn_state == 'BLACK':
+            zobrist_hash ^= ZOBRIST_BLACK_TO_MOVE
+        for side in (0, 1):
+            for piece_type, mask in enumerate(self._bitboards[side]):
+                while mask:
+                    low = mask & -mask
+                    zobrist_hash ^= ZOBRIST_PIECES[side][piece_type][low.bit_length() - 1]
+                    mask ^= low
+        return zobrist_hash
+
     def set_white_piece_location(self, origin, destination):
         """
         Collaborate with ChessVar's make_move() method in order to move pieces around
@@ -230,41 +883,11 @@ class Board:
         piece's location, whose turn it is, removes any pieces that were captured,
         and if need be, updates the game state.
         """
-        column_loc = ['a', 'b', 'c', 'd', 'e', 'f', 'g', 'h']
         if self._turn_state == 'WHITE' and self.get_game_state() == 'UNFINISHED':  # White piece turn.
-            for elem in self._white_dict:  # White piece is moving.
-                # Is the piece actually at the origin and ACTIVE?
-                if elem.get_location() is not None and elem.get_location() == (origin[0], int(origin[1])):
-                    # On the board?
-                    if destination[0] not in column_loc or int(destination[1]) < 0 or int(destination[1]) > 8:
-                        print('That\'s off the board! Try again.')
-                        return False
-
-                    for opponent in self._black_dict:  # Square occupied by Black?
-                        if opponent.get_location() == (destination[0], int(destination[1])):
-                            if self.check_for_check(destination, origin, elem.get_symbol()) is True:
-                                elem.set_location(destination)
-                                self.remove_piece(opponent)
-                                opponent.set_duty('CAPTURED')
-                                self.set_turn_state('BLACK')
-                                print(f'You\'ve captured {opponent.get_symbol()}! Nice job.')
-                                print('It\'s Black player\'s turn now.')
-                                return True
-                            else:
-                                return False
-
-                    if self.check_square((destination[0], int(destination[1]))) == 'EMPTY':  # Square empty?
-                        if self.check_for_check(destination, origin, elem.get_symbol()) is True:
-                            elem.set_location(destination)
-                            self.set_turn_state('BLACK')
-                            print('It\'s Black player\'s turn now.')
-                            return True
-                        else:
-                            return False
-
-                    if 'WHITE' in self.check_square((destination[0], int(destination[1]))):  # Square has white piece?
-                        print('Square occupied by your own team! Try again.')
-                        return False
+            return self._set_piece_location(0, square_index(origin), square_index(destination))
+        if self._listeners:
+            self._notify(MoveRejected('WHITE', origin, destination,
+                                      NOT_YOUR_TURN if self._turn_state != 'WHITE' else GAME_OVER))
         return False  # Move failed.
 
     def set_black_piece_location(self, origin, destination):
@@ -277,42 +900,426 @@ class Board:
         piece's location, whose turn it is, removes any pieces that were captured,
         and if need be, updates the game state.
         """
-        column_loc = ['a', 'b', 'c', 'd', 'e', 'f', 'g', 'h']
         if self._turn_state == 'BLACK' and (self.get_game_state() == 'UNFINISHED' or self.get_game_state() == 'WHITE_WON'):  # Black piece turn
-            for elem in self._black_dict:  # Black piece is moving.
-                # Is the piece actually at the origin and ACTIVE?
-                if elem.get_location() is not None and elem.get_location() == (origin[0], int(origin[1])):
-                    # On the board?
-                    if destination[0] not in column_loc or int(destination[1]) < 0 or int(destination[1]) > 8:
-                        print('That\'s off the board! Try again.')
-                        return False
-
-                    for opponent in self._white_dict:  # Square occupied by White?
-                        if opponent.get_location() == (destination[0], int(destination[1])):
-                            if self.check_for_check(destination, origin, elem.get_symbol()) is True:
-                                elem.set_location(destination)
-                                self.remove_piece(opponent)
-                                opponent.set_duty('CAPTURED')
-                                self.set_turn_state('WHITE')
-                                print(f'You\'ve captured {opponent.get_symbol()}! Nice job.')
-                                print('It\'s White player\'s turn now.')
-                                return True
-
-                    if self.check_square((destination[0], int(destination[1]))) == 'EMPTY':  # Square empty?
-                        if self.check_for_check(destination, origin, elem.get_symbol()) is True:
-                            elem.set_location(destination)
-                            self.set_turn_state('WHITE')
-                            if self.get_game_state() == 'BLACK_WON' or self.get_game_state() == 'TIE':
-                                print('Game over!')
-                                return True
-                            print('It\'s White player\'s turn now.')
-                            return True
-
-                    if 'BLACK' in self.check_square((destination[0], int(destination[1]))):  # Square has Black piece?
-                        print('Square occupied by your own team! Try again.')
-                        return False
+            return self._set_piece_location(1, square_index(origin), square_index(destination))
+        if self._listeners:
+            self._notify(MoveRejected('BLACK', origin, destination,
+                                      NOT_YOUR_TURN if self._turn_state != 'BLACK' else GAME_OVER))
         return False  # Move failed.
 
+    def make_move_fast(self, move):
+        """
+        Make a move for the side whose turn it is, given as square indexes. This is what
+        ChessVariant.make_move() and make_move_fast() come down to.
+        :param move: A Move, or any (origin, destination) pair of square indexes.
+        :return: True if the move was made, False if it is illegal.
+        """
+        side = 0 if self._turn_state == 'WHITE' else 1
+        if self._game_state == 'UNFINISHED' or (side == 1 and self._game_state == 'WHITE_WON'):
+            return self._set_piece_location(side, move[0], move[1])
+        return self._reject(side, move[0], move[1], GAME_OVER)
+
+    def _set_piece_location(self, side, og_index, dest_index):
+        """
+        Shared body of make_move_fast, set_white_piece_location and set_black_piece_location,
+        once the turn and game state have been checked.
+        :param side: 0 for White, 1 for Black.
+        :param og_index: The square index the piece is moving from, None if off the board.
+        :param dest_index: The square index the piece is going to, None if off the board.
+        :return: True if the move was made, False if it is illegal.
+        """
+        # Is the piece actually at the origin and ACTIVE?
+        if og_index is None or not self._occupancy[side] & (1 << og_index):
+            return self._reject(side, og_index, dest_index, NO_PIECE)
+        if og_index == dest_index:
+            return self._reject(side, og_index, dest_index, SAME_SQUARE)
+        if dest_index is None:  # On the board?
+            return self._reject(side, og_index, dest_index, OFF_BOARD)
+        if self._occupancy[side] & (1 << dest_index):  # Square has one of our own pieces?
+            return self._reject(side, og_index, dest_index, OWN_PIECE)
+
+        piece_type = self._piece_type_at(side, og_index)
+        verdict = self._cached_check_rules(side, piece_type, og_index, dest_index)
+        if verdict == _RULES_BROKEN:
+            return self._reject(side, og_index, dest_index, ILLEGAL_MOVE)
+        if verdict == _KING_IN_DANGER:
+            game_state = self._game_state
+            self.set_game_state('UNFINISHED')
+            if self._listeners and game_state != 'UNFINISHED':
+                self._notify(GameStateChanged('UNFINISHED', False))
+            return self._reject(side, og_index, dest_index, KING_IN_DANGER)
+
+        game_state = self._game_state
+        captured = self.push((og_index, dest_index))
+        if self._listeners:
+            destination = square_name(dest_index)
+            self._notify(MoveApplied(SIDES[side], square_name(og_index), destination, SYMBOLS[side][piece_type]))
+            if captured is not None:
+                self._notify(PieceCaptured(SIDES[side], destination, captured.get_symbol()))
+            if self._game_state != game_state or self.is_game_over():
+                self._notify(GameStateChanged(self._game_state, self.is_game_over()))
+            if not self.is_game_over():
+                self._notify(TurnChanged(self._turn_state))
+        return True
+
+    def add_listener(self, listener):
+        """
+        Subscribe to move events, see ChessVariant.add_listener().
+        """
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener):
+        """
+        Unsubscribe a listener added with add_listener().
+        """
+        self._listeners.remove(listener)
+
+    def clear_listeners(self):
+        """
+        Unsubscribe every listener.
+        """
+        self._listeners.clear()
+
+    def _notify(self, event):
+        """
+        Hand an event to every listener. Callers check self._listeners first so that no
+        event is built when nobody is listening.
+        """
+        for listener in self._listeners:
+            listener(event)
+
+    def _reject(self, side, og_index, dest_index, reason):
+        """
+        Tell the listeners a move was turned down.
+        :return: False, for _set_piece_location to hand back.
+        """
+        if self._listeners:
+            self._notify(MoveRejected(SIDES[side], None if og_index is None else square_name(og_index),
+                                      None if dest_index is None else square_name(dest_index), reason))
+        return False
+
+    def explain_rejection(self, move):
+        """
+        Learn why make_move_fast() turns a move down by trying it again with a listener of
+        its own, so that callers who only play legal moves never pay for building events.
+        The board's other listeners don't hear the retry.
+        :param move: A Move, or any (origin, destination) pair of square indexes.
+        :return: The MoveRejected reason, ie ILLEGAL_MOVE, or None if the move is legal,
+        in which case it is taken back and the board left as it was.
+        """
+        rejections = []
+        listeners = self._listeners
+        self._listeners = [rejections.append]
+        try:
+            if self.make_move_fast(move):
+                self.pop()
+                return None
+        finally:
+            self._listeners = listeners
+        return rejections[-1].reason
+
+    def push(self, move):
+        """
+        Make a move that is already known to be legal, such as one handed out by
+        generate_legal_moves(), and remember how to take it back with pop(). Updates the
+        bitboards, attack maps and Piece objects, passes the turn and, if a King reached
+        row 8, the game state.
+        :param move: (origin, destination) square index pair.
+        :return: The captured Piece object, or None.
+        """
+        origin, destination = move
+        side = SIDES.index(self._turn_state)
+        opponent = side ^ 1
+        piece_type = self._piece_type_at(side, origin)
+        dest_bit = 1 << destination
+        captured = None
+        captured_type = None
+        if self._occupancy[opponent] & dest_bit:
+            captured = self._pieces[destination]
+            captured_type = self._piece_type_at(opponent, destination)
+            self._bitboards[opponent][captured_type] ^= dest_bit
+            self._occupancy[opponent] ^= dest_bit
+            self.remove_piece(captured)
+            captured.set_duty('CAPTURED')
+        # Undo record: the moved piece, the captured piece, then the turn, game state & hash to go back to.
+        self._undo_stack.append((origin, destination, piece_type, captured, captured_type,
+                                 self._turn_state, self._game_state, self._hash))
+        if captured is not None:
+            self._hash ^= ZOBRIST_PIECES[opponent][captured_type][destination]
+        piece_keys = ZOBRIST_PIECES[side][piece_type]
+        self._hash ^= piece_keys[origin] ^ piece_keys[destination]
+
+        move_bits = (1 << origin) | dest_bit
+        self._bitboards[side][piece_type] ^= move_bits
+        self._occupancy[side] ^= move_bits
+        piece = self._pieces[origin]
+        self._pieces[origin] = None
+        self._pieces[destination] = piece
+        piece.set_square(destination)
+        self._update_attacks(move_bits)
+
+        if piece_type == KING and destination >= 56:  # King made it to row 8.
+            if side == 0:
+                self.set_game_state('WHITE_WON')
+            elif self._game_state == 'WHITE_WON':
+                self.set_game_state('TIE')
+            else:
+                self.set_game_state('BLACK_WON')
+        self.set_turn_state(SIDES[opponent])
+        return captured
+
+    def pop(self):
+        """
+        Take back the last move made with push() (or make_move()), putting back any captured
+        piece along with the turn and game state from before the move.
+        :return: The (origin, destination) square index pair that was taken back, or None if
+        no move has been made.
+        """
+        if not self._undo_stack:
+            return None
+        (origin, destination, piece_type, captured, captured_type,
+         turn_state, game_state, zobrist_hash) = self._undo_stack.pop()
+        side = SIDES.index(turn_state)
+        move_bits = (1 << origin) | (1 << destination)
+        self._bitboards[side][piece_type] ^= move_bits
+        self._occupancy[side] ^= move_bits
+        piece = self._pieces[destination]
+        self._pieces[origin] = piece
+        piece.set_square(origin)
+        self._pieces[destination] = captured
+        if captured is not None:
+            self._bitboards[side ^ 1][captured_type] |= 1 << destination
+            self._occupancy[side ^ 1] |= 1 << destination
+            captured.set_square(destination)
+            captured.set_duty('ACTIVE')
+        self._update_attacks(move_bits)
+        self._turn_state = turn_state
+        self._game_state = game_state
+        self._hash = zobrist_hash
+        return origin, destination
+
+    def _update_attacks(self, changed):
+        """
+        Bring the attack maps up to date after the occupancy of some squares changed.
+        Only pieces standing on a changed square, and Bishops or Rooks whose attacks
+        run through one, are recomputed, everything else keeps the mask it had.
+        :param changed: Mask of the squares that were emptied or filled.
+        """
+        piece_attacks = self._piece_attacks
+        for side in (0, 1):
+            attacked = 0
+            for piece_type, mask in enumerate(self._bitboards[side]):
+                sliding = piece_type == BISHOP or piece_type == ROOK
+                while mask:
+                    low = mask & -mask
+                    index = low.bit_length() - 1
+                    mask ^= low
+                    if changed & low or (sliding and piece_attacks[index] & changed):
+                        piece_attacks[index] = self._reach_mask(piece_type, index)
+                    attacked |= piece_attacks[index]
+            self._attacked[side] = attacked
+
+    def _side_can_move(self, side):
+        """
+        Check that it is this side's turn and that the game state still lets it move.
+        White may only move while the game is UNFINISHED, Black also gets its last turn
+        after White has won.
+        """
+        if self._turn_state != SIDES[side]:
+            return False
+        return self._game_state == 'UNFINISHED' or (side == 1 and self._game_state == 'WHITE_WON')
+
+    def is_game_over(self):
+        """
+        Check whether the game has finished, so that neither side may move again. A game
+        White has won is only over once Black has had its last turn.
+        """
+        return not self._side_can_move(SIDES.index(self._turn_state))
+
+    def generate_legal_moves(self, captures_only=False):
+        """
+        Yield every legal move for the side whose turn it is, in one pass over its pieces.
+        The rules are the same ones make_move() goes through: move_rules, jump_rule and
+        check_for_check, including the rule that neither King may be put in check.
+        :param captures_only: Only yield the moves that capture an opponent piece.
+        :return: A generator of Move objects, pairs of square indexes.
+        """
+        side = SIDES.index(self._turn_state)
+        if not self._side_can_move(side):
+            return
+        opponent = side ^ 1
+        opponent_king = self._king_index(opponent)
+        if self._attacks(side, opponent_king):  # Their King is already open, nothing we move can fix that.
+            return
+        king_safe = not self._attacks(opponent, self._king_index(side))
+        if captures_only:
+            targets = self._occupancy[opponent]
+        else:
+            targets = ~self._occupancy[side] & FULL_BOARD
+        for piece_type, mask in enumerate(self._bitboards[side]):
+            if piece_type != KING and not king_safe:  # Only the King can step out of the way.
+                continue
+            while mask:
+                low = mask & -mask
+                origin = low.bit_length() - 1
+                mask ^= low
+                column = origin & 7
+                reach = self._piece_attacks[origin] & targets
+                while reach:
+                    low = reach & -reach
+                    destination = low.bit_length() - 1
+                    reach ^= low
+                    # Could this piece capture their King from the destination square?
+                    if self._can_reach(piece_type, destination, opponent_king, column):
+                        continue
+                    if piece_type == KING and self._attacks(opponent, destination):
+                        continue
+                    yield Move(origin, destination)
+
+    def _reach_mask(self, piece_type, origin):
+        """
+        Look up the mask of every square a piece could move to from where it stands, by the
+        same rules as _can_reach(). Sliding pieces stop on (and include) the first piece in
+        their way, apart from Black pieces below a Rook, which never block it.
+        :param piece_type: Index into PIECE_TYPES.
+        :param origin: Square index the piece stands on.
+        :return: A 64-bit int.
+        """
+        if piece_type == KNIGHT:
+            return KNIGHT_ATTACKS[origin]
+        if piece_type == KING:
+            return KING_ATTACKS[origin]
+        occupied = self._occupancy[0] | self._occupancy[1]
+        if piece_type == BISHOP:
+            return (ray_attacks(NORTH_EAST, origin, occupied) | ray_attacks(NORTH_WEST, origin, occupied) |
+                    ray_attacks(SOUTH_EAST, origin, occupied) | ray_attacks(SOUTH_WEST, origin, occupied))
+        return (ray_attacks(NORTH, origin, occupied) | ray_attacks(EAST, origin, occupied) |
+                ray_attacks(WEST, origin, occupied) | ray_attacks(SOUTH, origin, self._occupancy[0]))
+
+    def _piece_type_at(self, side, index):
+        """
+        Look up which of a side's piece types stands on a square.
+        :param side: 0 for White, 1 for Black.
+        :param index: Square index, 0 to 63.
+        :return: Index into PIECE_TYPES, or None if that side has no piece there.
+        """
+        bit = 1 << index
+        for piece_type, mask in enumerate(self._bitboards[side]):
+            if mask & bit:
+                return piece_type
+        return None
+
+    def _king_index(self, side):
+        """
+        Retrieve the square index of a side's King.
+        """
+        return self._bitboards[side][KING].bit_length() - 1
+
+    def _path_clear(self, piece_type, origin, destination, column):
+        """
+        Check the squares strictly between origin and destination for blockers.
+        Rooks look for vertical blockers in `column`, the file their piece object is on,
+        and Black pieces only block them on the way up the board, exactly as jump_rule
+        always has.
+        :return: True if nothing is in the way.
+        """
+        if piece_type == KNIGHT or piece_type == KING:  # Knights jump, Kings never pass over a square.
+            return True
+        occupied = self._occupancy[0] | self._occupancy[1]
+        if piece_type == ROOK and (origin & 7) == (destination & 7):  # Vertical
+            if destination < origin:  # Moving down the board.
+                occupied = self._occupancy[0]
+            base = column - (origin & 7)
+            return not BETWEEN[origin + base][destination + base] & occupied
+        return not BETWEEN[origin][destination] & occupied
+
+    def _can_reach(self, piece_type, origin, destination, column):
+        """
+        Decide whether a piece could move from origin to destination on the current board,
+        ignoring whatever stands on the destination square itself.
+        :param piece_type: Index into PIECE_TYPES.
+        :param origin: Square index the piece moves from.
+        :param destination: Square index the piece moves to.
+        :param column: The file (0 to 7) the piece object currently stands on.
+        :return: True if the move follows the piece's movement rules.
+        """
+        if piece_type == KNIGHT:
+            return KNIGHT_ATTACKS[origin] >> destination & 1 == 1
+        if piece_type == KING:
+            return KING_ATTACKS[origin] >> destination & 1 == 1
+        lines = BISHOP_LINES if piece_type == BISHOP else ROOK_LINES
+        if not lines[origin] >> destination & 1:
+            return False
+        return self._path_clear(piece_type, origin, destination, column)
+
+    def _attacks(self, side, target):
+        """
+        Check whether any active piece of `side` could move to the target square.
+        :param side: 0 for White, 1 for Black.
+        :param target: Square index.
+        :return: True if the square is attacked.
+        """
+        return self._attacked[side] >> target & 1 == 1
+
+    def _check_rules(self, side, piece_type, origin, destination):
+        """
+        Validate a move against the movement rules and the rule that neither King may be
+        left open to capture. Every test is made against the board as it stands before
+        the move, just as check_for_check has always done.
+        :param side: 0 for White, 1 for Black.
+        :param piece_type: Index into PIECE_TYPES of the moving piece.
+        :param origin: Square index the piece moves from.
+        :param destination: Square index the piece moves to.
+        :return: _LEGAL, _RULES_BROKEN if the piece can't move that way, or
+        _KING_IN_DANGER if the move breaks the check rule.
+        """
+        column = origin & 7
+        if not self._can_reach(piece_type, origin, destination, column):
+            return _RULES_BROKEN
+        opponent = side ^ 1
+        opponent_king = self._king_index(opponent)
+        # Could the current piece capture the King from the destination square?
+        if self._can_reach(piece_type, destination, opponent_king, column):
+            return _KING_IN_DANGER
+        # Can anyone on our roster capture their King?
+        if self._attacks(side, opponent_king):
+            return _KING_IN_DANGER
+        # Can anyone on their roster capture our King, or the square our King is moving to?
+        if self._attacks(opponent, destination if piece_type == KING else self._king_index(side)):
+            return _KING_IN_DANGER
+        return _LEGAL
+
+    def _cached_check_rules(self, side, piece_type, origin, destination):
+        """
+        _check_rules(), answered from the LegalityCache when the same question has been
+        asked in this position before.
+        """
+        cache = self._legality_cache
+        if cache is None:
+            return self._check_rules(side, piece_type, origin, destination)
+        key = (self._hash, piece_type, origin, destination)
+        verdict = cache.get(key)
+        if verdict is None:
+            verdict = self._check_rules(side, piece_type, origin, destination)
+            cache.put(key, verdict)
+        return verdict
+
+    def set_legality_cache(self, cache):
+        """
+        Turn on, swap or turn off the cache of move validation verdicts. Boards start
+        without one, see LegalityCache for when it is worth having.
+        :param cache: A LegalityCache, which may be shared with other Boards, or None to
+        validate every move from scratch.
+        """
+        self._legality_cache = cache
+
+    def get_legality_cache(self):
+        """
+        Retrieve the LegalityCache in front of move validation, for its counters. None if
+        caching is off, as it is by default.
+        """
+        return self._legality_cache
+
     def move_rules(self, origin, destination, piece, og_loc=None):
         """
         Define a series of test cases to determine whether the requested move is valid,
@@ -324,49 +1331,28 @@ class Board:
         :return: True if move is legal, False if Illegal (including King being put into check).
         """
         bool_list = []
-        column_key = [('a', 0), ('b', 1), ('c', 2), ('d', 3), ('e', 4), ('f', 5), ('g', 6), ('h', 7)]
-        destination_loc = (destination[0], int(destination[1]))
-
-        if og_loc is None:  # To account for a special case in the check_for_check function.
-            # Get origin location
-            if 'WHITE' in piece:
-                for elem in self._white_dict:
-                    if elem.get_location() == (origin[0], int(origin[1])):
-                        og_loc = elem.get_location()
-            if 'BLACK' in piece:
-                for elem in self._black_dict:
-                    if elem.get_location() == (origin[0], int(origin[1])):
-                        og_loc = elem.get_location()
-
-        # Translate letter columns to numbers using the column key, for origin piece
-        for elem in column_key:
-            if og_loc[0] in elem:  # Establish inner index.
-                og_column_loc: int = elem[1]
-        # For destination piece
-        for elem in column_key:
-            if destination_loc[0] in elem:
-                destination_column_loc: int = elem[1]
-                # Equals the number in the tuple of the corresponding letter in the column key.
+        og_column_loc = square_index(og_loc if og_loc is not None else origin) & 7
+        destination_column_loc = square_index(destination) & 7
 
+        piece_type = SYMBOL_CODES[piece][1]
         # Knight
-        if 'Kn' in piece:
+        if piece_type == KNIGHT:
             bool_list = self.knight_move(destination, origin, destination_column_loc, og_column_loc,
                                          bool_list)
         # Bishop
-        elif 'Bi' in piece:
+        elif piece_type == BISHOP:
             bool_list = self.bishop_move(destination, origin, destination_column_loc, og_column_loc,
                                          bool_list, piece)
         # Rook
-        elif 'R' in piece:
+        elif piece_type == ROOK:
             bool_list = self.rook_move(destination, origin, destination_column_loc, og_column_loc,
                                        bool_list, piece)
         # King
-        elif 'K' in piece:
+        elif piece_type == KING:
             self.king_move(destination, origin, destination_column_loc, og_column_loc,
-                           bool_list, og_loc, destination_loc, piece)
+                           bool_list, og_loc, (destination[0], int(destination[1])), piece)
 
         if False not in bool_list:
-            bool_list.clear()
             return True
         return False
 
@@ -379,88 +1365,20 @@ class Board:
         :param current_piece: The 'owner + piece-type' symbol of the current player's piece
         :return: True if valid, False if illegal.
         """
-        # King objects
-        white_k = self.get_king('WHITE')
-        black_k = self.get_king('BLACK')
-        bool_list = []
-
-        if self.get_turn_state() == 'BLACK':
-            # Validating the entire basic movement rules here for the current piece.
-            if self.move_rules(origin, destination, current_piece) is True:
-                white_king_loc: tuple[str, int] = white_k.get_location()  # 'letter + num'
-                # Could the current piece capture the King from the destination square?
-                if self.move_rules(destination, white_king_loc, current_piece, og_loc=destination) is True:
-                    bool_list.append(False)
-
-                # Can anyone in the White roster capture the Black King?
-                for elem in self._white_dict:
-                    if elem.get_location() is None:  # Account for being in piece jail
-                        bool_list.append('JAIL')
-                    # If the piece moving is the King, can any opponent pieces move to where it's going on next turn?
-                    elif current_piece == black_k.get_symbol():
-                        if self.move_rules(elem.get_location(), destination, elem.get_symbol()) is True:
-                            bool_list.append(False)  # If so, you can't move there, the King will be in danger.
-                    elif self.move_rules(elem.get_location(), black_k.get_location(), elem.get_symbol()) is True:
-                        bool_list.append(False)  # If so, that move is illegal.
-                    else:
-                        bool_list.append(True)
-                # Can anyone in the Black roster capture the White King?
-                for elem in self._black_dict:
-                    if elem.get_location() is None:  # Account for being in piece jail
-                        bool_list.append('JAIL')
-                    elif self.move_rules(elem.get_location(), white_k.get_location(), elem.get_symbol()) is True:
-                        bool_list.append(False)  # That move is illegal too.
-                    else:
-                        bool_list.append(True)
-            else:
-                return False
-
-        if self.get_turn_state() == 'WHITE':
-            # Validating the entire basic movement rules here for the current piece.
-            if self.move_rules(origin, destination, current_piece) is True:
-                black_king_loc: tuple[str, int] = black_k.get_location()  # 'letter + num'
-                # Could the current piece capture the King from the destination square?
-                if self.move_rules(destination, black_king_loc, current_piece, og_loc=destination) is True:
-                    bool_list.append(False)
-
-                # Can anyone in the White roster capture the Black King?
-                for elem in self._white_dict:
-                    if elem.get_location() is None:  # Account for being in piece jail
-                        bool_list.append('JAIL')
-                    elif self.move_rules(elem.get_location(), black_k.get_location(), elem.get_symbol()) is True:
-                        bool_list.append(False)
-                    else:
-                        bool_list.append(True)
-                # Can anyone in the Black roster capture the White King?
-                for elem in self._black_dict:
-                    if elem.get_location() is None:  # Account for being in piece jail
-                        bool_list.append('JAIL')
-                    # If the piece moving is the King, can any opponent pieces move to where it's going next turn?
-                    elif current_piece == white_k.get_symbol():
-                        if self.move_rules(elem.get_location(), destination, elem.get_symbol()) is True:
-                            bool_list.append(False)  # If so, you can't move there, the King will be in danger.
-                    elif self.move_rules(elem.get_location(), white_k.get_location(), elem.get_symbol()) is True:
-                        bool_list.append(False)
-                    else:
-                        bool_list.append(True)
-            else:
-                return False
-
-        if False not in bool_list and self.get_game_state() == 'UNFINISHED':  # Normal state of play. Mid-game
-            bool_list.clear()
-            return True
-        elif False not in bool_list and self.get_game_state() != 'UNFINISHED':  # Legal endgame
-            bool_list.clear()
-            return True
-        else:  # False in bool_list and game_state != 'UNFINISHED', set game state back to unfinished and continue.
-            bool_list.clear()
+        side = SIDES.index(self.get_turn_state())
+        piece_type = SYMBOL_CODES[current_piece][1]
+        og_index = square_index(origin)
+        dest_index = square_index(destination)
+        verdict = self._cached_check_rules(side, piece_type, og_index, dest_index)
+        if verdict == _RULES_BROKEN:
+            return False
+        if verdict == _KING_IN_DANGER:
             self.set_game_state('UNFINISHED')
             return False
-
-        #if False not in bool_list:
-         #   bool_list.clear()
-          #  return True
-        #return False
+        if piece_type == KING and dest_index >= 56:
+            self.king_move(destination, origin, dest_index & 7, og_index & 7, [], square_tuple(og_index),
+                           square_tuple(dest_index), current_piece)
+        return True
 
     def jump_rule(self, destination, origin, destination_column_loc, og_column_loc, bool_list, piece, og_loc=None):
         """
@@ -474,160 +1392,13 @@ class Board:
         :param og_loc: Used for a special case in the check_for_check function.
         :return: True if piece can jump, False if not.
         """
-        column_key = [('a', 0), ('b', 1), ('c', 2), ('d', 3), ('e', 4), ('f', 5), ('g', 6), ('h', 7)]
-        horz_dist = abs(destination_column_loc - og_column_loc)
-        vert_dist = abs(int(destination[1]) - int(origin[1]))
-
-        if 'WHITE' in piece:
-            for elem in self._white_dict:
-                if elem.get_symbol() == piece:
-                    piece_obj: King | Bishop | Rook | Knight = elem
-        if 'BLACK' in piece:
-            for elem in self._black_dict:
-                if elem.get_symbol() == piece:
-                    piece_obj: King | Bishop | Rook | King = elem
-
-        # White pieces in the way
-        for elem in self._white_dict:  # Check the whole roster
-            if elem.get_location() is None:
-                bool_list.append('JAIL')
-
-            elif 'Bi' not in piece_obj.get_symbol():  # Doesn't apply to bishops
-                # Horizontal
-                if int(origin[1]) == elem.get_location()[1]:  # Is this other piece in the same row?
-                    for index in column_key:
-                        if elem.get_location()[0] == index[0]:  # Establish inner index.
-                            elem_column: int = index[1]
-                            if og_column_loc > elem_column > destination_column_loc or \
-                                    og_column_loc < elem_column < destination_column_loc:
-                                bool_list.append(False)  # If the piece is in the same row, it'll be in the way.
-                            else:
-                                bool_list.append(True)
-
-                # Vertical
-                if piece_obj.get_location()[0] == elem.get_location()[0]:  # Is this other piece in the same column?
-                    if int(origin[1]) < elem.get_location()[1] < int(destination[1]) or \
-                            int(origin[1]) > elem.get_location()[1] > int(destination[1]):
-                        bool_list.append(False)
-                    else:
-                        bool_list.append(True)
-
-                # Diagonal
-                elif horz_dist == vert_dist:
-                    # Check vertical problem first because it's easier
-                    if int(origin[1]) < elem.get_location()[1] < int(destination[1]) or \
-                            int(origin[1]) > elem.get_location()[1] > int(destination[1]):
-                        for index in column_key:  # Then check horizontal issue using column key technique
-                            if elem.get_location()[0] == index[0]:  # Establish inner index.
-                                elem_column: int = index[1]
-                                if og_column_loc > elem_column > destination_column_loc or \
-                                        og_column_loc < elem_column < destination_column_loc:
-                                    # If both these conditions are True, then the elem piece may be in the way,
-                                    # check using slope! If the slope of the elem_piece location is equal to |1|
-                                    # then it is in the path of the bishop!
-                                    elem_coords = (int(elem.get_location()[1]), elem_column)
-                                    bish_origin_coords = (int(origin[1]), og_column_loc)
-                                    elem_slope = abs((bish_origin_coords[1] - elem_coords[1])
-                                                     / (bish_origin_coords[0] - elem_coords[0]))
-                                    if elem_slope == 1:
-                                        bool_list.append(False)
-                else:
-                    bool_list.append(True)
-
-            # Diagonal
-            elif horz_dist == vert_dist:  # A bishop always moves with a linear slope of |1|
-                # Check vertical problem first because it's easier
-                if int(origin[1]) < elem.get_location()[1] < int(destination[1]) or \
-                        int(origin[1]) > elem.get_location()[1] > int(destination[1]):
-                    for index in column_key:  # Then check horizontal issue using column key technique
-                        if elem.get_location()[0] == index[0]:  # Establish inner index.
-                            elem_column: int = index[1]
-                            if og_column_loc > elem_column > destination_column_loc or \
-                                    og_column_loc < elem_column < destination_column_loc:
-                                # If both these conditions are True, then the elem piece may be in the way,
-                                # check using slope! If the slope of the elem_piece location is equal to |1|
-                                # then it is in the path of the bishop!
-                                elem_coords = (int(elem.get_location()[1]), elem_column)
-                                bish_origin_coords = (int(origin[1]), og_column_loc)
-                                elem_slope = abs((bish_origin_coords[1] - elem_coords[1])
-                                                 / (bish_origin_coords[0] - elem_coords[0]))
-                                if elem_slope == 1:
-                                    bool_list.append(False)
-                            else:
-                                bool_list.append(True)
-
-        # Black pieces in the way?
-        for elem in self._black_dict:  # Check the whole roster
-            if elem.get_location() is None:
-                bool_list.append('JAIL')
-
-            elif 'Bi' not in piece_obj.get_symbol():  # Doesn't apply to bishops
-                # Horizontal
-                if int(origin[1]) == elem.get_location()[1]:  # Is this other piece in the same row?
-                    for index in column_key:
-                        if elem.get_location()[0] == index[0]:  # Establish inner index.
-                            elem_column: int = index[1]
-                            if og_column_loc > elem_column > destination_column_loc or \
-                                    og_column_loc < elem_column < destination_column_loc:
-                                bool_list.append(False)  # If the piece is in the same row, it'll be in the way.
-                            else:
-                                bool_list.append(True)
-
-                # Vertical
-                if piece_obj.get_location()[0] == elem.get_location()[0]:  # Is this other piece in the same column?
-                    if int(origin[1]) < elem.get_location()[1] < int(destination[1]) or \
-                            int(origin[1]) < elem.get_location()[1] < int(destination[1]):
-                        bool_list.append(False)
-                    else:
-                        bool_list.append(True)
-
-                # Diagonal
-                if horz_dist == vert_dist:
-                    # Check vertical problem first because it's easier
-                    if int(origin[1]) < elem.get_location()[1] < int(destination[1]) or \
-                            int(origin[1]) > elem.get_location()[1] > int(destination[1]):
-                        for index in column_key:  # Then check horizontal issue using column key technique
-                            if elem.get_location()[0] == index[0]:  # Establish inner index.
-                                elem_column: int = index[1]
-                                if og_column_loc > elem_column > destination_column_loc or \
-                                        og_column_loc < elem_column < destination_column_loc:
-                                    # If both these conditions are True, then the elem piece may be in the way,
-                                    # check using slope! If the slope of the elem_piece location is equal to |1|
-                                    # then it is in the path of the bishop!
-                                    elem_coords = (int(elem.get_location()[1]), elem_column)
-                                    bish_origin_coords = (int(origin[1]), og_column_loc)
-                                    elem_slope = abs((bish_origin_coords[1] - elem_coords[1])
-                                                     / (bish_origin_coords[0] - elem_coords[0]))
-                                    if elem_slope == 1:
-                                        bool_list.append(False)
-                else:
-                    bool_list.append(True)
-
-            # Diagonal
-            elif horz_dist == vert_dist:
-                # Check vertical problem first because it's easier
-                if int(origin[1]) < elem.get_location()[1] < int(destination[1]) or \
-                        int(origin[1]) > elem.get_location()[1] > int(destination[1]):
-                    for index in column_key:  # Then check horizontal issue using column key technique
-                        if elem.get_location()[0] == index[0]:  # Establish inner index.
-                            elem_column: int = index[1]
-                            if og_column_loc > elem_column > destination_column_loc or \
-                                    og_column_loc < elem_column < destination_column_loc:
-                                # If both these conditions are True, then the elem piece may be in the way,
-                                # check using slope! If the slope of the elem_piece location is equal to |1|
-                                # then it is in the path of the bishop!
-                                elem_coords = (int(elem.get_location()[1]), elem_column)
-                                bish_origin_coords = (int(origin[1]), og_column_loc)
-                                elem_slope = abs((bish_origin_coords[1] - elem_coords[1])
-                                                 / (bish_origin_coords[0] - elem_coords[0]))
-                                if elem_slope == 1:
-                                    bool_list.append(False)
-            else:
-                bool_list.append(True)
-        if False not in bool_list:
-            return True
-        else:
-            return False
+        side, piece_type = SYMBOL_CODES[piece]
+        og_index = (int(origin[1]) - 1) * 8 + og_column_loc
+        dest_index = (int(destination[1]) - 1) * 8 + destination_column_loc
+        column = og_column_loc
+        if piece_type == ROOK and self._bitboards[side][ROOK]:  # Rooks look down the file their piece is on.
+            column = (self._bitboards[side][ROOK].bit_length() - 1) & 7
+        return self._path_clear(piece_type, og_index, dest_index, column)
 
     def king_move(self, destination, origin, destination_column_loc, og_column_loc,
                   bool_list, og_loc, destination_loc, piece):
@@ -643,60 +1414,19 @@ class Board:
         :param og_loc: Used for a special case in the check_for_check function.
         :return: True, if the move is legal, False otherwise.
         """
-        # Horizontal move
-        if int(destination[1]) == int(origin[1]):  # Horizontal move?
-            if abs(destination_column_loc - og_column_loc) == 1:  # Kings can only move one square away.
-                # Jump-check
-                if self.jump_rule(destination, origin, destination_column_loc, og_column_loc,
-                                  bool_list, piece) is False:
-                    bool_list.append(False)
-                    return bool_list
-                else:
-                    bool_list.append(True)
-            else:
-                bool_list.append(False)  # Too far to move
-
-        # Vertical move, can win here
-        elif destination_column_loc == og_column_loc:  # Then maybe it's a vertical move?
-            if abs(og_loc[1] - destination_loc[1]) == 1:
-                if self.jump_rule(destination, origin, destination_column_loc, og_column_loc,
-                                  bool_list, piece) is False:
-                    bool_list.append(False)
-                    return bool_list
-                else:
-                    bool_list.append(True)
-                    if destination_loc[1] == 8 and self.get_turn_state() == 'BLACK':  # Win on Black turn.
-                        if self.get_game_state() == 'WHITE_WON':
-                            print('It\'s a tie!!!')
-                            self.set_game_state('TIE')
-                        else:
-                            self.set_game_state('BLACK_WON')
-                    if destination_loc[1] == 8 and self.get_turn_state() == 'WHITE':  # Win on White turn.
-                        print('White has won, but Black gets one more turn!')
-                        self.set_game_state('WHITE_WON')
-            else:
-                bool_list.append(False)
-
-        # Diagonal move, can win here too
-        elif int(destination[1]) != int(origin[1]) and destination_column_loc != og_column_loc:  # Maybe diagonal?
-            if abs(destination_column_loc - og_column_loc) == 1 and abs(og_loc[1] - destination_loc[1]) == 1:
-                if self.jump_rule(destination, origin, destination_column_loc, og_column_loc,
-                                  bool_list, piece) is False:
-                    bool_list.append(False)
-                    return bool_list
-                else:
-                    bool_list.append(True)
-                    if destination_loc[1] == 8 and self.get_turn_state() == 'BLACK':  # Win on Black turn.
-                        if self.get_game_state() == 'WHITE_WON':
-                            print('It\'s a tie!!!')
-                            self.set_game_state('TIE')
-                        else:
-                            self.set_game_state('BLACK_WON')
-                    if destination_loc[1] == 8 and self.get_turn_state() == 'WHITE':  # Win on White turn.
-                        print('White has won, but Black gets one more turn!')
-                        self.set_game_state('WHITE_WON')
+        og_index = (int(origin[1]) - 1) * 8 + og_column_loc
+        dest_index = (int(destination[1]) - 1) * 8 + destination_column_loc
+        if not self._can_reach(KING, og_index, dest_index, og_column_loc):
+            bool_list.append(False)
+            return bool_list
+        bool_list.append(True)
+        if destination_loc[1] == 8 and self.get_turn_state() == 'BLACK':  # Win on Black turn.
+            if self.get_game_state() == 'WHITE_WON':
+                self.set_game_state('TIE')
             else:
-                bool_list.append(False)
+                self.set_game_state('BLACK_WON')
+        if destination_loc[1] == 8 and self.get_turn_state() == 'WHITE':  # Win on White turn.
+            self.set_game_state('WHITE_WON')
         return bool_list
 
     def rook_move(self, destination, origin, destination_column_loc, og_column_loc, bool_list, piece):
@@ -713,30 +1443,12 @@ class Board:
         horz_dist = abs(destination_column_loc - og_column_loc)
         vert_dist = abs(int(destination[1]) - int(origin[1]))
 
-        if horz_dist == vert_dist:  # Diagonal movement check.
+        if horz_dist == vert_dist or (horz_dist and vert_dist):  # Diagonal or not in a straight line.
             bool_list.append(False)
-            return bool_list
-
-        elif int(destination[1]) == int(origin[1]):  # Horizontal move?
-            # Jump-check
-            if self.jump_rule(destination, origin, destination_column_loc, og_column_loc, bool_list, piece) is False:
-                bool_list.append(False)
-                return bool_list
-            else:
-                bool_list.append(True)
-                return bool_list
-
-        elif destination[0] == origin[0]:  # Vertical move?
-            # Jump-check
-            if self.jump_rule(destination, origin, destination_column_loc, og_column_loc, bool_list, piece) is False:
-                bool_list.append(False)
-                return bool_list
-            else:
-                bool_list.append(True)
-                return bool_list
         else:
-            bool_list.append(False)
-            return bool_list
+            bool_list.append(self.jump_rule(destination, origin, destination_column_loc, og_column_loc,
+                                            bool_list, piece))
+        return bool_list
 
     def knight_move(self, destination, origin, destination_column_loc, og_column_loc, bool_list):
         """
@@ -748,14 +1460,9 @@ class Board:
         :param bool_list: The container to place True or False in.
         :return: True, if the move is legal, False otherwise.
         """
-        # Vertical 2 & horizontal 1
-        if abs(int(destination[1]) - int(origin[1])) == 2 and abs(destination_column_loc - og_column_loc) == 1:
-            bool_list.append(True)
-        # Horizontal 2 & vertical 1
-        elif abs(int(destination[1]) - int(origin[1])) == 1 and abs(destination_column_loc - og_column_loc) == 2:
-            bool_list.append(True)
-        else:
-            bool_list.append(False)
+        og_index = (int(origin[1]) - 1) * 8 + og_column_loc
+        dest_index = (int(destination[1]) - 1) * 8 + destination_column_loc
+        bool_list.append(self._can_reach(KNIGHT, og_index, dest_index, og_column_loc))
         return bool_list
 
     def bishop_move(self, destination, origin, destination_column_loc, og_column_loc, bool_list, piece):
@@ -772,22 +1479,11 @@ class Board:
         horz_dist = abs(destination_column_loc - og_column_loc)
         vert_dist = abs(int(destination[1]) - int(origin[1]))
 
-        if int(destination[1]) == int(origin[1]):  # Horizontal move? Same row?
+        if horz_dist != vert_dist or horz_dist == 0:  # Only ever diagonal.
             bool_list.append(False)
-
-        elif destination[0] == origin[0]:  # Vertical move? Same column?
-            bool_list.append(False)
-
-        elif int(destination[1]) != int(origin[1]) and destination_column_loc != og_column_loc:  # Maybe diagonal?
-            if horz_dist != vert_dist:
-                bool_list.append(False)
-            else:
-                if self.jump_rule(destination, origin, destination_column_loc, og_column_loc,
-                                  bool_list, piece) is False:
-                    bool_list.append(False)
-                    return bool_list
-                else:
-                    bool_list.append(True)
+        else:
+            bool_list.append(self.jump_rule(destination, origin, destination_column_loc, og_column_loc,
+                                            bool_list, piece))
         return bool_list
 
     def check_square(self, square):
@@ -798,13 +1494,10 @@ class Board:
         :return: "OCCUPIED" if the square has a piece on it, "EMPTY" if the square
         is unoccupied, and "INVALID" if the square is off the board.
         """
-        for piece in self._white_dict:
-            if piece.get_location() == square:
-                return piece.get_symbol()
-        for piece in self._black_dict:
-            if piece.get_location() == square:
-                return piece.get_symbol()
-        return 'EMPTY'
+        index = square_index(square)
+        if index is None or self._pieces[index] is None:
+            return 'EMPTY'
+        return self._pieces[index].get_symbol()
 
     def remove_piece(self, piece):
         """
@@ -813,7 +1506,7 @@ class Board:
         :param piece: Refers to the key value in the appropriate dictionary of pieces. i.e. 'WHITE K'
         :return: Updates piece object's duty and location data members.
         """
-        return piece.set_location(None)
+        return piece.set_square(None)
 
     def get_king(self, black_or_white):
         """
@@ -822,13 +1515,8 @@ class Board:
         :return: King object from the relevant dictionary specified by the parameter.
         """
         if black_or_white == 'WHITE':
-            for elem in self._white_dict:
-                if elem.get_symbol() == 'WHITE K':
-                    return elem
-        else:
-            for elem in self._black_dict:
-                if elem.get_symbol() == 'BLACK K':
-                    return elem
+            return self._pieces[self._king_index(0)]
+        return self._pieces[self._king_index(1)]
 
     def __repr__(self):
         """
@@ -846,10 +1534,16 @@ class Piece:
     Collaboration with Board to validate the legality of a move or inform Board
     when a King has crossed the finish line.
     Children: King, Bishop, Rook, Knight.
+
+    Pieces use __slots__ and keep their side, type and square as small ints (see SIDES,
+    PIECE_TYPES and square_index()). The string and tuple getters translate on the way out.
     """
+    __slots__ = ('_side', '_piece_type', '_square', '_duty')
 
-    def __init__(self, owned_by):
-        self._owned_by = owned_by
+    def __init__(self, owned_by, piece_type=None, square=None):
+        self._side = SIDES.index(owned_by)
+        self._piece_type = piece_type
+        self._square = square
         self._duty = "ACTIVE"  # Can be changed to "CAPTURED" otherwise.
 
     def set_duty(self, new_duty):
@@ -868,14 +1562,26 @@ class Piece:
         Retrieve the owner of this chess piece.
         :return: Either "WHITE" or "BLACK" depending on who owns the piece.
         """
-        return self._owned_by
+        return SIDES[self._side]
 
     def get_duty(self):
         """
         Retrieve the duty status of this chess piece.
         :return: Either "ACTIVE" or "CAPTURED" depending on the status.
         """
-        return self._owned_by
+        return self._duty
+
+    def get_side(self):
+        """
+        Retrieve the owner of this chess piece as an index into SIDES, 0 for White, 1 for Black.
+        """
+        return self._side
+
+    def get_piece_type(self):
+        """
+        Retrieve the type of this chess piece as an index into PIECE_TYPES.
+        """
+        return self._piece_type
 
     def set_location(self, new_loc):
         """
@@ -883,24 +1589,44 @@ class Piece:
         :param new_loc: Can be None to clear the location, or ('letter',square) for a new square.
         :return: Updated piece location.
         """
-        if new_loc is None:
-            self._location = None
-            return self._location
-        self._location = (new_loc[0], int(new_loc[1]))
+        self._square = None if new_loc is None else square_index(new_loc)
+        return self.get_location()
 
     def get_location(self):
         """
         Retrieve piece location on the board in the form of a tuple.
-        :return: Type Tuple: ('letter' , number)
+        :return: Type Tuple: ('letter' , number), or None once the piece has been captured.
         """
-        return self._location
+        if self._square is None:
+            return None
+        return SQUARE_TUPLES[self._square]
+
+    def set_square(self, index):
+        """
+        Change the location of the piece on the board by square index.
+        :param index: 0 for a1 ... 63 for h8, or None to clear the location.
+        """
+        self._square = index
+
+    def get_square(self):
+        """
+        Retrieve the square index of the piece, 0 for a1 ... 63 for h8, or None once captured.
+        """
+        return self._square
+
+    def get_symbol(self):
+        """
+        Retrieve the symbol of this piece.
+        :return: A string representing the piece's owner & Type, ie 'WHITE Kn'.
+        """
+        return SYMBOLS[self._side][self._piece_type]
 
     def __repr__(self):
         """
         Allows the debugger to show an object's attributes rather than its
         address in memory.
         """
-        return "{}({!r})".format(self.__class__.__name__, self.__dict__)
+        return "{}({!r})".format(self.__class__.__name__, {slot: getattr(self, slot) for slot in Piece.__slots__})
 
 
 class King(Piece):
@@ -909,28 +1635,10 @@ class King(Piece):
     Also informs Board when to update the game state due to a Winning
     or Tying condition. Knows its symbol on the board, "K".
     """
+    __slots__ = ()
 
     def __init__(self, owned_by):
-        super().__init__(owned_by)
-        if self._owned_by == 'WHITE':
-            self._location = ('a', 1)  # CHANGE BACK TO 'a1'
-        if self._owned_by == 'BLACK':
-            self._location = ('h', 1)  # CHANGE BACK TO 'h1'
-        self._symbol = 'K'
-
-    def get_location(self):
-        """
-        Retrieve the physical location of the chess piece on the playing board.
-        :return: A string indicating the row and column that the piece is occupying.
-        """
-        return self._location
-
-    def get_symbol(self):
-        """
-        Retrieve the symbol of this piece.
-        :return: A string representing the piece's Type.
-        """
-        return self._owned_by + ' ' + self._symbol
+        super().__init__(owned_by, KING, _START_SQUARES[owned_by, KING, 1])
 
     def win_game(self, origin, destination):
         """
@@ -950,34 +1658,10 @@ class Bishop(Piece):
     Knows the specific movement and capture rules of a Bishop piece.
     Knows its symbol on the board, "B".
     """
+    __slots__ = ()
 
     def __init__(self, owned_by, one_or_two):
-        super().__init__(owned_by)
-        if one_or_two == 1:
-            if self._owned_by == 'WHITE':
-                self._location = ('b', 1)
-            if self._owned_by == 'BLACK':
-                self._location = ('g', 1)
-        if one_or_two == 2:
-            if self._owned_by == 'BLACK':
-                self._location = ('g', 2)
-            if self._owned_by == 'WHITE':
-                self._location = ('b', 2)  # SHOULD BE: 'b2'
-        self._symbol = "Bi"
-
-    def get_location(self):
-        """
-        Retrieve the physical location of the chess piece on the playing board.
-        :return: A string indicating the row and column that the piece is occupying.
-        """
-        return self._location
-
-    def get_symbol(self):
-        """
-        Retrieve the symbol of this piece.
-        :return: A string representing the piece's Type.
-        """
-        return self._owned_by + ' ' + self._symbol
+        super().__init__(owned_by, BISHOP, _START_SQUARES.get((owned_by, BISHOP, one_or_two)))
 
 
 class Rook(Piece):
@@ -985,28 +1669,10 @@ class Rook(Piece):
     Knows the specific movement and capture rules of a Rook piece.
     Knows its symbol on the board, "R".
     """
+    __slots__ = ()
 
     def __init__(self, owned_by):
-        super().__init__(owned_by)
-        if self.get_owned_by() == 'BLACK':
-            self._location = ('h', 2)
-        if self.get_owned_by() == 'WHITE':
-            self._location = ('a', 2)  # SHOULD BE: 'a2'
-        self._symbol = "R"
-
-    def get_location(self):
-        """
-        Retrieve the physical location of the chess piece on the playing board.
-        :return: A string indicating the row and column that the piece is occupying.
-        """
-        return self._location
-
-    def get_symbol(self):
-        """
-        Retrieve the symbol of this piece.
-        :return: A string representing the piece's Type.
-        """
-        return self._owned_by + ' ' + self._symbol
+        super().__init__(owned_by, ROOK, _START_SQUARES[owned_by, ROOK, 1])
 
 
 class Knight(Piece):
@@ -1014,35 +1680,47 @@ class Knight(Piece):
     Knows the specific movement and capture rules of a Knight piece.
     Knows its symbol on the board, "Kn".
     """
+    __slots__ = ()
 
     def __init__(self, owned_by, one_or_two):
-        super().__init__(owned_by)
-        if one_or_two == 1:
-            if self._owned_by == 'WHITE':
-                self._location = ('c', 1)
-            if self._owned_by == 'BLACK':
-                self._location = ('f', 1)
-        if one_or_two == 2:
-            if self._owned_by == 'BLACK':
-                self._location = ('f', 2)
-            if self._owned_by == 'WHITE':
-                self._location = ('c', 2)  # SHOULD BE: 'c2'
-        self._symbol = "Kn"
+        super().__init__(owned_by, KNIGHT, _START_SQUARES.get((owned_by, KNIGHT, one_or_two)))
 
-    def get_location(self):
-        """
-        Retrieve the physical location of the chess piece on the playing board.
-        :return: A string indicating the row and column that the piece is occupying.
-        """
-        return self._location
 
-    def get_symbol(self):
-        """
-        Retrieve the symbol of this piece.
-        :return: A string representing the piece's Type.
-        """
-        return self._owned_by + ' ' + self._symbol
+def print_event(event):
+    """
+    Listener for ChessVariant.add_listener() that writes each event to the terminal.
+    """
+    if isinstance(event, PieceCaptured):
+        print(f'You\'ve captured {event.piece}! Nice job.')
+    elif isinstance(event, GameStateChanged):
+        if event.game_state == 'WHITE_WON' and not event.game_over:
+            print('White has won, but Black gets one more turn!')
+        elif event.game_state == 'TIE':
+            print('It\'s a tie!!!')
+        if event.game_over:
+            print('Game over!')
+    elif isinstance(event, TurnChanged):
+        print(f'It\'s {event.turn.capitalize()} player\'s turn now.')
+    elif isinstance(event, MoveRejected):
+        reasons = {
+            SAME_SQUARE: 'The piece has to move somewhere!',
+            NOT_YOUR_TURN: 'It\'s not your turn!',
+            GAME_OVER: 'The game is over!',
+            NO_PIECE: 'You don\'t have a piece there!',
+            OFF_BOARD: 'That\'s off the board! Try again.',
+            OWN_PIECE: 'Square occupied by your own team! Try again.',
+            ILLEGAL_MOVE: 'That piece can\'t move like that!',
+            KING_IN_DANGER: 'That would leave a King open to capture!',
+        }
+        print(reasons[event.reason])
 
 
 if __name__ == '__main__':
     game = ChessVariant()
+    game.add_listener(print_event)
+    while not game.get_board_object().is_game_over():
+        move = input(f'{game.get_turn_state().capitalize()} to move (ie a1 a2, q to quit): ').split()
+        if move == ['q']:
+            break
+        if len(move) == 2:
+            game.make_move(move[0], move[1])
@@ -0,0 +1,198 @@
+# Description: Batch analysis of many ChessVar positions at once with NumPy. Positions come in as an
+# (N, 64) int8 array, one row per board and one column per square (a1 = 0, b1 = 1, ... h8 = 63), holding
+# 0 for an empty square, PIECE_TYPES index + 1 for a White piece (1 King, 2 Bishop, 3 Rook, 4 Knight) and
+# the same negated for a Black one. analyze() works on every board together, square by square, with
+# 64-bit bitboards held in uint64 arrays, and finds each board's legal moves, which Kings are open to
+# capture and how the race to row 8 stands. The rules are the ones Board.move_rules and check_for_check
+# enforce, quirks included: Black pieces don't block a Rook moving down its file, and a Rook that would
+# threaten the enemy King down a file looks for blockers on the file it is moving from.
+#
+# Requires NumPy.
+
+import numpy as np
+
+from ChessVar import (SIDES, PIECE_TYPES, GAME_STATES, KING, BISHOP, ROOK, KNIGHT, KING_ATTACKS,
+                      KNIGHT_ATTACKS, RAYS, NORTH, EAST, NORTH_EAST, NORTH_WEST, SOUTH, WEST, SOUTH_EAST,
+                      SOUTH_WEST)
+
+_ONE = np.uint64(1)
+_BITS = np.array([1 << index for index in range(64)], dtype=np.uint64)
+_KING_ATTACKS = np.array(KING_ATTACKS, dtype=np.uint64)
+_KNIGHT_ATTACKS = np.array(KNIGHT_ATTACKS, dtype=np.uint64)
+_RAYS = np.array(RAYS, dtype=np.uint64)  # [direction][square]
+_UP = (NORTH, EAST, NORTH_EAST, NORTH_WEST)  # Directions towards higher square indexes.
+_FILES = np.array([0x0101010101010101 << column for column in range(8)], dtype=np.uint64)
+
+
+def encode_boards(boards):
+    """
+    Pack Board objects into the arrays analyze() takes.
+    :param boards: Iterable of ChessVar Boards.
+    :return: (squares, to_move, game_states): (N, 64) int8 pieces as described at the top of
+    the file, (N,) int8 side to move (0 White, 1 Black) and (N,) int8 indexes into GAME_STATES.
+    """
+    boards = list(boards)
+    squares = np.zeros((len(boards), 64), dtype=np.int8)
+    to_move = np.zeros(len(boards), dtype=np.int8)
+    game_states = np.zeros(len(boards), dtype=np.int8)
+    for row, board in enumerate(boards):
+        for side, sign in ((0, 1), (1, -1)):
+            for piece_type, symbol in enumerate(PIECE_TYPES):
+                mask = board.get_bitboard(SIDES[side], symbol)
+                while mask:
+                    low = mask & -mask
+                    squares[row, low.bit_length() - 1] = sign * (piece_type + 1)
+                    mask ^= low
+        to_move[row] = SIDES.index(board.get_turn_state())
+        game_states[row] = GAME_STATES.index(board.get_game_state())
+    return squares, to_move, game_states
+
+
+def _slide(direction, origin, blockers):
+    """
+    Vectorized ray_attacks(): the squares reached from origin in one direction, up to and
+    including the first blocker, on every board.
+    :param origin: Square index, an int or an (N,) array.
+    :param blockers: (N,) uint64 masks.
+    """
+    ray = _RAYS[direction][origin]
+    hit = ray & blockers
+    if direction in _UP:  # First blocker is the lowest bit, cut everything above it.
+        first = hit & (~hit + _ONE)
+        return np.where(first == 0, ray, ray & ((first << _ONE) - _ONE))
+    smear = hit  # First blocker is the highest bit, cut everything below it.
+    for shift in (1, 2, 4, 8, 16, 32):
+        smear = smear | (smear >> np.uint64(shift))
+    first = smear ^ (smear >> _ONE)
+    return np.where(first == 0, ray, ray & ~(first - _ONE))
+
+
+def _popcount(masks):
+    """
+    Count the set bits of each uint64 in an array.
+    """
+    return np.unpackbits(masks.reshape(masks.shape + (1,)).view(np.uint8), axis=-1).sum(axis=-1)
+
+
+def analyze(squares, to_move, game_states=None):
+    """
+    Analyze a batch of positions in one vectorized pass.
+    :param squares: (N, 64) int8 array of pieces, see the top of the file and encode_boards().
+    :param to_move: (N,) array, 0 where White is to move, 1 where Black is.
+    :param game_states: Optional (N,) array of indexes into GAME_STATES, all UNFINISHED by default.
+    :return: Dictionary of arrays:
+        'moves': (N, 64) uint64, for each square the mask of squares the piece there may
+            legally move to, as Board.generate_legal_moves() would yield them.
+        'move_count': (N,) number of legal moves.
+        'attacks': (N, 2) uint64, every square White / Black attacks.
+        'king_attacked': (N, 2) bool, whether the White / Black King is open to capture.
+        'king_row': (N, 2) int8, the row (1 to 8) of the White / Black King.
+        'path_clear': (N, 2) bool, whether every square on the file ahead of the White / Black
+            King is empty and not attacked by the other side.
+    """
+    squares = np.asarray(squares, dtype=np.int8)
+    count = len(squares)
+    to_move = np.asarray(to_move, dtype=np.int8)
+    if game_states is None:
+        game_states = np.zeros(count, dtype=np.int8)
+    game_states = np.asarray(game_states, dtype=np.int8)
+
+    pieces = [[np.bitwise_or.reduce(np.where(squares == sign * (piece_type + 1), _BITS, np.uint64(0)), axis=1)
+               for piece_type in range(len(PIECE_TYPES))] for sign in (1, -1)]  # [side][piece type]
+    occupancy = [pieces[side][KING] | pieces[side][BISHOP] | pieces[side][ROOK] | pieces[side][KNIGHT]
+                 for side in (0, 1)]
+    occupied = occupancy[0] | occupancy[1]
+    kings = np.stack([_bit_index(pieces[side][KING]) for side in (0, 1)], axis=1)  # (N, 2) square indexes.
+
+    # Where each piece can go, whatever stands there (Board._reach_mask), and the attack maps.
+    reach = np.zeros((count, 64), dtype=np.uint64)
+    attacks = np.zeros((count, 2), dtype=np.uint64)
+    for index in range(64):
+        bishop = (_slide(NORTH_EAST, index, occupied) | _slide(NORTH_WEST, index, occupied) |
+                  _slide(SOUTH_EAST, index, occupied) | _slide(SOUTH_WEST, index, occupied))
+        rook = (_slide(NORTH, index, occupied) | _slide(EAST, index, occupied) |
+                _slide(WEST, index, occupied) | _slide(SOUTH, index, occupancy[0]))
+        kind = np.abs(squares[:, index])
+        reach[:, index] = np.select([kind == KING + 1, kind == BISHOP + 1, kind == ROOK + 1, kind == KNIGHT + 1],
+                                    [_KING_ATTACKS[index], bishop, rook, _KNIGHT_ATTACKS[index]], np.uint64(0))
+        attacks[:, 0] |= np.where(squares[:, index] > 0, reach[:, index], np.uint64(0))
+        attacks[:, 1] |= np.where(squares[:, index] < 0, reach[:, index], np.uint64(0))
+    king_attacked = np.stack([(attacks[:, 1] & pieces[0][KING]) != 0, (attacks[:, 0] & pieces[1][KING]) != 0],
+                             axis=1)
+
+    # The side to move and the other side, per board.
+    black = to_move == 1
+    mine = np.where(black, occupancy[1], occupancy[0])
+    enemy_king = np.where(black, kings[:, 0], kings[:, 1])
+    enemy_attacks = np.where(black, attacks[:, 0], attacks[:, 1])
+    own_king_safe = ~np.where(black, king_attacked[:, 1], king_attacked[:, 0])
+    may_move = (game_states == GAME_STATES.index('UNFINISHED')) | \
+        (black & (game_states == GAME_STATES.index('WHITE_WON')))
+    may_move &= ~np.where(black, king_attacked[:, 0], king_attacked[:, 1])  # Their King already open.
+
+    # Destinations from which each piece type would reach the enemy King (check_for_check).
+    checks = [_KING_ATTACKS[enemy_king],
+              _slide(NORTH_EAST, enemy_king, occupied) | _slide(NORTH_WEST, enemy_king, occupied) |
+              _slide(SOUTH_EAST, enemy_king, occupied) | _slide(SOUTH_WEST, enemy_king, occupied),
+              None,
+              _KNIGHT_ATTACKS[enemy_king]]
+    rook_row_checks = _slide(EAST, enemy_king, occupied) | _slide(WEST, enemy_king, occupied)
+    rook_checks = []  # By the file the Rook moves from, see the top of the file.
+    king_row = enemy_king & ~7
+    king_file = (enemy_king & 7).astype(np.int64)
+    for column in range(8):
+        shadow = king_row + column  # The King's row, on the Rook's own file.
+        lines = _slide(NORTH, shadow, occupancy[0]) | _slide(SOUTH, shadow, occupied)
+        shift = king_file - column
+        lines = np.where(shift >= 0, lines << np.abs(shift).astype(np.uint64),
+                         lines >> np.abs(shift).astype(np.uint64))
+        rook_checks.append(rook_row_checks | (lines & _FILES[king_file]))
+
+    moves = np.zeros((count, 64), dtype=np.uint64)
+    for index in range(64):
+        code = squares[:, index]
+        kind = np.abs(code)
+        ours = np.where(black, code < 0, code > 0) & may_move
+        targets = reach[:, index] & ~mine
+        legal = np.select([kind == KING + 1, kind == BISHOP + 1, kind == ROOK + 1, kind == KNIGHT + 1],
+                          [targets & ~checks[KING] & ~enemy_attacks,
+                           np.where(own_king_safe, targets & ~checks[BISHOP], np.uint64(0)),
+                           np.where(own_king_safe, targets & ~rook_checks[index & 7], np.uint64(0)),
+                           np.where(own_king_safe, targets & ~checks[KNIGHT], np.uint64(0))], np.uint64(0))
+        moves[:, index] = np.where(ours, legal, np.uint64(0))
+
+    rows = (kings >> 3).astype(np.int8)
+    path_clear = np.zeros((count, 2), dtype=bool)
+    for side in (0, 1):
+        ahead = _RAYS[NORTH][kings[:, side]]
+        path_clear[:, side] = (ahead & (occupied | attacks[:, side ^ 1])) == 0
+    return {
+        'moves': moves,
+        'move_count': _popcount(moves).sum(axis=1),
+        'attacks': attacks,
+        'king_attacked': king_attacked,
+        'king_row': rows + 1,
+        'path_clear': path_clear,
+    }
+
+
+def _bit_index(masks):
+    """
+    Index of the single set bit of each uint64 in an array, ie a King's square.
+    """
+    return (_popcount(masks - _ONE) & 63).astype(np.int64)
+
+
+def legal_moves(result, row):
+    """
+    List one board's legal moves from analyze()'s result.
+    :return: (origin, destination) square index pairs, like Board.generate_legal_moves().
+    """
+    found = []
+    for origin in np.flatnonzero(result['moves'][row]):
+        mask = int(result['moves'][row, origin])
+        while mask:
+            low = mask & -mask
+            found.append((int(origin), low.bit_length() - 1))
+            mask ^= low
+    return found
@@ -0,0 +1,206 @@
+# Description: Micro-benchmarks for ChessVariant.make_move(). Each scenario is one move tried in one saved
+# position, covering every piece type, legal moves, captures and illegal moves (both kinds: moves a piece
+# can't make and moves that break the check rule), from the crowded opening to sparse endgames. Every call
+# is timed on its own and the median and 99th percentile reported, along with the bytes allocated per call
+# as traced by tracemalloc. Runs can be appended to a JSON history file, and the latest run is compared
+# with the one before it, so a change to the rules code shows up as faster or slower per scenario.
+#
+# Like every Board's, the legality cache is off unless --cache is given, which times the cache hits that
+# trying one move over and over makes of every call after the first.
+#
+# Each illegal scenario names the MoveRejected reason it must be turned down for, and a listener checks
+# every call against it, so its times include building that event. Legal scenarios run with no listener.
+#
+# Usage: python ChessVarBench.py [--samples 2000] [--history bench_history.json] [--label "note"] [--cache]
+#        [--only rook]
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import time
+import tracemalloc
+
+from ChessVar import (ChessVariant, LegalityCache, MoveRejected, START_POSITION, ILLEGAL_MOVE, KING_IN_DANGER,
+                      NO_PIECE, OWN_PIECE)
+
+# (name, position, origin, destination, the MoveRejected reason make_move() turns it down for, None if legal)
+SCENARIOS = (
+    ('king-legal-crowded', '8/8/8/8/3N4/5n2/RBB2nbr/K1N3bk w -', 'a1', 'b1', None),
+    ('king-legal-sparse', '8/8/8/5B2/3n4/3K4/5k2/6b1 w -', 'd3', 'd2', None),
+    ('king-capture', '8/3B4/1b6/7b/2K5/1N1r4/7n/2N4k w -', 'c4', 'd3', None),
+    ('king-illegal', '2B5/8/1b6/7b/2K5/7r/8/N1N2n1k w -', 'c4', 'e5', ILLEGAL_MOVE),
+    ('king-into-danger', '8/7r/2K3BN/8/8/6b1/8/2N4k w -', 'c6', 'd6', KING_IN_DANGER),
+    ('bishop-legal-crowded', START_POSITION, 'b2', 'h8', None),
+    ('bishop-legal-sparse', '8/8/8/5B2/3n4/3K4/5k2/6b1 w -', 'f5', 'h3', None),
+    ('bishop-capture', '8/b7/4r1B1/8/3B4/3Nn3/K2nN1b1/7k b -', 'a7', 'd4', None),
+    ('bishop-illegal', '8/8/3r1B2/8/6n1/5n2/3RN1bk/K1NB2b1 w -', 'd1', 'f4', ILLEGAL_MOVE),
+    ('bishop-king-danger', '1B6/7r/8/8/4b1n1/N2N4/R2n4/KB4bk b -', 'g1', 'd4', KING_IN_DANGER),
+    ('rook-legal-crowded', START_POSITION, 'a2', 'a8', None),
+    ('rook-legal-sparse', 'r7/7n/8/8/1B6/1K6/8/7k b -', 'a8', 'a1', None),
+    ('rook-capture', '8/8/3r4/8/8/2B2n2/3RNnb1/K1NB2bk b -', 'd6', 'd2', None),
+    ('rook-illegal', '8/8/3r1B2/8/6n1/5n2/3RN1bk/K1NB2b1 w -', 'd2', 'a5', ILLEGAL_MOVE),
+    ('rook-king-danger', '3B4/8/3b4/6R1/7k/3b4/8/KBNn4 w -', 'g5', 'g4', KING_IN_DANGER),
+    ('knight-legal-crowded', START_POSITION, 'c2', 'd4', None),
+    ('knight-legal-sparse', '8/8/8/8/3nB3/3K4/5k2/6b1 b -', 'd4', 'c2', None),
+    ('knight-capture', '8/8/8/8/3N4/5n2/RBB2nbr/K1N3bk w -', 'd4', 'f3', None),
+    ('knight-illegal', '8/3B4/1b6/7b/2K5/7r/7n/N1N4k w -', 'a1', 'h2', ILLEGAL_MOVE),
+    ('knight-king-danger', '8/8/4B3/2b5/1N1k4/2r2b2/1K6/5n2 w -', 'b4', 'c2', KING_IN_DANGER),
+    ('own-piece', START_POSITION, 'a1', 'a2', OWN_PIECE),
+    ('no-piece', START_POSITION, 'd4', 'd5', NO_PIECE),
+)
+
+
+def percentile(values, fraction):
+    """
+    Pick the value below which the given fraction of values lie, from a sorted list.
+    """
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+def run_scenario(position, origin, destination, reason, samples=2000, warmup=200, cache=False):
+    """
+    Time one move, trying it again and again in the same position. A move that is made
+    is taken back with undo_move() between calls, outside the timing.
+    :param reason: The MoveRejected reason make_move() should turn the move down for, or
+    None if it should make it. A scenario that no longer does what it says is an error,
+    not a benchmark. For an illegal move a listener is subscribed before any call, so
+    that every call, timed ones included, is checked and builds its MoveRejected event.
+    :param cache: Turn the Board's legality cache on.
+    :return: Dictionary of 'median_us', 'p99_us', 'min_us', 'mean_us' and 'alloc_bytes',
+    the median bytes allocated by one call, including any freed before it returned.
+    :raises ValueError: If make_move() doesn't make or turn down the move as expected.
+    """
+    game = ChessVariant(position)
+    if cache:
+        game.get_board_object().set_legality_cache(LegalityCache())
+    make_move = game.make_move
+    undo_move = game.undo_move
+    clock = time.perf_counter_ns
+    reasons = {}  # reason -> how many calls were turned down for it
+
+    def count_rejection(event):
+        if isinstance(event, MoveRejected):
+            reasons[event.reason] = reasons.get(event.reason, 0) + 1
+
+    if reason is not None:
+        game.add_listener(count_rejection)
+    if make_move(origin, destination) != (reason is None):
+        raise ValueError(f'{origin}{destination} in {position} is no longer {"illegal" if reason else "legal"}')
+    if reason is None:
+        undo_move()
+    for _ in range(warmup):
+        if make_move(origin, destination):
+            undo_move()
+
+    times = []
+    for _ in range(samples):
+        start = clock()
+        made = make_move(origin, destination)
+        times.append(clock() - start)
+        if made:
+            undo_move()
+
+    allocations = []
+    tracemalloc.start()
+    for _ in range(min(samples, 200)):
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        made = make_move(origin, destination)
+        allocations.append(tracemalloc.get_traced_memory()[1] - before)
+        if made:
+            undo_move()
+    tracemalloc.stop()
+    if reason is not None and set(reasons) != {reason}:
+        raise ValueError(f'{origin}{destination} in {position} was turned down for {sorted(reasons)}, not {reason}')
+
+    times.sort()
+    allocations.sort()
+    return {
+        'median_us': percentile(times, 0.50) / 1000,
+        'p99_us': percentile(times, 0.99) / 1000,
+        'min_us': times[0] / 1000,
+        'mean_us': sum(times) / len(times) / 1000,
+        'alloc_bytes': percentile(allocations, 0.50),
+    }
+
+
+def run_suite(samples=2000, cache=False, only=None):
+    """
+    Run every scenario.
+    :param only: Optionally run just the scenarios whose names contain this text.
+    :return: Dictionary of scenario name -> run_scenario() result.
+    """
+    results = {}
+    for name, position, origin, destination, reason in SCENARIOS:
+        if only and only not in name:
+            continue
+        results[name] = run_scenario(position, origin, destination, reason, samples, cache=cache)
+    return results
+
+
+def load_history(path):
+    """
+    Read the runs saved in a history file, oldest first. A missing file has no runs.
+    """
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding='utf-8') as history:
+        return json.load(history)
+
+
+def save_run(path, run):
+    """
+    Append one run to a history file.
+    """
+    runs = load_history(path)
+    runs.append(run)
+    with open(path, 'w', encoding='utf-8') as history:
+        json.dump(runs, history, indent=1)
+
+
+def format_results(results, previous=None):
+    """
+    Lay results out as a table, with the change in median against an earlier run's
+    results where it has the same scenario.
+    """
+    lines = [f'{"scenario":<22} {"median us":>10} {"p99 us":>9} {"alloc B":>8} {"vs last":>8}']
+    for name, stats in results.items():
+        change = ''
+        if previous and name in previous and previous[name]['median_us']:
+            change = f'{stats["median_us"] / previous[name]["median_us"] - 1:+.1%}'
+        lines.append(f'{name:<22} {stats["median_us"]:>10.2f} {stats["p99_us"]:>9.2f} {stats["alloc_bytes"]:>8} '
+                     f'{change:>8}')
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark ChessVariant.make_move() over a fixed set of moves.')
+    parser.add_argument('--samples', type=int, default=2000, help='timed calls per scenario (default 2000)')
+    parser.add_argument('--history', default=None, help='JSON file to append this run to and compare against')
+    parser.add_argument('--label', default='', help='note saved with the run, ie what changed')
+    parser.add_argument('--cache', action='store_true', help='turn the legality cache on')
+    parser.add_argument('--only', default=None, help='run only scenarios whose name contains this')
+    args = parser.parse_args()
+
+    results = run_suite(args.samples, args.cache, args.only)
+    previous = None
+    if args.history:
+        matching = [run for run in load_history(args.history) if run['cache'] == args.cache]
+        previous = matching[-1]['results'] if matching else None
+    print(format_results(results, previous))
+    if args.history:
+        save_run(args.history, {
+            'time': datetime.datetime.now().isoformat(timespec='seconds'),
+            'label': args.label,
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'samples': args.samples,
+            'cache': args.cache,
+            'results': results,
+        })
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,432 @@
+# Description: A computer player for ChessVar. Engine searches the game tree with negamax alpha-beta,
+# iterative deepening and a quiescence search over captures, and always answers inside its time budget.
+# The transposition table remembers what the search found out about a position, keyed by the Board's
+# Zobrist hash, so that a position reached again by a different order of moves isn't searched twice.
+# Run this file to watch the engine play a game against itself.
+
+import time
+
+from ChessVar import ChessVariant, SIDES, PIECE_TYPES, BISHOP, ROOK, KNIGHT, KING_ATTACKS, square_name
+
+# Bound types stored with a score.
+EXACT = 0  # The score is the position's true value to the stored depth.
+LOWER_BOUND = 1  # The search failed high, the position is worth at least the score.
+UPPER_BOUND = 2  # The search failed low, the position is worth at most the score.
+
+_ENTRY_BYTES = 128  # Rough cost of one stored entry (tuple, ints & move) in CPython.
+
+
+class TranspositionTable:
+    """
+    Fixed-size table of search results keyed by Board.get_zobrist_hash(). The number of
+    slots is worked out once from a memory budget and never grows. Each slot holds one
+    entry: (hash, depth, score, bound, best_move, generation). When two positions land in
+    the same slot, the new result replaces the old one if the old one is from an earlier
+    search or was searched no deeper, so deep results from the current search survive.
+    """
+
+    def __init__(self, size_mb=16):
+        """
+        :param size_mb: Memory budget for the table, in megabytes.
+        """
+        slots = 1
+        while slots * 2 * _ENTRY_BYTES <= size_mb * 1024 * 1024:
+            slots *= 2
+        self._mask = slots - 1
+        self._slots = [None] * slots
+        self._generation = 0
+        self._hits = 0
+        self._misses = 0
+        self._stores = 0
+
+    def new_search(self):
+        """
+        Mark the start of a new search, so entries left over from earlier searches are
+        replaced first.
+        """
+        self._generation = (self._generation + 1) & 0xFF
+
+    def clear(self):
+        """
+        Empty every slot and reset the counters.
+        """
+        self._slots = [None] * len(self._slots)
+        self._generation = 0
+        self._hits = 0
+        self._misses = 0
+        self._stores = 0
+
+    def probe(self, zobrist_hash):
+        """
+        Look up a position.
+        :param zobrist_hash: The position's Board.get_zobrist_hash().
+        :return: (depth, score, bound, best_move) or None if the position isn't stored.
+        """
+        entry = self._slots[zobrist_hash & self._mask]
+        if entry is not None and entry[0] == zobrist_hash:
+            self._hits += 1
+            return entry[1], entry[2], entry[3], entry[4]
+        self._misses += 1
+        return None
+
+    def store(self, zobrist_hash, depth, score, bound, best_move):
+        """
+        Save a search result, following the replacement policy described on the class.
+        :param zobrist_hash: The position's Board.get_zobrist_hash().
+        :param depth: How many plies deep the position was searched.
+        :param score: The score found, from the point of view of the side to move.
+        :param bound: EXACT, LOWER_BOUND or UPPER_BOUND.
+        :param best_move: The best (origin, destination) move found, or None.
+        """
+        index = zobrist_hash & self._mask
+        entry = self._slots[index]
+        if entry is not None and entry[0] != zobrist_hash and entry[5] == self._generation and entry[1] > depth:
+            return
+        if entry is not None and entry[0] == zobrist_hash and best_move is None:
+            best_move = entry[4]  # Keep the move we already knew about.
+        self._slots[index] = (zobrist_hash, depth, score, bound, best_move, self._generation)
+        self._stores += 1
+
+    def get_size(self):
+        """
+        Retrieve the number of slots in the table.
+        """
+        return len(self._slots)
+
+    def get_stats(self):
+        """
+        Retrieve the table's counters.
+        :return: A dictionary with the number of slots, how many are filled, and the probe
+        hits, probe misses and stores made since the table was created or cleared.
+        """
+        return {
+            'slots': len(self._slots),
+            'filled': len(self._slots) - self._slots.count(None),
+            'hits': self._hits,
+            'misses': self._misses,
+            'stores': self._stores,
+        }
+
+    def __repr__(self):
+        """
+        Allows the debugger to show the table's size and counters rather than every slot.
+        """
+        return "{}({!r})".format(self.__class__.__name__, self.get_stats())
+
+
+WIN = 100000  # Score of a won game, less one for every ply it takes to get there.
+_WON_SCORES = WIN - 1000  # Anything past this is a won or lost game rather than an evaluation.
+PIECE_VALUES = (0, 300, 500, 300)  # Indexed like ChessVar.PIECE_TYPES, the King can't be captured.
+KING_ROW_BONUS = (0, 20, 45, 75, 115, 170, 250, 360)  # How far up the board the King is, row 1 to 7.
+_TIME_CHECK_NODES = 63  # Look at the clock every 64 nodes.
+_TIME_MARGIN = 0.9  # Share of the budget the search may use, the rest covers making the move.
+
+
+class _OutOfTime(Exception):
+    """
+    Raised inside the search when the time budget runs out, to unwind back to search().
+    """
+
+
+def evaluate(board):
+    """
+    Score a position for the side whose turn it is. The race is what matters most, so
+    the score is led by how far up the board each King has got, less a penalty for every
+    square in the row ahead of it the opponent covers, plus material and mobility.
+    :param board: A ChessVar Board.
+    :return: An int, positive when the side to move is ahead.
+    """
+    score = 0
+    for side, sign in ((0, 1), (1, -1)):
+        name = SIDES[side]
+        for piece_type in (BISHOP, ROOK, KNIGHT):
+            score += sign * PIECE_VALUES[piece_type] * board.get_bitboard(name, PIECE_TYPES[piece_type]).bit_count()
+        king = board.get_bitboard(name, 'K').bit_length() - 1
+        row = king >> 3
+        score += sign * KING_ROW_BONUS[row]
+        if row < 7:
+            ahead = KING_ATTACKS[king] & (0xFF << ((row + 1) * 8))
+            score -= sign * 25 * (ahead & board.get_attacked_squares(SIDES[side ^ 1])).bit_count()
+        score += sign * 2 * board.get_attacked_squares(name).bit_count()
+    if board.get_turn_state() == 'BLACK':
+        return -score
+    return score
+
+
+class Engine:
+    """
+    Computer player. Picks a move for whichever side is to move on a Board by searching
+    with push() and pop(), so the board is left exactly as it was found. Knows its time
+    budget per move and keeps a TranspositionTable between moves.
+    """
+
+    def __init__(self, time_limit=0.1, max_depth=32, table_mb=16):
+        """
+        :param time_limit: Wall-clock budget per move, in seconds.
+        :param max_depth: Deepest iteration to search, in plies.
+        :param table_mb: Memory budget for the transposition table, in megabytes.
+        """
+        self._time_limit = time_limit
+        self._max_depth = max_depth
+        self._table = TranspositionTable(table_mb)
+        self._deadline = 0.0
+        self._nodes = 0
+        self._last_depth = 0
+
+    def get_table(self):
+        """
+        Retrieve the engine's transposition table.
+        """
+        return self._table
+
+    def get_last_search(self):
+        """
+        Retrieve the node count and completed depth of the last search.
+        :return: (nodes, depth)
+        """
+        return self._nodes, self._last_depth
+
+    def play_move(self, game):
+        """
+        Choose a move for the player whose turn it is and make it through
+        ChessVariant.make_move_fast().
+        :param game: A ChessVariant.
+        :return: The move made as ('letter + num', 'letter + num'), or None if there is
+        no legal move.
+        """
+        move, _, _ = self.search(game.get_board_object())
+        if move is None:
+            return None
+        game.make_move_fast(move)
+        return square_name(move[0]), square_name(move[1])
+
+    def search(self, board, time_limit=None):
+        """
+        Search the position with iterative deepening until the time budget runs out, a
+        won or lost game is found, or max_depth is reached.
+        :param board: A ChessVar Board, left unchanged.
+        :param time_limit: Overrides the engine's budget for this move, in seconds.
+        :return: (best_move, score, depth) where best_move is an (origin, destination)
+        square index pair, or None if there is no legal move, and depth is the deepest
+        iteration that finished.
+        """
+        start = time.perf_counter()
+        budget = self._time_limit if time_limit is None else time_limit
+        self._deadline = start + budget * _TIME_MARGIN
+        self._nodes = 0
+        self._last_depth = 0
+        self._table.new_search()
+
+        moves = list(board.generate_legal_moves())
+        if not moves:
+            return None, 0, 0
+        best_move = moves[0]
+        best_score = 0
+        for depth in range(1, self._max_depth + 1):
+            try:
+                score, move = self._search_root(board, moves, depth)
+            except _OutOfTime:
+                break
+            best_move, best_score, self._last_depth = move, score, depth
+            moves.remove(move)
+            moves.insert(0, move)  # Search the best move first next time.
+            if abs(score) >= _WON_SCORES or len(moves) == 1:
+                break
+            if time.perf_counter() - start > budget / 2:  # The next iteration won't finish in time.
+                break
+        return best_move, best_score, self._last_depth
+
+    def _search_root(self, board, moves, depth):
+        """
+        Search every root move to the given depth.
+        :return: (score, best_move)
+        """
+        alpha = -WIN - 1
+        best_move = moves[0]
+        for move in moves:
+            board.push(move)
+            try:
+                score = -self._negamax(board, depth - 1, -WIN - 1, -alpha, 1)
+            finally:
+                board.pop()
+            if score > alpha:
+                alpha = score
+                best_move = move
+        self._table.store(board.get_zobrist_hash(), depth, alpha, EXACT, best_move)
+        return alpha, best_move
+
+    def _tick(self):
+        """
+        Count a node, and stop the search once the deadline has passed.
+        """
+        self._nodes += 1
+        if not self._nodes & _TIME_CHECK_NODES and time.perf_counter() > self._deadline:
+            raise _OutOfTime
+
+    def _negamax(self, board, depth, alpha, beta, ply):
+        """
+        Alpha-beta search in negamax form.
+        :return: The score for the side to move.
+        """
+        self._tick()
+        over = self._game_over_score(board, ply)
+        if over is not None:
+            return over
+        if depth <= 0:
+            return self._quiesce(board, alpha, beta, ply)
+
+        zobrist_hash = board.get_zobrist_hash()
+        table_move = None
+        entry = self._table.probe(zobrist_hash)
+        if entry is not None:
+            entry_depth, score, bound, table_move = entry
+            if entry_depth >= depth:
+                score = _score_from_table(score, ply)
+                if bound == EXACT:
+                    return score
+                if bound == LOWER_BOUND and score >= beta:
+                    return score
+                if bound == UPPER_BOUND and score <= alpha:
+                    return score
+
+        moves = self._order_moves(board, list(board.generate_legal_moves()), table_move)
+        if not moves:
+            return 0  # Stuck, neither side can make progress.
+        alpha_start = alpha
+        best_score = -WIN - 1
+        best_move = None
+        for move in moves:
+            board.push(move)
+            try:
+                score = -self._negamax(board, depth - 1, -beta, -alpha, ply + 1)
+            finally:
+                board.pop()
+            if score > best_score:
+                best_score = score
+                best_move = move
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        break
+        if best_score <= alpha_start:
+            bound = UPPER_BOUND
+        elif best_score >= beta:
+            bound = LOWER_BOUND
+        else:
+            bound = EXACT
+        self._table.store(zobrist_hash, depth, _score_to_table(best_score, ply), bound, best_move)
+        return best_score
+
+    def _quiesce(self, board, alpha, beta, ply):
+        """
+        Keep searching captures past the nominal depth so the evaluation isn't taken in
+        the middle of an exchange.
+        :return: The score for the side to move.
+        """
+        stand_pat = evaluate(board)
+        if stand_pat >= beta:
+            return stand_pat
+        if stand_pat > alpha:
+            alpha = stand_pat
+        for move in self._order_moves(board, list(board.generate_legal_moves(captures_only=True)), None):
+            self._tick()
+            board.push(move)
+            try:
+                over = self._game_over_score(board, ply + 1)
+                score = -over if over is not None else -self._quiesce(board, -beta, -alpha, ply + 1)
+            finally:
+                board.pop()
+            if score >= beta:
+                return score
+            if score > alpha:
+                alpha = score
+        return alpha
+
+    def _game_over_score(self, board, ply):
+        """
+        Score a finished game for the side to move, the sooner the win the higher.
+        Black's last turn after White has won is settled here too, since Black only ties
+        by getting its King to row 8 on that move.
+        :return: The score, or None if the game is still going.
+        """
+        state = board.get_game_state()
+        if state == 'UNFINISHED':
+            return None
+        if state == 'TIE':
+            return 0
+        if state == 'WHITE_WON' and board.get_turn_state() == 'BLACK':
+            king = board.get_bitboard('BLACK', 'K')
+            for origin, destination in board.generate_legal_moves():
+                if destination >= 56 and king >> origin & 1:
+                    return 0
+            return -(WIN - ply)
+        winner = 'BLACK' if state == 'BLACK_WON' else 'WHITE'
+        if winner == board.get_turn_state():
+            return WIN - ply
+        return -(WIN - ply)
+
+    def _order_moves(self, board, moves, table_move):
+        """
+        Sort moves so the likely best are searched first: the table's move, then captures
+        of the most valuable pieces, then King moves up the board.
+        """
+        opponent = 'BLACK' if board.get_turn_state() == 'WHITE' else 'WHITE'
+        victims = [board.get_bitboard(opponent, symbol) for symbol in PIECE_TYPES]
+        king = board.get_bitboard(board.get_turn_state(), 'K')
+
+        def priority(move):
+            origin, destination = move
+            if move == table_move:
+                return -100000
+            for piece_type in (ROOK, BISHOP, KNIGHT):
+                if victims[piece_type] >> destination & 1:
+                    return -10 * PIECE_VALUES[piece_type]
+            if king >> origin & 1 and destination >> 3 > origin >> 3:
+                return -100 - (destination >> 3)
+            return 0
+
+        moves.sort(key=priority)
+        return moves
+
+    def __repr__(self):
+        """
+        Allows the debugger to show an object's attributes rather than its
+        address in memory.
+        """
+        return "{}({!r})".format(self.__class__.__name__, self.__dict__)
+
+
+def _score_to_table(score, ply):
+    """
+    Store won and lost scores as distance from the stored position rather than the root.
+    """
+    if score >= _WON_SCORES:
+        return score + ply
+    if score <= -_WON_SCORES:
+        return score - ply
+    return score
+
+
+def _score_from_table(score, ply):
+    """
+    Undo _score_to_table() for a position found ply moves from the root.
+    """
+    if score >= _WON_SCORES:
+        return score - ply
+    if score <= -_WON_SCORES:
+        return score + ply
+    return score
+
+
+if __name__ == '__main__':
+    game = ChessVariant()
+    engine = Engine()
+    while game.get_game_state() == 'UNFINISHED' or \
+            (game.get_game_state() == 'WHITE_WON' and game.get_turn_state() == 'BLACK'):
+        turn = game.get_turn_state()
+        played = engine.play_move(game)
+        if played is None:
+            break
+        nodes, depth = engine.get_last_search()
+        print(f'{turn}: {played[0]} -> {played[1]}  (depth {depth}, {nodes} nodes)')
+    print(game.get_game_state())
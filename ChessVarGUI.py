@@ -3,8 +3,69 @@ if getattr(sys, 'frozen', False) and hasattr(sys, '_MEIPASS'):
 
 import arcade
 from arcade import Sprite
+from PIL import Image, ImageDraw
 import ChessVar
+import ChessVarEngine
 import logging
+import time
+
+SQUARE_SIDE = 90  # Pixels per square, an 8x8 board fills the 720x720 window.
+PIECE_SCALE = .08  # The piece images are drawn at this fraction of their size.
+PIECE_IMAGES = (  # [side][piece type], see ChessVar.SIDES & ChessVar.PIECE_TYPES
+    ('white_king.png', 'white_bish.png', 'white_r.png', 'white_kn.png'),
+    ('black_king.png', 'black_bi.png', 'black_r.png', 'black_kn.png'),
+)
+_piece_textures = {}  # Image file -> Texture, decoded once per process, see piece_texture().
+_piece_atlas = None  # One TextureAtlas holding every piece image, see piece_atlas().
+
+
+def pixel_to_square(x, y):
+    """
+    Find the square under a point in the window, by arithmetic rather than hit-testing.
+    :return: The square index (a1 = 0 ... h8 = 63), None if the point is off the board.
+    """
+    column = int(x // SQUARE_SIDE)
+    row = int(y // SQUARE_SIDE)
+    if 0 <= column < 8 and 0 <= row < 8:
+        return row * 8 + column
+    return None
+
+
+def piece_texture(file_name):
+    """
+    Retrieve the texture of a piece image, decoding the file only the first time. The
+    image is shrunk to the size it is drawn at, so the GPU holds small textures rather
+    than 1024x1024 ones.
+    :param file_name: An image in chess_sprites_images/, ie 'black_bi.png'.
+    """
+    texture = _piece_textures.get(file_name)
+    if texture is None:
+        image = Image.open(f'chess_sprites_images/{file_name}').convert('RGBA')
+        image = image.resize((round(image.width * PIECE_SCALE), round(image.height * PIECE_SCALE)), Image.LANCZOS)
+        texture = arcade.Texture(file_name, image)
+        _piece_textures[file_name] = texture
+    return texture
+
+
+def piece_atlas():
+    """
+    Retrieve the texture atlas that both sides' sprite lists share, packing every piece
+    image into it the first time. Needs the window to be open.
+    """
+    global _piece_atlas
+    if _piece_atlas is None:
+        _piece_atlas = arcade.TextureAtlas((256, 256))
+        for file_name in PIECE_IMAGES[0] + PIECE_IMAGES[1]:
+            _piece_atlas.add(piece_texture(file_name))
+    return _piece_atlas
+
+
+def square_to_pixel(index):
+    """
+    Find the center of a square in the window.
+    :return: (x, y) in pixels.
+    """
+    return SQUARE_SIDE // 2 + SQUARE_SIDE * (index & 7), SQUARE_SIDE // 2 + SQUARE_SIDE * (index >> 3)
 
 
 class StartChessView(arcade.View):
@@ -21,242 +82,198 @@ class StartChessView(arcade.View):
         # Initializing ChessVar
         self._game = ChessVar.ChessVariant()
 
-        # Initialize chessboard background.
-        self._shape_list = None
-
-        # Initializing Black sprites
-        self._black_k_sprite = None
-        self._black_bi1_sprite = None
-        self._black_bi2_sprite = None
-        self._black_r_sprite = None
-        self._black_kn1_sprite = None
-        self._black_kn2_sprite = None
-
-        # Initializing White sprites
-        self._white_k_sprite = None
-        self._white_bi1_sprite = None
-        self._white_bi2_sprite = None
-        self._white_r_sprite = None
-        self._white_kn1_sprite = None
-        self._white_kn2_sprite = None
+        # Initialize chessboard background, baked into one texture by blank_board().
+        self._board_texture = None
 
         # Create sprite lists here for the black & white pieces.
         self._black_sprites = None
         self._white_sprites = None
-
-        # Initialize tile sprites
-        self._tiles = None
-        self._square = None
+        self._piece_sprites = []  # (Piece, its Sprite, the SpriteList it belongs in), made once.
 
         # Initialize movement data members
         self._moving_piece = None
         self._moving_piece_og_pos = None
+        self._moving_piece_og_square = None
+
+        # The sprite standing on each square (a1 = 0 ... h8 = 63), kept in step with the board.
+        self._sprite_at = [None] * 64
 
         # Text to be written
         self._turn_mssg = None
         self._illegal_mssg = None
         self._game_over_mssg = None
 
+        # Text objects for the messages, laid out again only when a message changes.
+        self._turn_text = None
+        self._illegal_text = None
+        self._game_over_text = None
+        self._restart_text = None
+
+        # Frame timing overlay, F turns it on and off.
+        self._show_timings = False
+        self._timings_text = None
+        self._last_frame = None
+        self._frame_seconds = 0.0  # Smoothed time between frames.
+        self._draw_seconds = 0.0  # Smoothed time on_draw takes.
+        self._timings_shown_at = 0.0
+
+        # Computer player, plays 'WHITE', 'BLACK' or nobody (None)
+        self._engine = ChessVarEngine.Engine()
+        self._engine_side = None
+
     def setup(self):
         """
         Use to set up the beginning of the game. Can be used to start the game
         over again once play has finished, etc..
         """
-        self._shape_list = arcade.ShapeElementList()
-        self.blank_board()
-
-        # Fill the black sprites list with Sprite objects starting at their start positions
-        self._black_sprites = []
-        self.initialize_black_sprites()
-        self._black_sprites = arcade.SpriteList()
-        self.populate_black_sprites()
+        self._game.add_listener(self.on_game_event)
+        if self._board_texture is None:  # The board never changes, bake it once.
+            self.blank_board()
+        if self._turn_text is None:
+            self.create_text()
 
-        # Fill the white sprites list with Sprite objects starting at their start positions
-        self._white_sprites = []
-        self.initialize_white_sprites()
-        self._white_sprites = arcade.SpriteList()
-        self.populate_white_sprites()
+        # Fill the sprite lists with Sprite objects the first time, put them back after.
+        if not self._piece_sprites:
+            self._black_sprites = arcade.SpriteList(atlas=piece_atlas())
+            self.populate_black_sprites()
+            self._white_sprites = arcade.SpriteList(atlas=piece_atlas())
+            self.populate_white_sprites()
+        self.place_sprites()
 
         # Set up piece movement
         self._moving_piece = None
         self._moving_piece_og_pos = None
-
-        # Fill the tiles sprite list with sprites
-        self._tiles = None
-        self._square = None
-        self._tiles = arcade.SpriteList()
-        self.populate_tile_sprites()
+        self._moving_piece_og_square = None
 
         # Text to be displayed
         self._turn_mssg = None
         self._illegal_mssg = None
         self._game_over_mssg = None
 
-    def initialize_black_sprites(self):
+    def blank_board(self):
         """
-        Re-Initialize all black sprite data members.
+        Bake a blank 8x8 chessboard into one texture, so each frame draws the board
+        in a single call.
+        Tile sides = 90
         """
-        # Initializing Black sprites
-        self._black_k_sprite = None
-        self._black_bi1_sprite = None
-        self._black_bi2_sprite = None
-        self._black_r_sprite = None
-        self._black_kn1_sprite = None
-        self._black_kn2_sprite = None
+        image = Image.new('RGB', (8 * SQUARE_SIDE, 8 * SQUARE_SIDE))
+        draw = ImageDraw.Draw(image)
+        for index in range(64):
+            left, bottom = (index & 7) * SQUARE_SIDE, (index >> 3) * SQUARE_SIDE
+            top = 8 * SQUARE_SIDE - bottom - SQUARE_SIDE  # Images count rows down from the top.
+            color = arcade.color.BEIGE if ((index & 7) + (index >> 3)) % 2 == 0 else arcade.color.OUTER_SPACE
+            draw.rectangle((left, top, left + SQUARE_SIDE - 1, top + SQUARE_SIDE - 1), fill=color[:3])
+        self._board_texture = arcade.Texture('chess_board', image)
+        return self._board_texture
 
-    def initialize_white_sprites(self):
+    def create_text(self):
         """
-        Re-Initialize all white sprite data members.
+        Create the Text objects the messages are shown with. Their words are filled in
+        when there is something to say, see show_text().
         """
-        self._white_k_sprite = None
-        self._white_bi1_sprite = None
-        self._white_bi2_sprite = None
-        self._white_r_sprite = None
-        self._white_kn1_sprite = None
-        self._white_kn2_sprite = None
+        self._game_over_text = arcade.Text('', 360, 370, arcade.color.RED_DEVIL, 80, 20, 'center', 'garamond', True)
+        self._restart_text = arcade.Text('Press R to restart.', 90, 410, arcade.color.RED_DEVIL, 20, 5, 'left',
+                                         'garamond', True)
+        self._illegal_text = arcade.Text('', 550, 410, arcade.color.RED_DEVIL, 20, 5, 'center', 'garamond', True)
+        self._turn_text = arcade.Text('', 550, 420, arcade.color.RED_DEVIL, 20, 5, 'center', 'garamond', True)
+        self._timings_text = arcade.Text('', 10, 700, arcade.color.YELLOW, 12, anchor_y='top')
 
-    def blank_board(self):
+    @staticmethod
+    def show_text(text, message):
         """
-        Display a blank 8x8 chessboard.
-        Tile sides = 90
+        Give a Text object a message, laying it out again only if the message changed.
+        :return: The Text object, to draw.
         """
-        # Blank chess board displayer.
-        alternator = True
-        count = 0
-        win_y_pos = 45  # 45 indicates the center of the square.
-        win_x_pos = 45  # So, even though a side is 90px, a square is defined from the center.
-        square_side = 90  # The right size to fit an 8x8 board in a 720x720 window.
-        while count != 8:
-            for rep in range(9):
-                if alternator is True:  # Beigish
-                    shape = arcade.create_rectangle_filled(win_x_pos, win_y_pos, square_side,
-                                                           square_side, arcade.color.BEIGE)  # OG is BEIGE
-                    win_y_pos += square_side
-                    alternator = False
-                    self._shape_list.append(shape)
-                else:  # Greyish
-                    shape = arcade.create_rectangle_filled(win_x_pos, win_y_pos, square_side,
-                                                           square_side, arcade.color.OUTER_SPACE)  # OG is Outer Space
-                    win_y_pos += square_side
-                    alternator = True
-                    self._shape_list.append(shape)
-            win_y_pos = (square_side / 2)
-            win_x_pos += square_side
-            count += 1
-        return self._shape_list
-
-    def populate_tile_sprites(self):
-        """
-        Fill self._tiles sprite list with sprites. Creates
-        a grid of tiles formatted specifically for a 720x720
-        board with 8x8 squares, side length 90.
-        """
-        win_y_pos = 675  # Start at top left
-        win_x_pos = 45  # Start at far left
-        for row in self._game.get_board():
-            for tup in row:
-                self._square = arcade.Sprite()
-                self._square.center_x = win_x_pos
-                self._square.center_y = win_y_pos
-                self._tiles.append(self._square)
-                if win_x_pos == 675:
-                    win_x_pos = 45
-                    win_y_pos -= 90
-                else:
-                    win_x_pos += 90
+        if text.text != message:
+            text.text = message
+        return text
 
     def populate_black_sprites(self):
         """
-        Create all the black sprites using the dictionaries in
-        ChessVar.py
+        Create all the black sprites using the roster in ChessVar.py
         :return: Fills self._black_sprites with Sprite objects
         """
-        for elem in self._game.get_roster('BLACK'):
-            if elem.get_symbol() == 'BLACK K':
-                self._black_k_sprite = arcade.Sprite('chess_sprites_images/black_king.png', .08)
-                self._black_k_sprite.center_x = 675
-                self._black_k_sprite.center_y = 45
-                self._black_sprites.append(self._black_k_sprite)
-            if elem.get_symbol() == 'BLACK Bi' and self._black_bi1_sprite is None:
-                self._black_bi1_sprite = arcade.Sprite('chess_sprites_images/black_bi.png', .08)
-                self._black_bi1_sprite.center_x = 585
-                self._black_bi1_sprite.center_y = 45
-                self._black_sprites.append(self._black_bi1_sprite)
-            if elem.get_symbol() == 'BLACK Bi' and self._black_bi2_sprite is None:
-                self._black_bi2_sprite = arcade.Sprite('chess_sprites_images/black_bi.png', .08)
-                self._black_bi2_sprite.center_x = 585
-                self._black_bi2_sprite.center_y = 135
-                self._black_sprites.append(self._black_bi2_sprite)
-            if elem.get_symbol() == 'BLACK R':
-                self._black_r_sprite = arcade.Sprite('chess_sprites_images/black_r.png', .08)
-                self._black_r_sprite.center_x = 675
-                self._black_r_sprite.center_y = 135
-                self._black_sprites.append(self._black_r_sprite)
-            if elem.get_symbol() == 'BLACK Kn' and self._black_kn1_sprite is None:
-                self._black_kn1_sprite = arcade.Sprite('chess_sprites_images/black_kn.png', .08)
-                self._black_kn1_sprite.center_x = 495
-                self._black_kn1_sprite.center_y = 45
-                self._black_sprites.append(self._black_kn1_sprite)
-            if elem.get_symbol() == 'BLACK Kn' and self._black_kn2_sprite is None:
-                self._black_kn2_sprite = arcade.Sprite('chess_sprites_images/black_kn.png', .08)
-                self._black_kn2_sprite.center_x = 495
-                self._black_kn2_sprite.center_y = 135
-                self._black_sprites.append(self._black_kn2_sprite)
+        for piece in self._game.get_roster('BLACK'):
+            self.create_piece_sprite(piece, self._black_sprites)
 
     def populate_white_sprites(self):
         """
-        Create all the white sprites using the dictionaries in
-        ChessVar.py
+        Create all the white sprites using the roster in ChessVar.py
         :return: Fills self._white_sprites with Sprite objects
         """
-        for elem in self._game.get_roster('WHITE'):
-            if elem.get_symbol() == 'WHITE K':
-                self._white_k_sprite = arcade.Sprite('chess_sprites_images/white_king.png', .08)
-                self._white_k_sprite.center_x = 45
-                self._white_k_sprite.center_y = 45
-                self._white_sprites.append(self._white_k_sprite)
-            if elem.get_symbol() == 'WHITE Bi' and self._white_bi1_sprite is None:
-                self._white_bi1_sprite = arcade.Sprite('chess_sprites_images/white_bish.png', .08)
-                self._white_bi1_sprite.center_x = 135
-                self._white_bi1_sprite.center_y = 45
-                self._white_sprites.append(self._white_bi1_sprite)
-            if elem.get_symbol() == 'WHITE Bi' and self._white_bi2_sprite is None:
-                self._white_bi2_sprite = arcade.Sprite('chess_sprites_images/white_bish.png', .08)
-                self._white_bi2_sprite.center_x = 135
-                self._white_bi2_sprite.center_y = 135
-                self._white_sprites.append(self._white_bi2_sprite)
-            if elem.get_symbol() == 'WHITE R':
-                self._white_r_sprite = arcade.Sprite('chess_sprites_images/white_r.png', .08)
-                self._white_r_sprite.center_x = 45
-                self._white_r_sprite.center_y = 135
-                self._white_sprites.append(self._white_r_sprite)
-            if elem.get_symbol() == 'WHITE Kn' and self._white_kn1_sprite is None:
-                self._white_kn1_sprite = arcade.Sprite('chess_sprites_images/white_kn.png', .08)
-                self._white_kn1_sprite.center_x = 225
-                self._white_kn1_sprite.center_y = 45
-                self._white_sprites.append(self._white_kn1_sprite)
-            if elem.get_symbol() == 'WHITE Kn' and self._white_kn2_sprite is None:
-                self._white_kn2_sprite = arcade.Sprite('chess_sprites_images/white_kn.png', .08)
-                self._white_kn2_sprite.center_x = 225
-                self._white_kn2_sprite.center_y = 135
-                self._white_sprites.append(self._white_kn2_sprite)
+        for piece in self._game.get_roster('WHITE'):
+            self.create_piece_sprite(piece, self._white_sprites)
+
+    def create_piece_sprite(self, piece, sprite_list):
+        """
+        Create the sprite of one piece from the shared texture of its image.
+        """
+        sprite = arcade.Sprite(texture=piece_texture(PIECE_IMAGES[piece.get_side()][piece.get_piece_type()]))
+        sprite_list.append(sprite)
+        self._piece_sprites.append((piece, sprite, sprite_list))
+
+    def place_sprites(self):
+        """
+        Put every sprite on the square its piece stands on, bringing back captured ones,
+        and index them by square. The Piece objects are the same from one game to the
+        next (see ChessVariant.reset()), so restarting moves sprites rather than making them.
+        """
+        self._sprite_at = [None] * 64
+        for piece, sprite, sprite_list in self._piece_sprites:
+            square = piece.get_square()
+            if square is None:  # Captured.
+                if sprite in sprite_list:
+                    Sprite.kill(sprite)
+                continue
+            if sprite not in sprite_list:
+                sprite_list.append(sprite)
+            sprite.position = square_to_pixel(square)
+            self._sprite_at[square] = sprite
 
     def on_key_press(self, symbol: int, modifiers: int):
         """
         Allow for input from the keyboard.
         U -- Undo current move, cannot be done if piece is already "set down"
         R -- Restart game
+        W -- Computer plays White on/off
+        B -- Computer plays Black on/off
+        F -- Frame rate & draw time overlay on/off
         """
         if symbol == 117:  # 117 equals U
             if self._moving_piece is not None:
                 self._moving_piece.position = self._moving_piece_og_pos
                 self._moving_piece = None
                 self._moving_piece_og_pos = None
+                self._moving_piece_og_square = None
             else:
                 pass
         if symbol == 114:  # 114 equals R
-            self._game = ChessVar.ChessVariant()
+            self._game.remove_listener(self.on_game_event)  # setup() subscribes again.
+            self._game.reset()  # Same game object, set back up in place.
             self.setup()
+        if symbol == 119:  # 119 equals W
+            self._engine_side = None if self._engine_side == 'WHITE' else 'WHITE'
+        if symbol == 98:  # 98 equals B
+            self._engine_side = None if self._engine_side == 'BLACK' else 'BLACK'
+        if symbol == 102:  # 102 equals F
+            self._show_timings = not self._show_timings
+
+    def on_update(self, delta_time: float):
+        """
+        Let the computer make its move when it is playing the side whose turn it is.
+        on_update is an Arcade method called once per frame.
+        """
+        if self._engine_side is None or self._moving_piece is not None:
+            return
+        if self._engine_side != self._game.get_turn_state():
+            return
+        move = self._engine.play_move(self._game)  # Main portal to ChessVar
+        if move is None:  # Game over, nothing left to play.
+            return
+        self.move_sprite(move[0], move[1])
+        self._illegal_mssg = None
+        self._turn_mssg = None
+        self.update_messages()
 
     def on_draw(self):
         """
@@ -264,23 +281,44 @@ class StartChessView(arcade.View):
         inherited by Arcade's Window class.
         :return: Display a chess board.
         """
+        start = time.perf_counter()
         self.clear()
 
-        self._shape_list.draw()
+        arcade.draw_lrwh_rectangle_textured(0, 0, 8 * SQUARE_SIDE, 8 * SQUARE_SIDE, self._board_texture)
         self._black_sprites.draw()
         self._white_sprites.draw()
-        self._tiles.draw()
 
         # Messages!
         if self._game_over_mssg is not None and self._illegal_mssg is None:
-            arcade.draw_text(self._game_over_mssg, 360, 370, arcade.color.RED_DEVIL, 80, 20, 'center', 'garamond', True)
-            arcade.draw_text('Press R to restart.', 90, 410, arcade.color.RED_DEVIL, 20, 5, 'left', 'garamond', True)
+            self.show_text(self._game_over_text, self._game_over_mssg).draw()
+            self._restart_text.draw()
 
         if self._illegal_mssg is not None:
-            arcade.draw_text(self._illegal_mssg, 550, 410, arcade.color.RED_DEVIL, 20, 5, 'center','garamond', True)
+            self.show_text(self._illegal_text, self._illegal_mssg).draw()
 
         if self._turn_mssg is not None and self._illegal_mssg is None:
-            arcade.draw_text(self._turn_mssg, 550, 420, arcade.color.RED_DEVIL, 20, 5, 'center', 'garamond', True)
+            self.show_text(self._turn_text, self._turn_mssg).draw()
+
+        self.time_frame(start)
+
+    def time_frame(self, start):
+        """
+        Keep the smoothed frame rate and draw time up to date, and show them when the
+        overlay is on. The overlay's text changes a few times a second at most.
+        :param start: time.perf_counter() when on_draw began.
+        """
+        now = time.perf_counter()
+        if self._last_frame is not None:
+            self._frame_seconds += (now - self._last_frame - self._frame_seconds) * 0.1
+        self._draw_seconds += (now - start - self._draw_seconds) * 0.1
+        self._last_frame = now
+        if not self._show_timings:
+            return
+        if now - self._timings_shown_at > 0.25:
+            fps = 1 / self._frame_seconds if self._frame_seconds else 0.0
+            self._timings_text.text = f'{fps:.0f} FPS  draw {self._draw_seconds * 1000:.2f} ms'
+            self._timings_shown_at = now
+        self._timings_text.draw()
 
     def on_mouse_press(self, x: int, y: int, button: int, modifiers: int):
         """
@@ -291,69 +329,68 @@ class StartChessView(arcade.View):
         self._illegal_mssg = None
         self._turn_mssg = None
 
-        column_key = [(45, 'a'), (135, 'b'), (225, 'c'), (315, 'd'), (405, 'e'), (495, 'f'), (585, 'g'), (675, 'h')]
-        row_key = [(45, 1), (135, 2), (225, 3), (315, 4), (405, 5), (495, 6), (585, 7), (675, 8)]
-        counter = 0
-
-        # Get whatever sprite is at the point
-        white_pieces: list[Sprite] = arcade.get_sprites_at_point((x, y), self._white_sprites)
-        black_pieces: list[Sprite] = arcade.get_sprites_at_point((x, y), self._black_sprites)
-
         # Assign values to appropriate movement data members
         # Clicking on a piece.
         if self._moving_piece is None:
-            if len(white_pieces) > 0:
-                self._moving_piece = white_pieces[0]
+            square = pixel_to_square(x, y)
+            if square is not None and self._sprite_at[square] is not None:
+                self._moving_piece = self._sprite_at[square]
                 self._moving_piece_og_pos = self._moving_piece.position
-                white_pieces.clear()
-            elif len(black_pieces) > 0:
-                self._moving_piece = black_pieces[0]
-                self._moving_piece_og_pos = self._moving_piece.position
-                black_pieces.clear()
+                self._moving_piece_og_square = square
             else:
                 print('That isn\'t a piece!')
         # If you have a piece in your hand, press on the square you want.
         else:
-            # Validate compliance with the rules
-            for tile in self._tiles:
-                if self._moving_piece is not None:
-                    if (abs(tile.center_x - self._moving_piece.center_x) < 45) \
-                            and (abs(tile.center_y - self._moving_piece.center_y) < 45):  # Piece landing in a square?
-                        origin = self.translate_origin(column_key, row_key)  # Translate origin coords.
-                        destination = self.translate_destination(column_key, row_key, tile)  # Translate destination coords
-                        if self._game.make_move(origin, destination) is True:  # Main portal to ChessVar
-                            self._moving_piece.position = tile.position  # Move piece successfully
-
-                            # Make any captures in the GUI
-                            if self._moving_piece in self._black_sprites:
-                                self.capture_white_piece()
-                            if self._moving_piece in self._white_sprites:
-                                self.capture_black_piece()
-                            break
-
-                        else:
-                            logging.warning('Illegal Move.')
-                            self._illegal_mssg = 'Illegal move!'
-                            self._moving_piece.position = self._moving_piece_og_pos
-                            self._moving_piece = None
-                            self._moving_piece_og_pos = None
+            # Validate compliance with the rules, for the square the piece is held over.
+            destination = pixel_to_square(self._moving_piece.center_x, self._moving_piece.center_y)
+            if destination is not None:
+                origin = self._moving_piece_og_square
+                if self._game.make_move(ChessVar.square_name(origin), ChessVar.square_name(destination)) is True:
+                    self.place_sprite(origin, destination)  # Move piece successfully, making any capture.
+                else:
+                    logging.warning('Illegal Move.')
+                    if self._illegal_mssg is None:  # on_game_event may have given a reason.
+                        self._illegal_mssg = 'Illegal move!'
+                    self._moving_piece.position = self._moving_piece_og_pos
+            else:  # Let go of off the board.
+                self._moving_piece.position = self._moving_piece_og_pos
 
             self._moving_piece = None
             self._moving_piece_og_pos = None
+            self._moving_piece_og_square = None
+
+            self.update_messages()
 
-            # Check on game state!
-            if self._game.get_game_state() == 'BLACK_WON' and self._illegal_mssg is None:
-                self._game_over_mssg = 'BLACK WINS'
-            elif self._game.get_game_state() == 'TIE' and self._illegal_mssg is None:
-                self._game_over_mssg = 'IT\'S A TIE'
-            elif self._game.get_game_state() == 'WHITE_WON' \
-                    and self._game.get_turn_state() == 'WHITE' and self._illegal_mssg is None:
-                self._game_over_mssg = 'WHITE WINS'
+    def on_game_event(self, event):
+        """
+        Listen to the events ChessVar gives off for each move, log them and explain
+        why a move was turned down when there is more to say than 'Illegal move!'.
+        """
+        logging.info(event)
+        if isinstance(event, ChessVar.MoveRejected):
+            if event.reason == ChessVar.OWN_PIECE:
+                self._illegal_mssg = 'Your own piece is there!'
+            elif event.reason == ChessVar.KING_IN_DANGER:
+                self._illegal_mssg = 'That leaves a King open!'
+            elif event.reason == ChessVar.GAME_OVER:
+                self._illegal_mssg = 'The game is over!'
+
+    def update_messages(self):
+        """
+        Check on the game state after a move and pick the message to show.
+        """
+        if self._game.get_game_state() == 'BLACK_WON' and self._illegal_mssg is None:
+            self._game_over_mssg = 'BLACK WINS'
+        elif self._game.get_game_state() == 'TIE' and self._illegal_mssg is None:
+            self._game_over_mssg = 'IT\'S A TIE'
+        elif self._game.get_game_state() == 'WHITE_WON' \
+                and self._game.get_turn_state() == 'WHITE' and self._illegal_mssg is None:
+            self._game_over_mssg = 'WHITE WINS'
+        else:
+            if self._game.get_turn_state() == 'WHITE':
+                self._turn_mssg = 'White team\'s turn!'
             else:
-                if self._game.get_turn_state() == 'WHITE':
-                    self._turn_mssg = 'White team\'s turn!'
-                else:
-                    self._turn_mssg = 'Black team\'s turn!'
+                self._turn_mssg = 'Black team\'s turn!'
 
     def on_mouse_motion(self, x: int, y: int, dx: int, dy: int):
         """
@@ -365,63 +402,29 @@ class StartChessView(arcade.View):
         else:
             return
 
-    def translate_origin(self, column_key, row_key):
-        """
-        Translate the origin square in the GUI to the string
-        that ChessVar needs to satisfy make_move().
-        :param column_key: A list of tuples like -- (45, 'a')
-        :param row_key: A list of tuples like -- (45, 1)
-        :return: GUI coordinates as string -- 'letter+num'
-        """
-        if self._moving_piece in self._white_sprites or self._moving_piece in self._black_sprites:
-            # Translate the origin square
-            for pair in column_key:
-                if abs((self._moving_piece_og_pos[0] - pair[0])) <= 45:
-                    trans_col = pair[1]
-                    for tup in row_key:
-                        if abs((self._moving_piece_og_pos[1] - tup[0])) <= 45:
-                            trans_row = tup[1]
-                            origin = f'{trans_col}{trans_row}'
-                            return origin
-
-    def translate_destination(self, column_key, row_key, tile):
-        """
-        Translate the destination square in the GUI to the string
-        that ChessVar needs to satisfy make_move(). Also validates
-        whether the piece is being placed on a tile or not.
-        :param column_key: A list of tuples like -- (45, 'a')
-        :param row_key: A list of tuples like -- (45, 1)
-        :param tile: The tile sprite object currently being accessed in the for loop.
-        :return: GUI coordinates as string -- 'letter+num'
-        """
-        for pair in column_key:  # Translating the 'letter' in the tuple in ChessVar DESTINATION
-            if abs((tile.center_x - pair[0])) <= 45:
-                trans_col = pair[1]
-                for tup in row_key:  # Translating the 'int' in the tuple in ChessVar DESTINATION
-                    if abs((tile.center_y - tup[0])) <= 45:
-                        trans_row = str(tup[1])
-                        destination = f'{trans_col}{trans_row}'
-                        return destination
-
-    def capture_white_piece(self):
-        """
-        Iterate through the white_sprite roster,
-        if a piece is in the same square, remove it.
-        :return: Remove opponent piece from the board.
-        """
-        for opponent in self._white_sprites:
-            if self._moving_piece.position == opponent.position:
-                Sprite.kill(opponent)
-
-    def capture_black_piece(self):
-        """
-        Iterate through the black_sprite roster,
-        if a piece is in the same square, remove it.
-        :return: Remove opponent piece from the board.
-        """
-        for opponent in self._black_sprites:
-            if self._moving_piece.position == opponent.position:
-                Sprite.kill(opponent)
+    def move_sprite(self, origin, destination):
+        """
+        Move the sprite on the origin square to the destination square, for a move made
+        by the computer rather than dragged there, and make any capture.
+        :param origin: The square moved from as 'letter+num'
+        :param destination: The square moved to as 'letter+num'
+        """
+        self.place_sprite(ChessVar.square_index(origin), ChessVar.square_index(destination))
+
+    def place_sprite(self, origin, destination):
+        """
+        Set the sprite on the origin square down on the destination square, once ChessVar
+        has made the move, removing the piece it captures if there is one.
+        :param origin: Square index moved from.
+        :param destination: Square index moved to.
+        """
+        captured = self._sprite_at[destination]
+        if captured is not None:
+            Sprite.kill(captured)
+        sprite = self._sprite_at[origin]
+        sprite.position = square_to_pixel(destination)
+        self._sprite_at[origin] = None
+        self._sprite_at[destination] = sprite
 
 
 class WelcomeView(arcade.View):
@@ -0,0 +1,152 @@
+# Description: Perft for ChessVar. Walks the game tree from a position to a fixed depth with
+# Board.generate_legal_moves(), push() and pop(), counting the positions reached. The counts pin down
+# the move rules (a change to move_rules, jump_rule or check_for_check that alters them has changed the
+# game), and the time taken by the bare perft() walk is the standard benchmark for move generation speed.
+#
+# Usage: python ChessVarPerft.py [depth] [--position 'FEN-like text'] [--moves a2a3 h2h4 ...] [--divide] [--check]
+
+import argparse
+import time
+
+from ChessVar import Board, square_index, square_name
+
+# Leaf counts from the starting setup for depths 1 to 5, as the rules stand.
+START_POSITION_COUNTS = (21, 441, 11272, 284709, 8113912)
+
+
+def perft(board, depth):
+    """
+    Count the positions reached after exactly `depth` plies.
+    :param board: A ChessVar Board, left unchanged.
+    :param depth: Plies to search.
+    :return: The number of leaf positions.
+    """
+    if depth == 0:
+        return 1
+    if depth == 1:
+        return sum(1 for _ in board.generate_legal_moves())
+    nodes = 0
+    for move in list(board.generate_legal_moves()):
+        board.push(move)
+        nodes += perft(board, depth - 1)
+        board.pop()
+    return nodes
+
+
+def perft_breakdown(board, depth):
+    """
+    Walk the tree like perft(), keeping a tally for every ply of the moves made there.
+    :param board: A ChessVar Board, left unchanged.
+    :param depth: Plies to search.
+    :return: A list with one dictionary per ply, 1 to depth, counting 'nodes' (moves made
+    at that ply), 'captures', 'king_advances' (King moves up the board), 'game_overs'
+    (moves after which neither side may move, see Board.is_game_over()) and 'last_turns'
+    (moves that bring White's King to row 8 with Black's last move still to come). A
+    White win is a game over only once Black has had that last move, or has none, so the
+    moves after a last turn are walked like any other.
+    """
+    tallies = [{'nodes': 0, 'captures': 0, 'king_advances': 0, 'game_overs': 0, 'last_turns': 0}
+               for _ in range(depth)]
+    _breakdown(board, depth, tallies)
+    return tallies
+
+
+def _breakdown(board, depth, tallies):
+    """
+    Recursive body of perft_breakdown().
+    """
+    tally = tallies[len(tallies) - depth]
+    side = board.get_turn_state()
+    opponent = 'BLACK' if side == 'WHITE' else 'WHITE'
+    opponents = board.get_bitboard(opponent)
+    king = board.get_bitboard(side, 'K')
+    for move in list(board.generate_legal_moves()):
+        origin, destination = move
+        tally['nodes'] += 1
+        if opponents >> destination & 1:
+            tally['captures'] += 1
+        if king >> origin & 1 and destination >> 3 > origin >> 3:
+            tally['king_advances'] += 1
+        board.push(move)
+        if board.is_game_over():
+            tally['game_overs'] += 1
+        else:
+            if board.get_game_state() == 'WHITE_WON':  # Black's last turn.
+                tally['last_turns'] += 1
+            if depth > 1:
+                _breakdown(board, depth - 1, tallies)
+        board.pop()
+
+
+def divide(board, depth):
+    """
+    Split the perft count by root move, to track down which move a difference comes from.
+    :return: A list of ('letter + num' origin, 'letter + num' destination, nodes).
+    """
+    results = []
+    for move in list(board.generate_legal_moves()):
+        board.push(move)
+        results.append((square_name(move[0]), square_name(move[1]), perft(board, depth - 1)))
+        board.pop()
+    return results
+
+
+def board_after(moves, position=None):
+    """
+    Build a Board from the starting setup, or a saved position, and play a list of moves on it.
+    :param moves: Moves as 'a2a3' style strings, origin then destination.
+    :param position: Optionally a text position to start from, see Board.from_position().
+    :return: The Board.
+    """
+    board = Board(position)
+    for text in moves:
+        move = (square_index(text[:2]), square_index(text[2:]))
+        if move not in set(board.generate_legal_moves()):
+            raise ValueError(f'Illegal move: {text}')
+        board.push(move)
+    return board
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Count ChessVar move tree nodes to a fixed depth.')
+    parser.add_argument('depth', type=int, nargs='?', default=3, help='plies to search (default 3)')
+    parser.add_argument('--position', default=None, help='position to start from instead of the starting setup, '
+                                                         'ie "8/8/8/8/8/8/RBN2nbr/KBN2nbk w -"')
+    parser.add_argument('--moves', nargs='*', default=[], help='moves to play from the start, ie a2a3 h2h4')
+    parser.add_argument('--divide', action='store_true', help='print the node count of each root move')
+    parser.add_argument('--check', action='store_true',
+                        help='compare the starting setup against START_POSITION_COUNTS and exit')
+    args = parser.parse_args()
+
+    if args.check:
+        for depth, expected in enumerate(START_POSITION_COUNTS[:args.depth], 1):
+            board = Board()
+            start = time.perf_counter()
+            nodes = perft(board, depth)
+            elapsed = time.perf_counter() - start
+            print(f'depth {depth}: {nodes} {"ok" if nodes == expected else f"MISMATCH, expected {expected}"} '
+                  f'in {elapsed:.3f}s, {nodes / elapsed if elapsed else 0:.0f} nodes/s')
+            if nodes != expected:
+                raise SystemExit(1)
+        return
+
+    board = board_after(args.moves, args.position)
+
+    if args.divide:
+        for origin, destination, nodes in divide(board, args.depth):
+            print(f'{origin}{destination}: {nodes}')
+
+    tallies = perft_breakdown(board, args.depth)
+    print(f'{"depth":>5} {"nodes":>12} {"captures":>10} {"king adv":>10} {"game over":>10} {"last turn":>10}')
+    for depth, tally in enumerate(tallies, 1):
+        print(f'{depth:>5} {tally["nodes"]:>12} {tally["captures"]:>10} '
+              f'{tally["king_advances"]:>10} {tally["game_overs"]:>10} {tally["last_turns"]:>10}')
+
+    start = time.perf_counter()  # Only the plain perft() walk is timed, not the tallies or anything else.
+    nodes = perft(board, args.depth)
+    elapsed = time.perf_counter() - start
+    print(f'{nodes} leaf nodes in {elapsed:.3f}s, {nodes / elapsed if elapsed else 0:.0f} nodes/s')
+
+
+if __name__ == '__main__':
+    main()
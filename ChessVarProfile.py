@@ -0,0 +1,194 @@
+# Description: Built-in profiling for the ChessVar rules engine. While profiling is on, every call to the
+# move validation functions listed in PROFILED is counted and timed, and every validated move (each call
+# of Board._set_piece_location, which make_move(), make_move_fast() and set_white/black_piece_location()
+# all come down to) records how many roster scans it set off: walks over every piece of the board, see
+# ROSTER_SCANS. Profiling is off by default and then costs nothing at all: enable() swaps timing wrappers
+# in on the ChessVariant and Board classes and disable() puts the original functions back, so it can be
+# switched on and off at runtime in a live process. snapshot() reads the counters and reset() clears them.
+#
+# Usage: python ChessVarProfile.py [-n 200] [--seed 0]    (profiles random games and prints the report)
+
+import argparse
+import random
+import time
+
+from ChessVar import Board, ChessVariant
+
+# (class, function name) pairs that are counted and timed.
+PROFILED = (
+    (ChessVariant, 'make_move'),
+    (ChessVariant, 'make_move_fast'),
+    (Board, 'make_move_fast'),
+    (Board, 'set_white_piece_location'),
+    (Board, 'set_black_piece_location'),
+    (Board, '_set_piece_location'),
+    (Board, '_cached_check_rules'),
+    (Board, '_check_rules'),
+    (Board, 'move_rules'),
+    (Board, 'jump_rule'),
+    (Board, 'check_for_check'),
+    (Board, 'check_square'),
+    (Board, 'push'),
+    (Board, 'pop'),
+)
+# Functions that walk every piece on the board. Each call is one roster scan, and is also timed.
+ROSTER_SCANS = (
+    (Board, '_update_attacks'),
+    (Board, '_place_pieces'),
+    (Board, 'get_board_and_pieces'),
+)
+_VALIDATE = (Board, '_set_piece_location')  # One call per validated move.
+
+_originals = {}  # (class, name) -> the function the wrapper replaced, while profiling is on.
+_calls = {}  # 'Class.name' -> [calls, seconds, slowest call in seconds]
+_moves = [0, 0, 0]  # Validated moves, roster scans during them, most roster scans in one move.
+_scans = [0]  # Roster scans since the last reset, inside a validated move or not.
+
+
+def _qualified_name(owner, name):
+    """
+    Name a profiled function the way reports show it, ie 'Board.move_rules'.
+    """
+    return f'{owner.__name__}.{name}'
+
+
+def _timed(original, stats, counts_scan, validates):
+    """
+    Build the wrapper that stands in for a profiled function.
+    :param original: The function being wrapped.
+    :param stats: Its [calls, seconds, slowest] counters.
+    :param counts_scan: Whether each call is a roster scan.
+    :param validates: Whether each call is a validated move, whose roster scans are counted.
+    """
+    clock = time.perf_counter
+
+    def wrapper(*args, **kwargs):
+        if counts_scan:
+            _scans[0] += 1
+        scans = _scans[0]
+        start = clock()
+        try:
+            return original(*args, **kwargs)
+        finally:
+            elapsed = clock() - start
+            stats[0] += 1
+            stats[1] += elapsed
+            if elapsed > stats[2]:
+                stats[2] = elapsed
+            if validates:
+                scans = _scans[0] - scans
+                _moves[0] += 1
+                _moves[1] += scans
+                if scans > _moves[2]:
+                    _moves[2] = scans
+
+    wrapper.__name__ = original.__name__
+    wrapper.__doc__ = original.__doc__
+    wrapper.__wrapped__ = original
+    return wrapper
+
+
+def enable():
+    """
+    Turn profiling on. Counters carry on from where they were, see reset().
+    """
+    if _originals:
+        return
+    for owner, name in PROFILED + ROSTER_SCANS:
+        original = owner.__dict__[name]
+        stats = _calls.setdefault(_qualified_name(owner, name), [0, 0.0, 0.0])
+        _originals[owner, name] = original
+        setattr(owner, name, _timed(original, stats, (owner, name) in ROSTER_SCANS, (owner, name) == _VALIDATE))
+
+
+def disable():
+    """
+    Turn profiling off, putting the original functions back. Counters are kept.
+    """
+    for (owner, name), original in _originals.items():
+        setattr(owner, name, original)
+    _originals.clear()
+
+
+def is_enabled():
+    """
+    Check whether profiling is on.
+    """
+    return bool(_originals)
+
+
+def reset():
+    """
+    Clear every counter, whether profiling is on or not.
+    """
+    for stats in _calls.values():
+        stats[:] = [0, 0.0, 0.0]
+    _moves[:] = [0, 0, 0]
+    _scans[0] = 0
+
+
+def snapshot():
+    """
+    Read the counters.
+    :return: Dictionary of:
+        'enabled': whether profiling is on.
+        'functions': {'Class.name': {'calls', 'seconds', 'mean_us', 'max_us'}} for every
+            function called since the last reset, seconds including the functions it calls.
+        'validated_moves': calls of Board._set_piece_location.
+        'roster_scans': every roster scan, inside a validated move or not.
+        'roster_scans_per_move': mean roster scans per validated move.
+        'max_roster_scans': most roster scans set off by one validated move.
+    """
+    functions = {}
+    for name, (calls, seconds, slowest) in _calls.items():
+        if calls:
+            functions[name] = {'calls': calls, 'seconds': seconds, 'mean_us': seconds / calls * 1e6,
+                               'max_us': slowest * 1e6}
+    validated, scans, most = _moves
+    return {
+        'enabled': is_enabled(),
+        'functions': functions,
+        'validated_moves': validated,
+        'roster_scans': _scans[0],
+        'roster_scans_per_move': scans / validated if validated else 0.0,
+        'max_roster_scans': most,
+    }
+
+
+def format_snapshot(report):
+    """
+    Lay a snapshot() out as a table for the terminal, slowest functions first.
+    """
+    lines = [f'{"function":<32} {"calls":>10} {"total s":>9} {"mean us":>9} {"max us":>9}']
+    for name, stats in sorted(report['functions'].items(), key=lambda item: -item[1]['seconds']):
+        lines.append(f'{name:<32} {stats["calls"]:>10} {stats["seconds"]:>9.3f} {stats["mean_us"]:>9.2f} '
+                     f'{stats["max_us"]:>9.1f}')
+    lines.append(f'{report["validated_moves"]} validated moves, {report["roster_scans"]} roster scans, '
+                 f'{report["roster_scans_per_move"]:.2f} per move (most {report["max_roster_scans"]})')
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Profile the ChessVar rules on random games played through '
+                                                 'make_move(), legal and illegal moves alike.')
+    parser.add_argument('-n', '--games', type=int, default=200, help='games to play (default 200)')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+    squares = [letter + str(row) for row in range(1, 9) for letter in 'abcdefgh']
+    enable()
+    for _ in range(args.games):
+        game = ChessVariant()
+        for _ in range(200):
+            moves = list(game.generate_legal_moves())
+            if not moves:
+                break
+            if rng.random() < 0.2:  # Some illegal tries too, as people make them.
+                game.make_move(rng.choice(squares), rng.choice(squares))
+            game.make_move(*rng.choice(moves))
+    disable()
+    print(format_snapshot(snapshot()))
+
+
+if __name__ == '__main__':
+    main()
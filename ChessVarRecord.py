@@ -0,0 +1,234 @@
+# Description: Game records for ChessVar, in a PGN-like text format. A record is a block of tag lines
+# such as [White "engine"], then the moves as origin + destination squares (a2a3) and a result token,
+# then a blank line:
+#
+#   [White "random"]
+#   [Black "engine"]
+#   [Result "BLACK_WON"]
+#
+#   c2d4 f2e4 b1d3 ... g7h8 0-1
+#
+# A [Position "..."] tag (see ChessVar.START_POSITION) gives the setup when the game didn't start from
+# the usual one. Result tokens are 1-0 (WHITE_WON), 0-1 (BLACK_WON), 1/2-1/2 (TIE) and * (UNFINISHED).
+# Archives are read and written one record at a time, straight through gzip, bz2 or xz compression when
+# the file name ends in .gz, .bz2 or .xz, so an archive of any size is handled in constant memory.
+
+import bz2
+import gzip
+import lzma
+import os
+import re
+
+from ChessVar import GAME_STATES, ChessVariant, Move, square_name
+
+RESULT_TOKENS = {'WHITE_WON': '1-0', 'BLACK_WON': '0-1', 'TIE': '1/2-1/2', 'UNFINISHED': '*'}
+_TOKEN_RESULTS = {token: result for result, token in RESULT_TOKENS.items()}
+_SQUARES = {square_name(index): index for index in range(64)}
+_TAG_LINE = re.compile(r'\[(\w+) "(.*)"\]')
+_MOVES_PER_LINE = 16
+_OPENERS = {'.gz': gzip.open, '.bz2': bz2.open, '.xz': lzma.open, '.lzma': lzma.open}
+
+
+class GameRecord:
+    """
+    One recorded game: its tags, its moves and the result it claims, or, for a game
+    read_records() couldn't read whole, why not.
+    """
+
+    def __init__(self, moves=None, result='UNFINISHED', tags=None, error=None):
+        """
+        :param moves: List of Move objects, or (origin, destination) square index pairs.
+        :param result: The game state the game ended in, ie 'WHITE_WON'.
+        :param tags: Dictionary of extra tags, such as 'White', 'Black' or 'Position'.
+        :param error: Why the game couldn't be read, with its line number, None if it could.
+        :raises ValueError: If result isn't one of ChessVar.GAME_STATES.
+        """
+        if result not in GAME_STATES:
+            raise ValueError(f'Unknown result {result!r}')
+        self._moves = moves if moves is not None else []
+        self._result = result
+        self._tags = tags if tags is not None else {}
+        self._error = error
+
+    def get_moves(self):
+        """
+        Retrieve the moves of the game, in the order they were played.
+        """
+        return self._moves
+
+    def get_result(self):
+        """
+        Retrieve the result the record claims: "WHITE_WON", "BLACK_WON", "TIE", or "UNFINISHED".
+        """
+        return self._result
+
+    def get_tags(self):
+        """
+        Retrieve the record's tags as a dictionary, not including Result.
+        """
+        return self._tags
+
+    def get_position(self):
+        """
+        Retrieve the text position the game started from, None for the usual setup.
+        """
+        return self._tags.get('Position')
+
+    def get_error(self):
+        """
+        Retrieve why the game couldn't be read, ie "Line 12: bad move 'a1a9'", or None if
+        it was read whole. The moves and tags of an unreadable game are the ones that could
+        be read, and its result is UNFINISHED.
+        """
+        return self._error
+
+    def __repr__(self):
+        """
+        Allows the debugger to show an object's attributes rather than its
+        address in memory.
+        """
+        return "{}({!r})".format(self.__class__.__name__, self.__dict__)
+
+
+def open_archive(path, mode='rt'):
+    """
+    Open an archive file, through gzip, bz2 or xz if its name says it is compressed.
+    :param path: File name or path.
+    :param mode: 'rt' to read, 'wt' to write or 'at' to add to the end.
+    :return: A text file object.
+    """
+    for suffix, opener in _OPENERS.items():
+        if str(path).endswith(suffix):
+            return opener(path, mode, encoding='utf-8')
+    return open(path, mode, encoding='utf-8')
+
+
+def format_record(record):
+    """
+    Write a record out as text, ending with the blank line that separates records.
+    """
+    lines = [f'[{name} "{value}"]' for name, value in record.get_tags().items()]
+    lines.append(f'[Result "{record.get_result()}"]')
+    lines.append('')
+    words = [square_name(origin) + square_name(destination) for origin, destination in record.get_moves()]
+    words.append(RESULT_TOKENS[record.get_result()])
+    for start in range(0, len(words), _MOVES_PER_LINE):
+        lines.append(' '.join(words[start:start + _MOVES_PER_LINE]))
+    lines.append('\n')
+    return '\n'.join(lines)
+
+
+def write_records(destination, records):
+    """
+    Write records to an archive as they come, without holding more than one at a time.
+    :param destination: File name or path (compressed by its suffix, see open_archive) or
+    an open text file.
+    :param records: Any iterable of GameRecord objects, such as a generator.
+    :return: How many records were written.
+    """
+    if isinstance(destination, (str, os.PathLike)):
+        with open_archive(destination, 'wt') as archive:
+            return write_records(archive, records)
+    count = 0
+    for record in records:
+        destination.write(format_record(record))
+        count += 1
+    return count
+
+
+def read_records(source, keep_bad=False):
+    """
+    Read the records of an archive one at a time.
+    :param source: File name or path (decompressed by its suffix, see open_archive) or an
+    open text file, or any iterable of lines.
+    :param keep_bad: Instead of raising, hand back a game with a move, tag or Result that
+    can't be read as a GameRecord whose get_error() says why, and carry on with the next.
+    :return: A generator of GameRecord objects.
+    :raises ValueError: For a move, line or Result tag that can't be read, with its line
+    number, unless keep_bad is set.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open_archive(source) as archive:
+            yield from read_records(archive, keep_bad)
+        return
+    tags = {}
+    moves = []
+    result = None
+    error = None
+    started = False
+    for line_number, line in enumerate(source, 1):
+        line = line.strip()
+        if not line:
+            continue
+        if line[0] == '[':
+            if moves:  # Tags after moves with no result token: a new record has begun.
+                yield _make_record(tags, moves, result, error)
+                tags, moves, result, error = {}, [], None, None
+            started = True
+            match = _TAG_LINE.fullmatch(line)
+            if match is None:
+                error = _read_error(error, f'Line {line_number}: bad tag {line!r}', keep_bad)
+            elif match.group(1) == 'Result' and match.group(2) not in GAME_STATES:
+                error = _read_error(error, f'Line {line_number}: unknown result {match.group(2)!r}', keep_bad)
+            else:
+                tags[match.group(1)] = match.group(2)
+            continue
+        started = True
+        for word in line.split():
+            if word in _TOKEN_RESULTS:
+                yield _make_record(tags, moves, result if result is not None else _TOKEN_RESULTS[word], error)
+                tags, moves, result, error, started = {}, [], None, None, False
+                continue
+            if word[-1] == '.':  # Move number, ie "12."
+                continue
+            origin = _SQUARES.get(word[:2])
+            destination = _SQUARES.get(word[2:])
+            if origin is None or destination is None:
+                error = _read_error(error, f'Line {line_number}: bad move {word!r}', keep_bad)
+                continue
+            moves.append(Move(origin, destination))
+    if started:
+        yield _make_record(tags, moves, result, error)
+
+
+def _read_error(error, message, keep_bad):
+    """
+    Deal with something read_records() can't read: raise it, or keep the game's first one.
+    :param error: The game's error so far, None if it had none.
+    :return: The game's error.
+    :raises ValueError: With the message, unless keep_bad is set.
+    """
+    if not keep_bad:
+        raise ValueError(message)
+    return error if error is not None else message
+
+
+def _make_record(tags, moves, result, error=None):
+    """
+    Build a GameRecord from what read_records() collected, taking Result out of the tags.
+    """
+    result = tags.pop('Result', result)
+    if error is not None:
+        return GameRecord(moves, 'UNFINISHED', tags, error)
+    return GameRecord(moves, result if result is not None else 'UNFINISHED', tags)
+
+
+def replay(record, validate=True):
+    """
+    Play a recorded game out on a new ChessVariant.
+    :param record: A GameRecord.
+    :param validate: Check every move against the rules with ChessVariant.make_move_fast().
+    With False the moves are pushed straight onto the Board, trusting the record.
+    :return: The ChessVariant, in the position the game ended in.
+    :raises ValueError: With validation on, for the first move the rules turn down.
+    """
+    game = ChessVariant(record.get_position())
+    if validate:
+        for ply, move in enumerate(record.get_moves()):
+            if not game.make_move_fast(move):
+                raise ValueError(f'Illegal move {square_name(move[0])}{square_name(move[1])} at ply {ply + 1}')
+    else:
+        board = game.get_board_object()
+        for move in record.get_moves():
+            board.push(move)
+    return game
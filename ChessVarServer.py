@@ -0,0 +1,466 @@
+# Description: Host many ChessVar games at once over TCP on localhost with asyncio. Clients send one JSON
+# object per line and get one JSON line back for each, carrying the same "id" so requests can be
+# pipelined and answered out of order across games:
+#
+#   {"id": 1, "op": "new"}                              -> {"id": 1, "ok": true, "game": 17, "turn": "WHITE", ...}
+#   {"id": 2, "op": "move", "game": 17, "move": "a2a3"} -> {"id": 2, "ok": true, "state": "UNFINISHED", ...}
+#   {"id": 3, "op": "moves", "game": 17}                -> {"id": 3, "ok": true, "moves": ["c2d4", ...]}
+#   {"id": 4, "op": "state", "game": 17}                -> {"id": 4, "ok": true, "position": "8/8/...", ...}
+#   {"id": 5, "op": "close", "game": 17}                -> {"id": 5, "ok": true}
+#
+# "new" takes an optional "position" (see ChessVar.START_POSITION). A rejected move comes back with
+# "ok": false and the ChessVar MoveRejected reason, a bad request with "ok": false and an "error". Each
+# connection's requests are handled in order and the next one isn't read until the answer to the last has
+# drained into the socket, so a client that stops reading stops being served rather than growing the
+# server's buffers. Games belong to the connection that made them and are dropped when it closes.
+# Requests that can't be read, down to JSON nested too deeply to decode, are answered with an "error"
+# and the connection carries on. The load test sends a few of these before its games and checks that.
+#
+# Usage: python ChessVarServer.py serve [--port 8765]
+#        python ChessVarServer.py load [--port 8765] [--games 1000] [--connections 10] [--concurrency 20] [--local]
+
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import time
+
+from ChessVar import GamePool, Move, square_index, square_name
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+MAX_LINE = 4096  # Longest request line read, in bytes.
+_HIGH_WATER = 64 * 1024  # Bytes of answers buffered per connection before drain() waits for the client.
+
+
+class GameServer:
+    """
+    Serve ChessVariant games to any number of TCP connections. Every game is a plain
+    ChessVariant kept in memory and played through make_move_fast(). Closed games go
+    back to a GamePool for the next one to reuse.
+    """
+
+    def __init__(self, max_games=100000):
+        """
+        :param max_games: Most games open at once across all connections. "new" is turned
+        down beyond it.
+        """
+        self._games = {}  # game id -> ChessVariant
+        self._pool = GamePool()  # Closed games, reset and waiting for the next "new".
+        self._ids = itertools.count(1)
+        self._max_games = max_games
+        self._server = None
+        self._requests = 0
+
+    def get_game_count(self):
+        """
+        Retrieve how many games are open.
+        """
+        return len(self._games)
+
+    def get_request_count(self):
+        """
+        Retrieve how many requests have been answered since the server started.
+        """
+        return self._requests
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        """
+        Start listening. Port 0 picks a free port, see get_port().
+        """
+        self._server = await asyncio.start_server(self._serve_connection, host, port, limit=MAX_LINE)
+        return self._server
+
+    def get_port(self):
+        """
+        Retrieve the port the server is listening on.
+        """
+        return self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        """
+        Serve until the task is cancelled.
+        """
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def stop(self):
+        """
+        Stop listening and wait for the listening socket to close.
+        """
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _serve_connection(self, reader, writer):
+        """
+        Answer one connection's requests in order until it closes, then drop its games.
+        """
+        writer.transport.set_write_buffer_limits(high=_HIGH_WATER)
+        owned = set()
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ValueError, asyncio.LimitOverrunError):  # Line longer than MAX_LINE.
+                    writer.write(b'{"ok": false, "error": "request too long"}\n')
+                    break
+                if not line:
+                    break
+                writer.write(self.handle_line(line, owned))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            for game_id in owned:
+                self._pool.release(self._games.pop(game_id))
+            writer.close()
+
+    def handle_line(self, line, owned):
+        """
+        Answer one request line.
+        :param line: The request, a JSON object as bytes.
+        :param owned: Set of the ids of the games the connection has open.
+        :return: The answer as a JSON line, in bytes.
+        """
+        self._requests += 1
+        request = None
+        try:
+            request = json.loads(line)
+            answer = self.handle(request, owned)
+        except (ValueError, TypeError, KeyError, AttributeError, RecursionError) as error:
+            answer = {'ok': False, 'error': str(error) or error.__class__.__name__}
+        if isinstance(request, dict) and 'id' in request:
+            answer['id'] = request['id']
+        return json.dumps(answer).encode() + b'\n'
+
+    def handle(self, request, owned):
+        """
+        Carry out one request.
+        :param request: The decoded request dictionary.
+        :param owned: Set of the ids of the games the connection has open.
+        :return: The answer dictionary.
+        """
+        op = request.get('op')
+        if op == 'new':
+            if len(self._games) >= self._max_games:
+                return {'ok': False, 'error': 'server full'}
+            game = self._pool.acquire(request.get('position'))
+            game_id = next(self._ids)
+            self._games[game_id] = game
+            owned.add(game_id)
+            return {'ok': True, 'game': game_id, 'turn': game.get_turn_state(), 'state': game.get_game_state()}
+        game_id = request.get('game')
+        if game_id not in owned:
+            return {'ok': False, 'error': f'no game {game_id}'}
+        game = self._games[game_id]
+        board = game.get_board_object()
+        if op == 'move':
+            move = request['move']
+            move = Move(square_index(move[:2]), square_index(move[2:]))
+            if not board.make_move_fast(move):
+                return {'ok': False, 'reason': board.explain_rejection(move), 'turn': board.get_turn_state(),
+                        'state': board.get_game_state()}
+            return {'ok': True, 'turn': board.get_turn_state(), 'state': board.get_game_state(),
+                    'over': board.is_game_over()}
+        if op == 'moves':
+            return {'ok': True, 'moves': [square_name(origin) + square_name(destination)
+                                          for origin, destination in board.generate_legal_moves()]}
+        if op == 'state':
+            return {'ok': True, 'position': board.to_position(), 'turn': board.get_turn_state(),
+                    'state': board.get_game_state(), 'over': board.is_game_over()}
+        if op == 'close':
+            owned.discard(game_id)
+            self._pool.release(self._games.pop(game_id))
+            return {'ok': True}
+        return {'ok': False, 'error': f'unknown op {op!r}'}
+
+    def __repr__(self):
+        """
+        Allows the debugger to show an object's attributes rather than its
+        address in memory.
+        """
+        return "{}({!r})".format(self.__class__.__name__, self.__dict__)
+
+
+class GameClient:
+    """
+    A connection to a GameServer. Any number of coroutines may share one client, each
+    request is matched to its answer by id.
+    """
+
+    def __init__(self, max_in_flight=256):
+        """
+        :param max_in_flight: Most requests sent but not yet answered. Further requests
+        wait for a slot, so a slow server slows the client down instead of piling up.
+        """
+        self._reader = None
+        self._writer = None
+        self._ids = itertools.count(1)
+        self._waiting = {}  # request id -> Future of its answer
+        self._slots = asyncio.Semaphore(max_in_flight)
+        self._listener = None
+
+    async def connect(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        """
+        Open the connection and start reading answers.
+        """
+        self._reader, self._writer = await asyncio.open_connection(host, port, limit=1 << 20)
+        self._listener = asyncio.get_running_loop().create_task(self._read_answers())
+        return self
+
+    async def close(self):
+        """
+        Close the connection. The server drops every game it made.
+        """
+        self._writer.close()
+        await self._writer.wait_closed()
+        await self._listener
+
+    async def _read_answers(self):
+        """
+        Hand each answer line to the request waiting for it.
+        """
+        while True:
+            line = await self._reader.readline()
+            if not line:
+                break
+            answer = json.loads(line)
+            future = self._waiting.pop(answer.get('id'), None)
+            if future is not None and not future.done():
+                future.set_result(answer)
+        for future in self._waiting.values():
+            if not future.done():
+                future.set_exception(ConnectionError('server closed the connection'))
+        self._waiting.clear()
+
+    async def request(self, op, **fields):
+        """
+        Send one request and wait for its answer.
+        :param op: 'new', 'move', 'moves', 'state' or 'close'.
+        :param fields: The rest of the request, ie game=17, move='a2a3'.
+        :return: The answer dictionary.
+        """
+        async with self._slots:
+            request_id = next(self._ids)
+            future = asyncio.get_running_loop().create_future()
+            self._waiting[request_id] = future
+            self._writer.write(json.dumps(dict(fields, id=request_id, op=op)).encode() + b'\n')
+            await self._writer.drain()
+            return await future
+
+    async def new_game(self, position=None):
+        """
+        Start a game, from the usual setup or a saved position.
+        :return: The game's id.
+        :raises ValueError: If the server turns the game down.
+        """
+        answer = await (self.request('new', position=position) if position else self.request('new'))
+        if not answer['ok']:
+            raise ValueError(answer['error'])
+        return answer['game']
+
+    async def make_move(self, game_id, origin, destination):
+        """
+        Make a move given as 'letter + num' squares, like ChessVariant.make_move().
+        :return: The answer dictionary, whose 'ok' says whether the move was made.
+        """
+        return await self.request('move', game=game_id, move=origin + destination)
+
+    async def legal_moves(self, game_id):
+        """
+        Retrieve a game's legal moves as 'a2a3' strings.
+        """
+        return (await self.request('moves', game=game_id))['moves']
+
+    async def get_state(self, game_id):
+        """
+        Retrieve a game's position, turn, game state and whether it is over.
+        """
+        return await self.request('state', game=game_id)
+
+    async def close_game(self, game_id):
+        """
+        Drop a game on the server.
+        """
+        return await self.request('close', game=game_id)
+
+    def __repr__(self):
+        """
+        Allows the debugger to show an object's attributes rather than its
+        address in memory.
+        """
+        return "{}({!r})".format(self.__class__.__name__, self.__dict__)
+
+
+def percentile(values, fraction):
+    """
+    Pick the value below which the given fraction of values lie, from a sorted list.
+    """
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+async def _play_random_game(client, rng, max_plies, latencies):
+    """
+    Play one game of random legal moves on the server, timing every move request.
+    :return: The number of moves made.
+    """
+    game_id = await client.new_game()
+    plies = 0
+    while plies < max_plies:
+        moves = await client.legal_moves(game_id)
+        if not moves:
+            break
+        move = rng.choice(moves)
+        start = time.perf_counter()
+        answer = await client.make_move(game_id, move[:2], move[2:])
+        latencies.append(time.perf_counter() - start)
+        if not answer['ok']:
+            raise RuntimeError(f'server turned down its own legal move {move}: {answer}')
+        plies += 1
+        if answer['over']:
+            break
+    await client.close_game(game_id)
+    return plies
+
+
+_BAD_REQUESTS = (
+    b'not json',
+    b'[' * 1500,  # Nested too deeply for json.loads(), which raises RecursionError.
+    b'{"op": "move", "game": ' + b'[' * 1500 + b'}',
+    b'{"id": 1, "op": "move", "game": 1, "move": 7}',
+)
+
+
+async def _check_bad_requests(host, port):
+    """
+    Send requests that can't be carried out on a connection of their own, and check each
+    gets an error answer and the connection is still served afterwards.
+    :raises RuntimeError: If the server answers one wrongly or drops the connection.
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for line in _BAD_REQUESTS + (b'{"id": 2, "op": "new"}',):
+            writer.write(line + b'\n')
+            answer = await reader.readline()
+            if not answer:
+                raise RuntimeError(f'server closed the connection after {line[:40]!r}')
+            answer = json.loads(answer)
+            if answer['ok'] != (line == b'{"id": 2, "op": "new"}'):
+                raise RuntimeError(f'server answered {line[:40]!r} with {answer}')
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+async def run_load(host=DEFAULT_HOST, port=DEFAULT_PORT, games=1000, connections=10, concurrency=20,
+                   max_plies=200, seed=0):
+    """
+    Play random games against a server from many connections at once and measure it, after
+    checking it answers bad requests with errors, see _BAD_REQUESTS.
+    :param games: How many games to play in all.
+    :param connections: TCP connections to spread the games over.
+    :param concurrency: Games in play at once on each connection.
+    :param max_plies: Give up on a game after this many plies.
+    :param seed: Seed for the random moves, game n always uses seed + n.
+    :return: Dictionary with 'games', 'moves', 'seconds', 'moves_per_second' and the
+    'p50_ms', 'p99_ms' and 'max_ms' round-trip times of move requests.
+    """
+    await _check_bad_requests(host, port)
+    clients = [await GameClient().connect(host, port) for _ in range(connections)]
+    numbers = iter(range(games))
+    latencies = []
+    moves = 0
+
+    async def player(client):
+        nonlocal moves
+        for number in numbers:  # Shared iterator: each game number is played once.
+            plies = await _play_random_game(client, random.Random(seed + number), max_plies, latencies)
+            moves += plies
+
+    start = time.perf_counter()
+    try:
+        await asyncio.gather(*(player(client) for client in clients for _ in range(concurrency)))
+    finally:
+        for client in clients:
+            await client.close()
+    seconds = time.perf_counter() - start
+    latencies.sort()
+    return {
+        'games': games,
+        'moves': moves,
+        'seconds': seconds,
+        'moves_per_second': moves / seconds if seconds else 0.0,
+        'p50_ms': percentile(latencies, 0.50) * 1000,
+        'p99_ms': percentile(latencies, 0.99) * 1000,
+        'max_ms': latencies[-1] * 1000 if latencies else 0.0,
+    }
+
+
+def format_load(stats):
+    """
+    Describe a run_load() result in two lines.
+    """
+    return (f'{stats["games"]} games, {stats["moves"]} moves in {stats["seconds"]:.2f}s '
+            f'({stats["moves_per_second"]:.0f} moves/s)\n'
+            f'move latency p50 {stats["p50_ms"]:.2f} ms, p99 {stats["p99_ms"]:.2f} ms, max {stats["max_ms"]:.2f} ms')
+
+
+async def _serve(host, port, max_games):
+    """
+    Run a server until interrupted.
+    """
+    server = GameServer(max_games)
+    await server.start(host, port)
+    print(f'Serving ChessVar on {host}:{server.get_port()}', flush=True)
+    await server.serve_forever()
+
+
+async def _load(args):
+    """
+    Run the load generator, against a server started in this process with --local.
+    """
+    server = None
+    port = args.port
+    if args.local:
+        server = GameServer()
+        await server.start(args.host, 0)
+        port = server.get_port()
+    try:
+        stats = await run_load(args.host, port, args.games, args.connections, args.concurrency, args.max_plies,
+                               args.seed)
+    finally:
+        if server is not None:
+            await server.stop()
+    print(format_load(stats))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve many ChessVar games over TCP, or put load on a server.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    serve = commands.add_parser('serve', help='run a game server')
+    load = commands.add_parser('load', help='play random games against a server and time the moves')
+    for command in (serve, load):
+        command.add_argument('--host', default=DEFAULT_HOST)
+        command.add_argument('--port', type=int, default=DEFAULT_PORT)
+    serve.add_argument('--max-games', type=int, default=100000, help='most games open at once (default 100000)')
+    load.add_argument('--games', type=int, default=1000, help='games to play (default 1000)')
+    load.add_argument('--connections', type=int, default=10, help='TCP connections (default 10)')
+    load.add_argument('--concurrency', type=int, default=20, help='games at once per connection (default 20)')
+    load.add_argument('--max-plies', type=int, default=200, help='ply limit per game (default 200)')
+    load.add_argument('--seed', type=int, default=0)
+    load.add_argument('--local', action='store_true', help='start a server in this process to load')
+    args = parser.parse_args()
+    try:
+        if args.command == 'serve':
+            asyncio.run(_serve(args.host, args.port, args.max_games))
+        else:
+            asyncio.run(_load(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
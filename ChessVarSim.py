@@ -0,0 +1,240 @@
+# Description: Batch self-play for ChessVar. Plays many complete games between random and/or engine
+# players, spread over a pool of worker processes, and reports how the games ended, how long they lasted
+# and how many games per second were played. Games are driven through the Board's legal move generator
+# and push(), which follow the same rules as make_move(), including Black's last turn after White wins
+# and the tie when Black's King also makes it.
+#
+# A seed replays the same random games whatever the number of processes. Engines searching against the
+# clock don't: how deep they get depends on the machine's load. --engine-depth makes engine games
+# repeatable as well, by searching to a fixed depth with no time limit and clearing each engine's
+# transposition table before every game, so no game depends on the ones its worker played before it.
+#
+# Usage: python ChessVarSim.py -n 10000 [--white random|engine] [--black random|engine] [--processes 4]
+#        [--engine-time 0.01 | --engine-depth 3] [--record games.txt.gz]
+
+import argparse
+import multiprocessing
+import os
+import random
+import time
+
+from ChessVar import GamePool
+from ChessVarEngine import Engine
+from ChessVarRecord import GameRecord, open_archive, write_records
+
+RESULTS = ('WHITE_WON', 'BLACK_WON', 'TIE', 'UNFINISHED', 'STUCK')  # UNFINISHED: hit the ply limit.
+PLAYERS = ('random', 'engine')
+_TERMINATION_RESULTS = {'stuck': 'STUCK', 'ply limit': 'UNFINISHED'}  # play_game() termination -> tally result
+_GAMES = GamePool(max_free=4)  # Each game is played out and handed back before the next starts.
+
+
+def play_game(white, black, rng, max_plies=200, random_plies=0, moves_played=None):
+    """
+    Play one game to the end.
+    :param white: The Engine playing White, or None for random moves.
+    :param black: The Engine playing Black, or None for random moves.
+    :param rng: random.Random used for random moves.
+    :param max_plies: Give up on the game after this many plies.
+    :param random_plies: Play this many opening plies at random whoever the players are,
+    so engine games don't all repeat each other.
+    :param moves_played: Optionally a list to append each move made to.
+    :return: (game state, plies, termination) where the game state is the Board's, the one
+    the moves played lead to, and termination is None for a game played to its end,
+    'stuck' when the side to move had no legal move left in an UNFINISHED game, or
+    'ply limit'. Black having no last move after White reached row 8 leaves the game
+    WHITE_WON, played to its end.
+    """
+    game = _GAMES.acquire()
+    board = game.get_board_object()
+    players = {'WHITE': white, 'BLACK': black}
+    plies = 0
+    try:
+        while not board.is_game_over():
+            if plies >= max_plies:
+                return board.get_game_state(), plies, 'ply limit'
+            moves = list(board.generate_legal_moves())
+            if not moves:
+                if board.get_game_state() != 'UNFINISHED':  # Black has no last move after White won.
+                    return board.get_game_state(), plies, None
+                return board.get_game_state(), plies, 'stuck'
+            player = players[board.get_turn_state()]
+            if player is None or plies < random_plies:
+                move = rng.choice(moves)
+            else:
+                move = player.search(board)[0]
+            board.push(move)
+            if moves_played is not None:
+                moves_played.append(move)
+            plies += 1
+        return board.get_game_state(), plies, None
+    finally:
+        _GAMES.release(game)
+
+
+def new_stats():
+    """
+    Create an empty tally of games.
+    """
+    return {
+        'games': 0,
+        'results': {result: 0 for result in RESULTS},
+        'plies': {result: 0 for result in RESULTS},
+        'min_plies': None,
+        'max_plies': 0,
+    }
+
+
+def add_game(stats, result, plies):
+    """
+    Count one game in a tally.
+    """
+    stats['games'] += 1
+    stats['results'][result] += 1
+    stats['plies'][result] += plies
+    if stats['min_plies'] is None or plies < stats['min_plies']:
+        stats['min_plies'] = plies
+    stats['max_plies'] = max(stats['max_plies'], plies)
+
+
+def merge_stats(stats, other):
+    """
+    Fold one tally into another.
+    """
+    stats['games'] += other['games']
+    for result in RESULTS:
+        stats['results'][result] += other['results'][result]
+        stats['plies'][result] += other['plies'][result]
+    if other['min_plies'] is not None and (stats['min_plies'] is None or other['min_plies'] < stats['min_plies']):
+        stats['min_plies'] = other['min_plies']
+    stats['max_plies'] = max(stats['max_plies'], other['max_plies'])
+
+
+def _make_player(kind, engine_time, engine_depth=None):
+    """
+    Build a player from its name in PLAYERS.
+    :param engine_depth: Search this many plies with no time limit instead of engine_time.
+    """
+    if kind != 'engine':
+        return None
+    if engine_depth:
+        return Engine(time_limit=float('inf'), max_depth=engine_depth, table_mb=8)
+    return Engine(time_limit=engine_time, table_mb=8)
+
+
+def _play_batch(job):
+    """
+    Worker task: play a run of games, each seeded from its game number so that random
+    players' games don't depend on how the games were split between workers. With an
+    engine depth the engines' tables are cleared before every game, so engine games don't
+    depend on it either.
+    :param job: (first game number, number of games, white kind, black kind, engine time,
+    engine depth or None, max plies, random plies, seed, whether to record the games)
+    :return: (the batch's tally, list of GameRecord objects, empty when not recording)
+    """
+    (first, count, white_kind, black_kind, engine_time, engine_depth, max_plies, random_plies, seed,
+     record) = job
+    white = _make_player(white_kind, engine_time, engine_depth)
+    black = _make_player(black_kind, engine_time, engine_depth)
+    engines = [player for player in (white, black) if player is not None]
+    stats = new_stats()
+    records = []
+    for number in range(first, first + count):
+        if engine_depth:
+            for engine in engines:
+                engine.get_table().clear()
+        moves = [] if record else None
+        game_seed = seed * 1000003 + number
+        game_state, plies, termination = play_game(white, black, random.Random(game_seed), max_plies, random_plies,
+                                                   moves)
+        add_game(stats, _TERMINATION_RESULTS.get(termination, game_state), plies)
+        if record:
+            tags = {'Game': str(number), 'Seed': str(seed), 'White': white_kind, 'Black': black_kind}
+            if termination is not None:
+                tags['Termination'] = termination
+            records.append(GameRecord(moves, game_state, tags))
+    return stats, records
+
+
+def simulate(games, white='random', black='random', processes=None, engine_time=0.01, max_plies=200,
+             random_plies=0, seed=0, batch_size=None, record_path=None, engine_depth=None):
+    """
+    Play a number of games over a process pool and tally the results.
+    :param games: How many games to play.
+    :param white: 'random' or 'engine'.
+    :param black: 'random' or 'engine'.
+    :param processes: Worker processes, all CPUs by default. 1 plays in this process.
+    :param engine_time: Seconds per move for engine players.
+    :param max_plies: Give up on a game after this many plies.
+    :param random_plies: Opening plies played at random by every player.
+    :param seed: Base seed, the same seed replays the same random games. Engine games
+    replay only with an engine_depth, a timed search depends on the machine's load.
+    :param batch_size: Games per worker task, chosen from the game count by default.
+    :param record_path: Optionally an archive to write every game to, see ChessVarRecord.
+    Games are written as their batch finishes, so not in game order.
+    :param engine_depth: Have engine players search this many plies, with no time limit,
+    instead of engine_time seconds per move.
+    :return: The tally, see new_stats(), with 'seconds' and 'games_per_second' added.
+    """
+    processes = processes or os.cpu_count() or 1
+    if batch_size is None:
+        batch_size = max(1, min(500, games // (processes * 8) or 1))
+    jobs = [(first, min(batch_size, games - first), white, black, engine_time, engine_depth, max_plies,
+             random_plies, seed, record_path is not None) for first in range(0, games, batch_size)]
+
+    start = time.perf_counter()
+    stats = new_stats()
+    pool = multiprocessing.Pool(processes) if processes > 1 else None
+    archive = open_archive(record_path, 'wt') if record_path is not None else None
+    try:
+        for batch_stats, records in (pool.imap_unordered(_play_batch, jobs) if pool else map(_play_batch, jobs)):
+            merge_stats(stats, batch_stats)
+            if archive is not None:
+                write_records(archive, records)
+    finally:
+        if pool is not None:
+            pool.terminate()
+        if archive is not None:
+            archive.close()
+    stats['seconds'] = time.perf_counter() - start
+    stats['games_per_second'] = stats['games'] / stats['seconds'] if stats['seconds'] else 0.0
+    return stats
+
+
+def format_stats(stats):
+    """
+    Lay a tally out as a small table for the terminal.
+    """
+    lines = [f'{"result":<12} {"games":>10} {"share":>8} {"mean plies":>11}']
+    for result in RESULTS:
+        count = stats['results'][result]
+        share = count / stats['games'] if stats['games'] else 0.0
+        mean = stats['plies'][result] / count if count else 0.0
+        lines.append(f'{result:<12} {count:>10} {share:>8.1%} {mean:>11.1f}')
+    total_plies = sum(stats['plies'].values())
+    lines.append(f'{stats["games"]} games, {total_plies} plies, length {stats["min_plies"]}-{stats["max_plies"]}'
+                 f' (mean {total_plies / stats["games"] if stats["games"] else 0:.1f})')
+    lines.append(f'{stats["seconds"]:.2f}s, {stats["games_per_second"]:.1f} games/s')
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Play ChessVar games in bulk and tally the results.')
+    parser.add_argument('-n', '--games', type=int, default=1000, help='games to play (default 1000)')
+    parser.add_argument('--white', choices=PLAYERS, default='random')
+    parser.add_argument('--black', choices=PLAYERS, default='random')
+    parser.add_argument('--processes', type=int, default=None, help='worker processes (default: all CPUs)')
+    parser.add_argument('--engine-time', type=float, default=0.01, help='seconds per engine move (default 0.01)')
+    parser.add_argument('--engine-depth', type=int, default=None,
+                        help='search engine moves to this depth instead, so seeded engine games repeat')
+    parser.add_argument('--max-plies', type=int, default=200, help='ply limit per game (default 200)')
+    parser.add_argument('--random-plies', type=int, default=0, help='opening plies played at random')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--record', default=None, help='write every game to this archive (.gz, .bz2, .xz compress)')
+    args = parser.parse_args()
+    stats = simulate(args.games, args.white, args.black, args.processes, args.engine_time, args.max_plies,
+                     args.random_plies, args.seed, record_path=args.record, engine_depth=args.engine_depth)
+    print(format_stats(stats))
+
+
+if __name__ == '__main__':
+    main()
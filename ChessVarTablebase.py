@@ -0,0 +1,369 @@
+# Description: Endgame tablebases for ChessVar. Once only a few pieces are left, who wins the race to
+# row 8 is settled, and a tablebase holds the answer for every placement of a set of material, such as
+# a lone King against King and Knight ('K-KN', White's pieces before the dash). Tables are solved by
+# retrograde analysis: every position's legal moves are generated once with the same rules make_move()
+# uses (check_for_check, king_move, ...), then results are worked backwards from the finished games,
+# nearest first, so every entry holds the best result for the side to move and how many plies it takes.
+# Positions a capture leads out of are looked up in the smaller tables, which are solved first.
+#
+# A table file is a small header followed by one 16-bit entry per position. Tablebase opens it memory
+# mapped, so a probe reads two bytes at a computed offset and the table is never loaded as a whole.
+#
+# Usage: python ChessVarTablebase.py K-KN [--output K-KN.cvtb]
+
+import argparse
+import mmap
+import struct
+import time
+
+from ChessVar import Board, SIDES, PIECE_TYPES, KING, BISHOP, ROOK, KNIGHT, POSITION_BYTES
+
+# Results, for the side to move.
+DRAW = 0  # Neither side can force a result, or the side to move has no legal move.
+WIN = 1
+LOSS = 2
+TIE = 3  # Best play ends with both Kings on row 8.
+RESULT_NAMES = ('DRAW', 'WIN', 'LOSS', 'TIE')
+
+# Positions are indexed by placement and by mode, the turn & game state.
+MODES = (('WHITE', 'UNFINISHED'), ('BLACK', 'UNFINISHED'), ('BLACK', 'WHITE_WON'))  # Black's last turn.
+MAX_DISTANCE = 0x3FFF
+INVALID = 0xFFFF  # Entry of an index that isn't a position, ie two pieces on one square.
+
+_MAGIC = b'CVTB'
+_VERSION = 1
+_HEADER = struct.Struct('<4sHH16s')  # Magic, version, reserved, material.
+_LETTERS = {'K': KING, 'B': BISHOP, 'R': ROOK, 'N': KNIGHT}
+_ROSTER = ((KING, 1), (BISHOP, 2), (ROOK, 1), (KNIGHT, 2))  # Pieces each side has, in roster order.
+_UNSOLVED = -1
+
+
+def parse_material(material):
+    """
+    Read a material set such as 'K-KN' (White: King; Black: King & Knight).
+    :return: For each side, a tuple of (piece type, count) in PIECE_TYPES order.
+    :raises ValueError: Unless each side has its King and no more pieces than its roster.
+    """
+    halves = material.upper().split('-')
+    if len(halves) != 2:
+        raise ValueError(f'Material is written like K-KN, not {material!r}')
+    sides = []
+    for half in halves:
+        if any(letter not in _LETTERS for letter in half):
+            raise ValueError(f'Unknown piece in material {material!r}')
+        counts = tuple((piece_type, half.count(letter)) for letter, piece_type in _LETTERS.items())
+        if counts[0][1] != 1 or any(count > most for (_, count), (_, most) in zip(counts, _ROSTER)):
+            raise ValueError(f'Each side needs one King and at most two Bishops, one Rook and two '
+                             f'Knights: {material!r}')
+        sides.append(tuple(entry for entry in counts if entry[1]))
+    return tuple(sides)
+
+
+def material_name(sides):
+    """
+    Write parsed material back out in its standard form, ie 'K-KN'.
+    """
+    letters = {piece_type: letter for letter, piece_type in _LETTERS.items()}
+    return '-'.join(''.join(letters[piece_type] * count for piece_type, count in side) for side in sides)
+
+
+def board_material(board):
+    """
+    Work out the material set of the pieces on a board, in its standard form.
+    """
+    sides = []
+    for name in SIDES:
+        sides.append(tuple((piece_type, board.get_bitboard(name, PIECE_TYPES[piece_type]).bit_count())
+                           for piece_type in range(len(PIECE_TYPES))
+                           if board.get_bitboard(name, PIECE_TYPES[piece_type])))
+    return material_name(sides)
+
+
+class _Layout:
+    """
+    Maps positions of one material set to table indexes and back: each piece's square is
+    a base-64 digit of the placement, pieces of a side & type taking their squares in
+    increasing order, and the placement is multiplied by 3 and added to the mode.
+    """
+
+    def __init__(self, material):
+        self.sides = parse_material(material)
+        self.name = material_name(self.sides)
+        self.groups = []  # (side, piece type, count, digit of its first piece)
+        digit = 0
+        for side, pieces in enumerate(self.sides):
+            for piece_type, count in pieces:
+                self.groups.append((side, piece_type, count, digit))
+                digit += count
+        self.pieces = digit
+        self.size = 64 ** digit * len(MODES)
+
+    def index(self, board, mode):
+        """
+        Compute the index of a board holding this material.
+        """
+        placement = 0
+        for side, piece_type, count, digit in self.groups:
+            mask = board.get_bitboard(SIDES[side], PIECE_TYPES[piece_type])
+            for place in range(digit, digit + count):
+                low = mask & -mask
+                mask ^= low
+                placement += (low.bit_length() - 1) << (6 * place)
+        return placement * len(MODES) + mode
+
+    def position(self, index):
+        """
+        Build the binary position (see ChessVar.POSITION_BYTES) of an index.
+        :return: The position's bytes, or None if two pieces share a square.
+        """
+        placement, mode = divmod(index, len(MODES))
+        squares = [(placement >> (6 * place)) & 63 for place in range(self.pieces)]
+        if len(set(squares)) != len(squares):
+            return None
+        slots = bytearray(b'\xff' * (POSITION_BYTES - 1))
+        for side, piece_type, count, digit in self.groups:
+            first = side * 6 + (0, 1, 3, 4)[piece_type]  # Roster slot of the type's first piece.
+            for offset in range(count):
+                slots[first + offset] = squares[digit + offset]
+        turn_state, game_state = MODES[mode]
+        slots.append(SIDES.index(turn_state) | (1 << 1 if game_state == 'WHITE_WON' else 0))
+        return bytes(slots)
+
+
+def _mode(board):
+    """
+    Look up the mode of a board whose game isn't over.
+    """
+    if board.get_turn_state() == 'WHITE':
+        return 0
+    return 2 if board.get_game_state() == 'WHITE_WON' else 1
+
+
+def _finished_result(board):
+    """
+    Result for the side to move of a board whose game is over.
+    """
+    state = board.get_game_state()
+    if state == 'TIE':
+        return TIE
+    return WIN if (state == 'WHITE_WON') == (board.get_turn_state() == 'WHITE') else LOSS
+
+
+def solve(material, tables=None, progress=None):
+    """
+    Solve every position of a material set by retrograde analysis.
+    :param material: Material set, ie 'K-KN'.
+    :param tables: Dictionary of tables already solved, by material name. Tables for the
+    material left after a capture are solved into it first when missing.
+    :param progress: Optionally called with a line of text as each stage finishes.
+    :return: The table, a list of entries (result << 14 | distance, or INVALID) by index.
+    """
+    tables = {} if tables is None else tables
+    layout = _Layout(material)
+    if layout.name in tables:
+        return tables[layout.name]
+    for side in range(2):  # Everything one capture away, smallest first.
+        for position, (piece_type, count) in enumerate(layout.sides[side]):
+            if piece_type != KING:
+                smaller = list(layout.sides)
+                smaller[side] = layout.sides[side][:position] + ((piece_type, count - 1),) + \
+                    layout.sides[side][position + 1:]
+                smaller[side] = tuple(entry for entry in smaller[side] if entry[1])
+                solve(material_name(smaller), tables, progress)
+    start = time.perf_counter()
+
+    size = layout.size
+    result = [_UNSOLVED] * size
+    distance = [0] * size
+    remaining = [0] * size  # Moves not yet known to hand the opponent a win.
+    loss_distance = [0] * size  # Longest known road to a loss, for when every move loses.
+    ties = [0] * size  # Moves known to lead to a tie.
+    tie_distance = [MAX_DISTANCE] * size
+    buckets = [[] for _ in range(MAX_DISTANCE + 2)]  # (index, result) waiting to be settled, by distance.
+    edge_children = []  # Every move between two positions of this table, as child & parent index.
+    edge_parents = []
+
+    # Generate every position's moves and settle what the finished games and smaller tables say.
+    for index in range(size):
+        position = layout.position(index)
+        if position is None:
+            result[index] = INVALID
+            continue
+        board = Board(position)
+        moves = list(board.generate_legal_moves())
+        if not moves:
+            result[index] = DRAW
+            continue
+        win_distance = MAX_DISTANCE
+        for move in moves:
+            board.push(move)
+            if board.is_game_over():
+                child_result, child_distance = _finished_result(board), 0
+            else:
+                child_material = board_material(board)
+                if child_material == layout.name:
+                    child = layout.index(board, _mode(board))
+                    edge_children.append(child)
+                    edge_parents.append(index)
+                    remaining[index] += 1
+                    board.pop()
+                    continue
+                entry = tables[child_material][_Layout(child_material).index(board, _mode(board))]
+                child_result, child_distance = entry >> 14, entry & MAX_DISTANCE
+            board.pop()
+            if child_result == LOSS:
+                win_distance = min(win_distance, child_distance + 1)
+            elif child_result == WIN:
+                loss_distance[index] = max(loss_distance[index], child_distance + 1)
+            else:
+                remaining[index] += 1
+                if child_result == TIE:
+                    ties[index] += 1
+                    tie_distance[index] = min(tie_distance[index], child_distance + 1)
+        if win_distance < MAX_DISTANCE:
+            buckets[win_distance].append((index, WIN))
+        elif remaining[index] == 0:
+            buckets[loss_distance[index]].append((index, LOSS))
+    if progress:
+        progress(f'{layout.name}: {size} entries, {len(edge_children)} moves generated '
+                 f'in {time.perf_counter() - start:.1f}s')
+
+    # Parents of each position, packed into one list.
+    first_parent = [0] * (size + 1)
+    for child in edge_children:
+        first_parent[child + 1] += 1
+    for index in range(size):
+        first_parent[index + 1] += first_parent[index]
+    parents = [0] * len(edge_children)
+    fill = first_parent[:-1]
+    for child, parent in zip(edge_children, edge_parents):
+        parents[fill[child]] = parent
+        fill[child] += 1
+    del edge_children, edge_parents, fill
+
+    # Wins and losses, nearest first: a position is won once one move reaches a lost one, and
+    # lost once every move reaches a won one.
+    for level, bucket in enumerate(buckets):
+        for index, outcome in bucket:
+            if result[index] != _UNSOLVED:
+                continue
+            result[index] = outcome
+            distance[index] = level
+            for parent in parents[first_parent[index]:first_parent[index + 1]]:
+                if result[parent] != _UNSOLVED:
+                    continue
+                if outcome == LOSS:
+                    buckets[level + 1].append((parent, WIN))
+                else:
+                    loss_distance[parent] = max(loss_distance[parent], level + 1)
+                    remaining[parent] -= 1
+                    if remaining[parent] == 0:
+                        buckets[loss_distance[parent]].append((parent, LOSS))
+        bucket.clear()
+
+    # Ties: a position no one can win is a tie when every move that doesn't lose leads to one.
+    # A position can be settled after a longer tie than its shortest one, so the bucket only
+    # orders the work and the distance comes from tie_distance.
+    for index in range(size):
+        if result[index] == _UNSOLVED and remaining[index] == ties[index]:
+            buckets[tie_distance[index]].append((index, TIE))
+    for level, bucket in enumerate(buckets):
+        for index, outcome in bucket:
+            if result[index] != _UNSOLVED:
+                continue
+            result[index] = TIE
+            distance[index] = tie_distance[index]
+            for parent in parents[first_parent[index]:first_parent[index + 1]]:
+                if result[parent] != _UNSOLVED:
+                    continue
+                ties[parent] += 1
+                tie_distance[parent] = min(tie_distance[parent], distance[index] + 1)
+                if ties[parent] == remaining[parent]:
+                    buckets[max(tie_distance[parent], level + 1)].append((parent, TIE))
+
+    table = [entry if entry == INVALID else (DRAW if entry == _UNSOLVED else entry) << 14 | min(gap, MAX_DISTANCE)
+             for entry, gap in zip(result, distance)]
+    tables[layout.name] = table
+    if progress:
+        counts = [sum(1 for entry in table if entry != INVALID and entry >> 14 == code) for code in range(4)]
+        progress(f'{layout.name}: ' + ', '.join(f'{count} {name}' for name, count in zip(RESULT_NAMES, counts)) +
+                 f', solved in {time.perf_counter() - start:.1f}s')
+    return table
+
+
+def write_table(path, material, table):
+    """
+    Write a solved table to a file Tablebase can open.
+    """
+    with open(path, 'wb') as file:
+        file.write(_HEADER.pack(_MAGIC, _VERSION, 0, material_name(parse_material(material)).encode()))
+        file.write(struct.pack(f'<{len(table)}H', *table))
+
+
+class Tablebase:
+    """
+    A solved table file, memory mapped. Probing costs the same whatever the table's size,
+    and only the pages probed are ever read from disk.
+    """
+
+    def __init__(self, path):
+        """
+        :param path: A file written by write_table().
+        """
+        self._file = open(path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, material = _HEADER.unpack_from(self._map, 0)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f'Not a ChessVar tablebase: {path}')
+        self._layout = _Layout(material.rstrip(b'\0').decode())
+        if len(self._map) != _HEADER.size + 2 * self._layout.size:
+            raise ValueError(f'Tablebase file is the wrong size: {path}')
+
+    def get_material(self):
+        """
+        Retrieve the material set the table covers, ie 'K-KN'.
+        """
+        return self._layout.name
+
+    def probe(self, board):
+        """
+        Look up a position.
+        :param board: A ChessVar Board.
+        :return: (result, distance) for the side to move, where result is one of WIN, LOSS,
+        TIE or DRAW and distance counts plies to the end of the game with best play. None if
+        the board's material isn't this table's or its game is over.
+        """
+        if board.is_game_over() or board_material(board) != self._layout.name:
+            return None
+        entry, = struct.unpack_from('<H', self._map, _HEADER.size + 2 * self._layout.index(board, _mode(board)))
+        return entry >> 14, entry & MAX_DISTANCE
+
+    def close(self):
+        """
+        Unmap the table and close its file.
+        """
+        self._map.close()
+        self._file.close()
+
+    def __repr__(self):
+        """
+        Allows the debugger to show an object's attributes rather than its
+        address in memory.
+        """
+        return "{}({!r})".format(self.__class__.__name__, self.__dict__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Solve a ChessVar endgame tablebase.')
+    parser.add_argument('material', help="material set, White's pieces then Black's, ie K-KN")
+    parser.add_argument('--output', default=None, help='table file to write (default: MATERIAL.cvtb)')
+    args = parser.parse_args()
+    material = material_name(parse_material(args.material))
+    table = solve(material, progress=print)
+    path = args.output or f'{material}.cvtb'
+    write_table(path, material, table)
+    print(f'wrote {path}')
+
+
+if __name__ == '__main__':
+    main()
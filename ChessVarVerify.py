@@ -0,0 +1,201 @@
+# Description: Audit an archive of ChessVar game records (see ChessVarRecord). Every game is replayed
+# through the rules, the same _set_piece_location() checks that set_white_piece_location() and
+# set_black_piece_location() make, and flagged at its first illegal move or when the result it claims
+# isn't the one the moves lead to. Games are handed out in batches to a pool of worker processes and the
+# verdicts come back in archive order as soon as they are ready, with only a few batches in flight at a
+# time, so archives of any size are checked in constant memory. A game that can't even be read, for a
+# bad move, tag or Result, is reported with its line number and the audit carries on with the next one.
+#
+# Usage: python ChessVarVerify.py games.txt.gz [--processes 4] [--batch-size 200] [--all]
+#        python ChessVarVerify.py --check    (checks that a corrupt game doesn't stop the audit)
+
+import argparse
+import collections
+import io
+import multiprocessing
+import os
+import time
+
+from ChessVar import ChessVariant, square_name
+from ChessVarRecord import GameRecord, format_record, read_records
+
+# Verdict statuses
+OK = 'OK'
+ILLEGAL_MOVE = 'ILLEGAL_MOVE'  # A move the rules turn down, see ply, move & reason.
+RESULT_MISMATCH = 'RESULT_MISMATCH'  # Every move was legal but the game didn't end as claimed.
+BAD_POSITION = 'BAD_POSITION'  # The Position tag can't be set up.
+BAD_RECORD = 'BAD_RECORD'  # The game can't be read from the archive, see GameRecord.get_error().
+
+# number: the game's place in the archive, from 0. ply: 1-based ply of the illegal move, else None.
+# move: that move as 'a2a3'. reason: the ChessVar MoveRejected reason, or the error for BAD_POSITION
+# and BAD_RECORD.
+Verdict = collections.namedtuple('Verdict', 'number status claimed actual ply move reason')
+
+
+def verify_record(number, record):
+    """
+    Replay one game record through the rules and compare where it ends up with what it claims.
+    :param number: The game's place in the archive, for the verdict.
+    :param record: A ChessVarRecord.GameRecord.
+    :return: A Verdict.
+    """
+    if record.get_error() is not None:
+        return Verdict(number, BAD_RECORD, None, None, None, None, record.get_error())
+    claimed = record.get_result()
+    try:
+        game = ChessVariant(record.get_position())
+    except ValueError as error:
+        return Verdict(number, BAD_POSITION, claimed, None, None, None, str(error))
+    board = game.get_board_object()
+    for ply, move in enumerate(record.get_moves(), 1):
+        if not board.make_move_fast(move):
+            return Verdict(number, ILLEGAL_MOVE, claimed, game.get_game_state(), ply,
+                           square_name(move[0]) + square_name(move[1]), board.explain_rejection(move))
+    actual = game.get_game_state()
+    return Verdict(number, OK if actual == claimed else RESULT_MISMATCH, claimed, actual, None, None, None)
+
+
+def _verify_batch(batch):
+    """
+    Worker task: verify a list of (number, record) pairs.
+    :return: The list of their Verdicts, in the same order.
+    """
+    return [verify_record(number, record) for number, record in batch]
+
+
+def _batches(records, batch_size):
+    """
+    Group numbered records into lists of up to batch_size, reading them only as needed.
+    """
+    batch = []
+    for number, record in enumerate(records):
+        batch.append((number, record))
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def verify_records(records, processes=None, batch_size=200, in_flight=None):
+    """
+    Verify a stream of game records over a process pool.
+    :param records: Any iterable of GameRecord objects, such as ChessVarRecord.read_records().
+    :param processes: Worker processes, all CPUs by default. 1 verifies in this process.
+    :param batch_size: Games per worker task.
+    :param in_flight: Most batches handed out but not yet reported, twice the number of
+    processes by default. This bounds memory whatever the size of the archive.
+    :return: A generator of Verdicts, one per game, in archive order.
+    """
+    processes = processes or os.cpu_count() or 1
+    if processes == 1:
+        for batch in _batches(records, batch_size):
+            yield from _verify_batch(batch)
+        return
+    in_flight = in_flight or processes * 2
+    pending = collections.deque()
+    with multiprocessing.Pool(processes) as pool:
+        for batch in _batches(records, batch_size):
+            pending.append(pool.apply_async(_verify_batch, (batch,)))
+            if len(pending) >= in_flight:
+                yield from pending.popleft().get()
+        while pending:
+            yield from pending.popleft().get()
+
+
+def verify_archive(source, processes=None, batch_size=200):
+    """
+    Verify every game in an archive file.
+    :param source: File name (decompressed by its suffix) or open text file, see ChessVarRecord.
+    :return: A generator of Verdicts, one per game, in archive order, a game that can't be
+    read included.
+    """
+    return verify_records(read_records(source, keep_bad=True), processes, batch_size)
+
+
+def format_verdict(verdict):
+    """
+    Describe a verdict in one line.
+    """
+    if verdict.status == ILLEGAL_MOVE:
+        return f'game {verdict.number}: illegal move {verdict.move} at ply {verdict.ply} ({verdict.reason})'
+    if verdict.status == RESULT_MISMATCH:
+        return f'game {verdict.number}: claims {verdict.claimed}, the moves give {verdict.actual}'
+    if verdict.status == BAD_POSITION:
+        return f'game {verdict.number}: bad position, {verdict.reason}'
+    if verdict.status == BAD_RECORD:
+        return f'game {verdict.number}: unreadable, {verdict.reason}'
+    return f'game {verdict.number}: ok, {verdict.actual}'
+
+
+def check_bad_records():
+    """
+    Verify a small archive, in memory, in which one game has a move that is off the board,
+    one a tag that can't be read and one an unknown Result, between sound games.
+    :return: A list of problems, empty if every sound game got its own OK verdict and
+    every broken one a BAD_RECORD.
+    """
+    records = []
+    for plies in range(6):  # Sound games of the first legal move, 0 to 5 plies long.
+        game = ChessVariant()
+        board = game.get_board_object()
+        moves = []
+        for _ in range(plies):
+            move = next(iter(board.generate_legal_moves()))
+            board.push(move)
+            moves.append(move)
+        records.append(format_record(GameRecord(moves, game.get_game_state(), {'Game': str(plies)})))
+    broken = {
+        1: records[1].replace(' *', ' a1a9 *'),
+        3: records[3].replace('[Game "3"]', '[Game "3"'),
+        4: records[4].replace('[Result "UNFINISHED"]', '[Result "STUCK"]'),
+    }
+    archive = io.StringIO(''.join(broken.get(number, text) for number, text in enumerate(records)))
+    verdicts = list(verify_archive(archive, processes=1))
+    problems = []
+    if len(verdicts) != len(records):
+        problems.append(f'{len(records)} games gave {len(verdicts)} verdicts')
+    for verdict in verdicts:
+        expected = BAD_RECORD if verdict.number in broken else OK
+        if verdict.status != expected:
+            problems.append(f'expected {expected}, got {format_verdict(verdict)}')
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay an archive of ChessVar games and report any that '
+                                                 'break the rules or claim the wrong result.')
+    parser.add_argument('archive', nargs='?', help='game record archive (.gz, .bz2 and .xz are decompressed)')
+    parser.add_argument('--processes', type=int, default=None, help='worker processes (default: all CPUs)')
+    parser.add_argument('--batch-size', type=int, default=200, help='games per worker task (default 200)')
+    parser.add_argument('--all', action='store_true', help='report every game, not only the bad ones')
+    parser.add_argument('--check', action='store_true',
+                        help='check that games which can\'t be read are reported without ending the audit, and exit')
+    args = parser.parse_args()
+
+    if args.check:
+        problems = check_bad_records()
+        print('\n'.join(problems) if problems else 'bad records: ok')
+        if problems:
+            raise SystemExit(1)
+        return
+    if args.archive is None:
+        parser.error('an archive is needed unless --check is given')
+
+    start = time.perf_counter()
+    counts = collections.Counter()
+    for verdict in verify_archive(args.archive, args.processes, args.batch_size):
+        counts[verdict.status] += 1
+        if args.all or verdict.status != OK:
+            print(format_verdict(verdict), flush=True)
+    elapsed = time.perf_counter() - start
+    games = sum(counts.values())
+    print(f'{games} games: {counts[OK]} ok, {counts[ILLEGAL_MOVE]} illegal moves, '
+          f'{counts[RESULT_MISMATCH]} result mismatches, {counts[BAD_POSITION]} bad positions, '
+          f'{counts[BAD_RECORD]} unreadable in {elapsed:.2f}s ({games / elapsed if elapsed else 0:.0f} games/s)')
+    if games != counts[OK]:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()